@@ -0,0 +1,158 @@
+"""
+asyncio enrichment, for services that enrich dramas on request.
+
+Same results as pipeline.enrich_stream() and enrich_with_wikipedia.enrich_kdrama_list(), but
+every Wikipedia page is fetched through an AsyncHttpClient on the caller's event loop: no
+threads, concurrency bounded by the client's semaphore and the per-host AsyncRateLimiter.
+The batch CLI (checkpoints, incremental runs, Parquet and catalog outputs) stays in
+enrich_with_wikipedia.py. Needs aiohttp.
+"""
+import asyncio
+import csv
+import os
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Iterable
+
+from .async_http_client import AsyncHttpClient
+from .concurrency import AsyncRateLimiter
+from .config import HEADERS, PIPELINE_BUFFER_SIZE, WIKIPEDIA_REQUESTS_PER_SECOND
+from .enrich_with_wikipedia import WIKI_FIELDS
+from .helper import apply_wikipedia_info
+from .pipeline import iter_chunks
+from .scrapers.wikipedia_scraper import AsyncWikipediaScraper
+from .title_matcher import TitleMatcher, write_review_report
+
+
+async def fetch_wikipedia_info(
+    urls,
+    headers: dict,
+    client: AsyncHttpClient,
+    requests_per_second: float | None = None,
+    rate_limiter: AsyncRateLimiter | None = None,
+    parse_executor: Executor | None = None,
+) -> list[list[dict]]:
+    """
+    Fetch and parse every Wikipedia URL concurrently; one info list per URL, in order, and
+    an empty list for pages that could not be fetched (like concurrency.fetch_wikipedia_info).
+    """
+    if rate_limiter is None:
+        rate_limiter = AsyncRateLimiter(requests_per_second)
+
+    async def fetch_one(url: str) -> list[dict]:
+        await rate_limiter.wait(url)
+        return await AsyncWikipediaScraper(url, headers, client).get_info_list(parse_executor)
+
+    return list(await asyncio.gather(*(fetch_one(url) for url in urls)))
+
+
+async def enrich_dramas(
+    dramas: Iterable[dict],
+    matcher: TitleMatcher,
+    client: AsyncHttpClient,
+    headers: dict = HEADERS,
+    requests_per_second: float | None = WIKIPEDIA_REQUESTS_PER_SECOND,
+    rate_limiter: AsyncRateLimiter | None = None,
+    parse_executor: Executor | None = None,
+    review_rows: list | None = None,
+) -> list[dict]:
+    """
+    Fill in the Wikipedia fields of every drama `matcher` confidently finds an article for (in
+    place, and returned in input order). Unmatched and low-confidence titles are left as they
+    are and appended to `review_rows` when given.
+    """
+    dramas = list(dramas)
+    jobs = []
+    for drama in dramas:
+        title = (drama.get("title") or "").strip()
+        if not title:
+            continue
+        match = matcher.match(title, drama.get("release_year"))
+        if review_rows is not None and (match is None or match["needs_review"]):
+            review_rows.append(
+                {
+                    **(match or {}),
+                    "title": title,
+                    "year": drama.get("release_year", ""),
+                    "status": "low confidence" if match else "no match",
+                }
+            )
+        # Low-confidence matches are only reported: fuzzy hits below the review score are
+        # mostly sequels and near-namesakes ("Reply 1988" -> "Reply 1994")
+        if match is not None and not match["needs_review"]:
+            jobs.append((drama, match["url"]))
+
+    info_lists = await fetch_wikipedia_info(
+        [wiki_url for _, wiki_url in jobs],
+        headers,
+        client,
+        requests_per_second=requests_per_second,
+        rate_limiter=rate_limiter,
+        parse_executor=parse_executor,
+    )
+    for (drama, wiki_url), info_list in zip(jobs, info_lists):
+        if info_list:
+            apply_wikipedia_info(drama, info_list[0], wiki_url)
+    return dramas
+
+
+async def enrich_kdrama_list(
+    input_csv: str | Path,
+    wikipedia_list_path: str | Path,
+    output_csv: str | Path,
+    client: AsyncHttpClient | None = None,
+    requests_per_second: float | None = WIKIPEDIA_REQUESTS_PER_SECOND,
+    title_list_path: str | Path | None = None,
+    parse_executor: Executor | None = None,
+    chunk_size: int = PIPELINE_BUFFER_SIZE,
+) -> int:
+    """
+    Async counterpart of enrich_with_wikipedia.enrich_kdrama_list(): the same output CSV and
+    review report, with `chunk_size` rows fetched concurrently at a time. Returns the number
+    of rows written. Without a `client`, one is opened for the call and closed at the end.
+    """
+    if client is None:
+        async with AsyncHttpClient() as own_client:
+            return await enrich_kdrama_list(
+                input_csv, wikipedia_list_path, output_csv, own_client,
+                requests_per_second, title_list_path, parse_executor, chunk_size,
+            )
+
+    output_csv = Path(output_csv)
+    matcher = TitleMatcher.from_wikipedia_list(wikipedia_list_path, title_list_path)
+    # One limiter for the whole run, so the per-host cap holds across chunks
+    rate_limiter = AsyncRateLimiter(requests_per_second)
+    review_rows = []
+    total = 0
+
+    tmp_csv = output_csv.with_name(output_csv.name + ".tmp")
+    with (
+        open(input_csv, encoding="utf-8") as input_file,
+        open(tmp_csv, "w", newline="", encoding="utf-8") as output_file,
+    ):
+        reader = csv.DictReader(input_file)
+        existing_fieldnames = reader.fieldnames or []
+        fieldnames = existing_fieldnames + [f for f in WIKI_FIELDS if f not in existing_fieldnames]
+        writer = csv.DictWriter(output_file, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for chunk in iter_chunks(reader, chunk_size):
+            await enrich_dramas(
+                chunk,
+                matcher,
+                client,
+                rate_limiter=rate_limiter,
+                parse_executor=parse_executor,
+                review_rows=review_rows,
+            )
+            writer.writerows(chunk)
+            total += len(chunk)
+
+    review_path = output_csv.with_suffix(".review.csv")
+    if review_rows:
+        write_review_report(review_path, review_rows)
+    else:
+        review_path.unlink(missing_ok=True)
+    os.replace(tmp_csv, output_csv)
+    return total
+
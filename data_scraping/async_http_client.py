@@ -0,0 +1,181 @@
+"""
+asyncio counterpart of HttpClient, for calling the scrapers from an async service.
+
+One aiohttp session (a shared keep-alive connection pool) serves every request, and a
+semaphore caps how many are in flight at once. Retries, backoff, Retry-After, the response
+cache and the metrics behave as in HttpClient, and responses come back as requests.Response
+objects (failures as requests exceptions), so the scrapers' parsing and error handling are
+shared by both. aiohttp is optional: only the async API needs it.
+"""
+import asyncio
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .config import (
+    ASYNC_HTTP_MAX_CONCURRENCY,
+    HEADERS,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+)
+from .http_cache import CacheMissError, ResponseCache
+from .http_client import RETRY_STATUSES
+from .metrics import get_metrics
+
+
+def available() -> bool:
+    return aiohttp is not None
+
+
+def retry_delay(attempt: int, backoff_factor: float, retry_after: str | None) -> float:
+    """Seconds before retry number `attempt` (1-based): Retry-After if given, else backoff."""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # An HTTP date; fall back to the exponential backoff
+    return backoff_factor * 2 ** (attempt - 1)
+
+
+class AsyncHttpClient:
+    """
+    Pooled aiohttp session with retries, exponential backoff, timeouts and at most
+    `max_concurrency` requests in flight. Use it as an async context manager (or call
+    close()) so the connections are released.
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        pool_size: int = HTTP_POOL_SIZE,
+        max_concurrency: int = ASYNC_HTTP_MAX_CONCURRENCY,
+        cache: ResponseCache | None = None,
+    ):
+        if aiohttp is None:
+            raise ImportError("AsyncHttpClient needs aiohttp (pip install aiohttp)")
+        self.headers = dict(HEADERS if headers is None else headers)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: "aiohttp.ClientSession | None" = None
+
+    def session(self) -> "aiohttp.ClientSession":
+        # Created on first use, inside the event loop that will run the requests
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def get(self, url: str, headers: dict | None = None, refresh: bool = False) -> requests.Response:
+        """
+        GET `url` through the pooled session; raises requests.HTTPError on a final 4xx/5xx.
+        `refresh` revalidates a fresh cached copy, as in HttpClient.get().
+        """
+        if self.cache is None:
+            response = await self.fetch(url, headers)
+            response.raise_for_status()
+            return response
+
+        # The cache reads and writes files: run those calls in a worker thread (the cache is
+        # thread-safe) so they don't stall the event loop
+        metrics = get_metrics()
+        entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None and (self.cache.offline or (not refresh and self.cache.is_fresh(entry))):
+            metrics.inc("http_cache_requests_total", result="hit")
+            await asyncio.to_thread(self.cache.touch, url)
+            return await asyncio.to_thread(self.cache.to_response, entry)
+        if self.cache.offline:
+            metrics.inc("http_cache_requests_total", result="miss")
+            raise CacheMissError(f"{url} is not cached (offline mode)")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        response = await self.fetch(url, request_headers)
+        if response.status_code == 304 and entry is not None:
+            metrics.inc("http_cache_requests_total", result="revalidated")
+            await asyncio.to_thread(self.cache.touch, url, revalidated=True)
+            return await asyncio.to_thread(self.cache.to_response, entry)
+
+        metrics.inc("http_cache_requests_total", result="miss")
+        response.raise_for_status()
+        await asyncio.to_thread(self.cache.store, url, response)
+        return response
+
+    async def fetch(self, url: str, headers: dict | None) -> requests.Response:
+        """One GET (retrying transient failures), recorded in the metrics like HttpClient.fetch."""
+        metrics = get_metrics()
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    with metrics.time("fetch", host=host):
+                        response = await self._get_once(url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt < self.retries:
+                    attempt += 1
+                    metrics.inc("http_retries_total", host=host)
+                    await asyncio.sleep(retry_delay(attempt, self.backoff_factor, None))
+                    continue
+                metrics.inc("http_requests_total", host=host, status=type(exc).__name__)
+                metrics.event("fetch_failed", url=url, error=repr(exc))
+                if isinstance(exc, asyncio.TimeoutError):
+                    raise requests.Timeout(f"{url}: {exc!r}") from exc
+                raise requests.ConnectionError(f"{url}: {exc!r}") from exc
+
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                attempt += 1
+                metrics.inc("http_retries_total", host=host)
+                await asyncio.sleep(
+                    retry_delay(attempt, self.backoff_factor, response.headers.get("Retry-After"))
+                )
+                continue
+            break
+
+        metrics.inc("http_requests_total", host=host, status=response.status_code)
+        metrics.inc("http_bytes_total", len(response.content), host=host)
+        if response.status_code >= 400:
+            metrics.event("fetch_failed", url=url, status=response.status_code)
+        return response
+
+    async def _get_once(self, url: str, headers: dict | None) -> requests.Response:
+        async with self.session().get(url, headers=headers) as raw:
+            response = requests.Response()
+            response.status_code = raw.status
+            response.reason = raw.reason
+            response.url = str(raw.url)
+            response._content = await raw.read()
+            response.headers = CaseInsensitiveDict(raw.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            return response
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
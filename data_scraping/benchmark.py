@@ -0,0 +1,286 @@
+"""
+Offline benchmarks for the parsers and the enrichment pipeline.
+
+Every case runs against saved pages (imdb_2010s_debug.html and tests/fixtures) served by
+FixtureClient, so results only depend on the code and the machine. The saved Wikipedia articles
+are small synthetic pages: the parser cases track regressions in our code, not the speed of a
+parser on real, much larger articles. Run
+
+    python -m data_scraping.benchmark                    # compare with the recorded baseline
+    python -m data_scraping.benchmark --save-baseline    # record a new baseline
+
+Each case's time is divided by that of the fixed pure-Python "calibration" case measured in
+the same run, and the baseline stores those relative times, so it can be compared across
+machines. A case regresses when its relative time exceeds the baseline by more than
+BENCHMARK_REGRESSION_THRESHOLD (e.g. 0.5 = 50% slower); the command then exits with 1.
+Relative times still shift somewhat between Python versions and CPU types; re-record the
+baseline after changing either.
+"""
+import argparse
+import atexit
+import contextlib
+import csv
+import io
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.structures import CaseInsensitiveDict
+
+from . import helper
+from .config import BENCHMARK_BASELINE_PATH, BENCHMARK_REGRESSION_THRESHOLD
+from .enrich_with_wikipedia import enrich_kdrama_list
+from .scrapers.imdb_extractor import extract_dom
+from .scrapers.imdb_scraper import IMDBScraper
+from .scrapers.wikipedia_scraper import WikipediaScraper
+
+BASE_DIR = Path(__file__).parent
+FIXTURES_DIR = BASE_DIR / "tests" / "fixtures"
+IMDB_LIST_PAGE = BASE_DIR / "imdb_2010s_debug.html"
+WIKIPEDIA_PAGES = sorted((FIXTURES_DIR / "wikipedia").glob("*.html"))
+# Rows in the synthetic input of the end-to-end enrichment case
+ENRICH_ROWS = 200
+
+
+class FixtureClient:
+    """Stands in for HttpClient: serves the file named by the last path segment of each URL."""
+
+    def __init__(self, pages: dict[str, Path]):
+        self.pages = {name: path.read_bytes() for name, path in pages.items()}
+
+    def get(self, url: str, headers=None) -> requests.Response:
+        name = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+        if name not in self.pages:
+            response = requests.Response()
+            response.status_code = 404
+            response.url = url
+            raise requests.HTTPError(f"404 for {url}", response=response)
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response._content = self.pages[name]
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        return response
+
+
+def bench_calibration():
+    # Fixed interpreter-bound work (dicts, strings, sorting) that no change to the repo affects
+    records = [{"title": f"Drama {n}", "year": 2000 + n % 25, "score": (n * 7919) % 100} for n in range(2000)]
+
+    def run():
+        ranked = sorted(records, key=lambda record: (-record["score"], record["title"]))
+        return len(json.loads(json.dumps(ranked)))
+
+    return run
+
+
+def bench_imdb_list():
+    client = FixtureClient({"imdb_2010s_debug.html": IMDB_LIST_PAGE})
+    scraper = IMDBScraper("https://www.imdb.com/list/imdb_2010s_debug.html", {}, client=client)
+    return lambda: len(scraper.get_drama_list())
+
+
+def bench_imdb_dom():
+    # The DOM fallback on its own, as for a page without __NEXT_DATA__
+    soup = BeautifulSoup(IMDB_LIST_PAGE.read_bytes(), "html.parser")
+    return lambda: len(extract_dom(soup))
+
+
+def bench_wikipedia(parser: str):
+    def setup():
+        client = FixtureClient({path.name: path for path in WIKIPEDIA_PAGES})
+        scrapers = [
+            WikipediaScraper(f"https://en.wikipedia.org/wiki/{path.name}", {}, client=client, parser=parser)
+            for path in WIKIPEDIA_PAGES
+        ]
+        return lambda: sum(len(scraper.get_info_list()) for scraper in scrapers)
+
+    return setup
+
+
+def bench_helper():
+    raw_titles = [f"{n}. Drama Title Number {n}" for n in range(1, 1001)]
+    raw_episodes = [f"{n % 100 + 1} eps" for n in range(1000)]
+
+    def run():
+        for title, episodes in zip(raw_titles, raw_episodes):
+            helper.preprocess_title(title)
+            helper.preprocess_episodes(episodes)
+        return len(raw_titles)
+
+    return run
+
+
+def bench_enrichment():
+    tmp_dir = Path(tempfile.mkdtemp(prefix="kdrama_benchmark_"))
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    client = FixtureClient({path.name: path for path in WIKIPEDIA_PAGES})
+
+    input_csv = tmp_dir / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year", "num_episodes", "rating_type", "rating_score"])
+        for n in range(ENRICH_ROWS):
+            writer.writerow([f"Drama {n}", "2010", "16", "imdb", "8.0"])
+
+    # Every title is mapped (round robin over the saved articles, a few of them without infobox)
+    wikipedia_list = tmp_dir / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps(
+            [
+                {f"Drama {n}": f"https://en.wikipedia.org/wiki/{WIKIPEDIA_PAGES[n % len(WIKIPEDIA_PAGES)].name}"}
+                for n in range(ENRICH_ROWS)
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            enrich_kdrama_list(
+                input_csv,
+                wikipedia_list,
+                tmp_dir / "out.csv",
+                max_workers=1,
+                # Parse in-thread: a process pool's start-up would dwarf the work being timed
+                parse_workers=0,
+                requests_per_second=None,
+                client=client,
+                manifest_path=tmp_dir / "out.manifest.json",
+            )
+        return ENRICH_ROWS
+
+    return run
+
+
+# name -> (setup returning the function to time, unit of the count that function returns)
+# "calibration" is the reference the other cases are timed against
+CALIBRATION = "calibration"
+BENCHMARKS = {
+    CALIBRATION: (bench_calibration, "records"),
+    "imdb_get_drama_list": (bench_imdb_list, "dramas"),
+    "imdb_extract_dom": (bench_imdb_dom, "dramas"),
+    "wikipedia_get_info_list_html_parser": (bench_wikipedia("html.parser"), "pages"),
+    "wikipedia_get_info_list_lxml": (bench_wikipedia("lxml"), "pages"),
+    "helper_preprocess": (bench_helper, "titles"),
+    "enrich_end_to_end": (bench_enrichment, "rows"),
+}
+
+
+def measure(func, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Time `func`: each of `repeat` rounds calls it until `min_time` seconds have passed and
+    records the mean time per call. Returns the median/min per-call time and throughput.
+    """
+    timings = []
+    count = func()  # warm-up (imports, caches), also gives the number of items per call
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        timings.append(elapsed / calls)
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "items": count,
+        "items_per_s": count / median if median else 0.0,
+    }
+
+
+def run_benchmarks(names=None, repeat: int = 5, min_time: float = 0.2) -> dict[str, dict]:
+    """Results of the `names` cases (default: all), plus the calibration case they are relative to."""
+    results = {}
+    for name, (setup, unit) in BENCHMARKS.items():
+        if names and name not in names and name != CALIBRATION:
+            continue
+        results[name] = {**measure(setup(), repeat, min_time), "unit": unit}
+    calibration = results[CALIBRATION]["median_s"]
+    for result in results.values():
+        result["relative"] = result["median_s"] / calibration
+    return results
+
+
+def load_baseline(path: str | Path = BENCHMARK_BASELINE_PATH) -> dict[str, dict]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict[str, dict], path: str | Path = BENCHMARK_BASELINE_PATH) -> None:
+    baseline = {name: {"relative": round(r["relative"], 4), "unit": r["unit"]} for name, r in results.items()}
+    Path(path).write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float = BENCHMARK_REGRESSION_THRESHOLD,
+) -> dict[str, float]:
+    """
+    {name: relative time / baseline relative time} for every case slower than the baseline
+    by more than `threshold`.
+    """
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline or name == CALIBRATION:
+            continue
+        ratio = result["relative"] / baseline[name]["relative"]
+        if ratio > 1 + threshold:
+            regressions[name] = ratio
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline parser and pipeline benchmarks.")
+    parser.add_argument("names", nargs="*", help=f"cases to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run_benchmarks(args.names, args.repeat, args.min_time)
+    baseline = load_baseline(args.baseline)
+
+    for name, result in results.items():
+        line = (
+            f"{name:40} {result['median_s'] * 1000:9.3f} ms/run "
+            f"{result['items_per_s']:11.1f} {result['unit']}/s"
+        )
+        if name in baseline and name != CALIBRATION:
+            line += f"  ({result['relative'] / baseline[name]['relative']:.2f}x baseline)"
+        print(line)
+
+    if args.save_baseline:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for name, ratio in regressions.items():
+        print(f"REGRESSION: {name} is {ratio:.2f}x its baseline (threshold {1 + args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
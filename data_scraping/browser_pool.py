@@ -0,0 +1,138 @@
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .config import (
+    CHROMEDRIVER_PATH,
+    SELENIUM_HEADLESS,
+    SELENIUM_POOL_SIZE,
+    SELENIUM_SETTLE_TIMEOUT,
+    SELENIUM_WAIT_TIMEOUT,
+)
+
+# IMDb list pages: the list container and one entry of the list
+IMDB_LIST_SELECTOR = "div[data-testid='list-page-mc-list-content'] ul.ipc-metadata-list"
+IMDB_ITEM_SELECTOR = f"{IMDB_LIST_SELECTOR} li.ipc-metadata-list-summary-item"
+
+
+def build_chrome_options(headless: bool = SELENIUM_HEADLESS) -> Options:
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    # /dev/shm is tiny in most containers; without this Chrome crashes on large pages
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    return options
+
+
+class BrowserPool:
+    """
+    A small pool of reusable Chrome drivers for JS-rendered pages.
+
+    Drivers are started lazily (at most `size` of them) and handed back to the pool after
+    each page, so several list URLs share the multi-second browser startup. Use it as a
+    context manager, or call close() to quit every driver.
+    """
+
+    def __init__(
+        self,
+        size: int = SELENIUM_POOL_SIZE,
+        driver_path: str | None = CHROMEDRIVER_PATH,
+        headless: bool = SELENIUM_HEADLESS,
+        wait_timeout: float = SELENIUM_WAIT_TIMEOUT,
+        settle_timeout: float = SELENIUM_SETTLE_TIMEOUT,
+        driver_factory=None,
+    ):
+        self.size = size
+        self.driver_path = driver_path
+        self.headless = headless
+        self.wait_timeout = wait_timeout
+        self.settle_timeout = settle_timeout
+        self.driver_factory = driver_factory or self.create_driver
+
+        self._idle: queue.Queue = queue.Queue()
+        self._drivers: list = []
+        self._lock = threading.Lock()
+
+    def create_driver(self):
+        # Without an explicit path Selenium Manager locates (or downloads) a matching driver
+        service = Service(self.driver_path) if self.driver_path else Service()
+        return webdriver.Chrome(service=service, options=build_chrome_options(self.headless))
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._drivers) < self.size:
+                driver = self.driver_factory()
+                self._drivers.append(driver)
+                return driver
+        # Every driver is busy: wait for one to be released
+        return self._idle.get()
+
+    def release(self, driver) -> None:
+        self._idle.put(driver)
+
+    def get_page_source(
+        self,
+        url: str,
+        wait_selector: str = IMDB_LIST_SELECTOR,
+        item_selector: str | None = IMDB_ITEM_SELECTOR,
+    ) -> str:
+        """
+        Load `url` and return the rendered HTML.
+
+        Waits until `wait_selector` is present, then keeps scrolling to the bottom while new
+        `item_selector` elements keep appearing (lazy loading), instead of a fixed single scroll.
+        """
+        driver = self.acquire()
+        try:
+            driver.get(url)
+            WebDriverWait(driver, self.wait_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+            )
+
+            if item_selector:
+                count = len(driver.find_elements(By.CSS_SELECTOR, item_selector))
+                while True:
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    try:
+                        WebDriverWait(driver, self.settle_timeout).until(
+                            lambda d: len(d.find_elements(By.CSS_SELECTOR, item_selector)) > count
+                        )
+                    except TimeoutException:
+                        # No new items after scrolling: the list is fully rendered
+                        break
+                    count = len(driver.find_elements(By.CSS_SELECTOR, item_selector))
+
+            return driver.page_source
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        self._idle = queue.Queue()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                # A crashed browser can't be quit cleanly; nothing else to clean up
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
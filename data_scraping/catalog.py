@@ -0,0 +1,285 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from .columnar import PEOPLE_FIELDS, parse_float, parse_int, parse_year_range, split_people
+from .config import CATALOG_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dramas (
+    id INTEGER PRIMARY KEY,
+    imdb_id TEXT UNIQUE,
+    title TEXT NOT NULL,
+    release_year TEXT,
+    start_year INTEGER,
+    end_year INTEGER,
+    num_episodes INTEGER,
+    rating_type TEXT,
+    rating_score REAL,
+    short_description TEXT,
+    network_provider TEXT,
+    plot TEXT
+);
+CREATE INDEX IF NOT EXISTS dramas_title ON dramas (title);
+CREATE INDEX IF NOT EXISTS dramas_start_year ON dramas (start_year);
+
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS credits (
+    drama_id INTEGER NOT NULL REFERENCES dramas (id) ON DELETE CASCADE,
+    person_id INTEGER NOT NULL REFERENCES people (id),
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (drama_id, role, position)
+);
+CREATE INDEX IF NOT EXISTS credits_person ON credits (person_id, role);
+
+-- Wikipedia article per title (the old wikipedia_list.json), plus what was last fetched from it
+CREATE TABLE IF NOT EXISTS sources (
+    title TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    drama_id INTEGER REFERENCES dramas (id) ON DELETE SET NULL,
+    fetched_at TEXT,
+    revision INTEGER
+);
+CREATE INDEX IF NOT EXISTS sources_drama ON sources (drama_id);
+"""
+
+# Scalar drama columns, in table order (people live in credits, the article in sources)
+DRAMA_COLUMNS = (
+    "imdb_id",
+    "title",
+    "release_year",
+    "start_year",
+    "end_year",
+    "num_episodes",
+    "rating_type",
+    "rating_score",
+    "short_description",
+    "network_provider",
+    "plot",
+)
+# Columns that can be checked with dramas_missing()
+MISSING_CHECKS = {
+    "plot": "d.plot IS NULL",
+    "network_provider": "d.network_provider IS NULL",
+    "rating_score": "d.rating_score IS NULL",
+    "source": "NOT EXISTS (SELECT 1 FROM sources s WHERE s.drama_id = d.id)",
+    **{
+        role: f"NOT EXISTS (SELECT 1 FROM credits c WHERE c.drama_id = d.id AND c.role = '{role}')"
+        for role in PEOPLE_FIELDS
+    },
+}
+
+
+def drama_values(drama: dict) -> dict:
+    """A drama dict (scraper output or CSV row) -> typed column values; blanks become None."""
+    start_year, end_year = parse_year_range(drama.get("release_year"))
+    values = {
+        "imdb_id": drama.get("imdb_id"),
+        "title": (drama.get("title") or "").strip(),
+        "release_year": drama.get("release_year"),
+        "start_year": start_year,
+        "end_year": end_year,
+        "num_episodes": parse_int(drama.get("num_episodes")),
+        "rating_type": drama.get("rating_type"),
+        "rating_score": parse_float(drama.get("rating_score")),
+        "short_description": drama.get("short_description"),
+        "network_provider": drama.get("network_provider"),
+        "plot": drama.get("plot"),
+    }
+    return {column: (value if value != "" else None) for column, value in values.items()}
+
+
+class Catalog:
+    """
+    SQLite catalog of dramas, people, credits and Wikipedia sources.
+
+    Both scrapers feed it through upsert_dramas(); re-scraping a title updates its row in
+    place (matched by IMDb id, else by title + release year) and blank values never overwrite
+    known ones. Lookups by title, year and person are served from indexes.
+    """
+
+    def __init__(self, path: str | Path = CATALOG_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Writes
+
+    def find_drama_id(self, values: dict) -> int | None:
+        if values["imdb_id"]:
+            row = self.conn.execute(
+                "SELECT id FROM dramas WHERE imdb_id = ?", (values["imdb_id"],)
+            ).fetchone()
+            if row:
+                return row["id"]
+        # Rows loaded from a CSV have no IMDb id: fall back to title + year, and let a later
+        # row that has the id claim a match that does not have one yet
+        row = self.conn.execute(
+            "SELECT id FROM dramas WHERE title = ? AND release_year IS ? "
+            "AND (imdb_id IS NULL OR ? IS NULL OR imdb_id = ?) LIMIT 1",
+            (values["title"], values["release_year"], values["imdb_id"], values["imdb_id"]),
+        ).fetchone()
+        return row["id"] if row else None
+
+    def person_id(self, name: str) -> int:
+        self.conn.execute("INSERT OR IGNORE INTO people (name) VALUES (?)", (name,))
+        return self.conn.execute("SELECT id FROM people WHERE name = ?", (name,)).fetchone()["id"]
+
+    def upsert_drama(self, drama: dict) -> int:
+        values = drama_values(drama)
+        drama_id = self.find_drama_id(values)
+        if drama_id is None:
+            cursor = self.conn.execute(
+                f"INSERT INTO dramas ({', '.join(DRAMA_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in DRAMA_COLUMNS)})",
+                [values[column] for column in DRAMA_COLUMNS],
+            )
+            drama_id = cursor.lastrowid
+        else:
+            self.conn.execute(
+                "UPDATE dramas SET "
+                + ", ".join(f"{column} = COALESCE(?, {column})" for column in DRAMA_COLUMNS)
+                + " WHERE id = ?",
+                [values[column] for column in DRAMA_COLUMNS] + [drama_id],
+            )
+
+        for role in PEOPLE_FIELDS:
+            names = split_people(drama.get(role))
+            if not names:
+                continue
+            # A fresh list of people replaces the previous one for that role
+            self.conn.execute("DELETE FROM credits WHERE drama_id = ? AND role = ?", (drama_id, role))
+            self.conn.executemany(
+                "INSERT INTO credits (drama_id, person_id, role, position) VALUES (?, ?, ?, ?)",
+                [(drama_id, self.person_id(name), role, i) for i, name in enumerate(names)],
+            )
+
+        if drama.get("source"):
+            self.conn.execute(
+                "INSERT INTO sources (title, url, drama_id) VALUES (?, ?, ?) "
+                "ON CONFLICT (title) DO UPDATE SET url = excluded.url, drama_id = excluded.drama_id",
+                (values["title"], drama["source"], drama_id),
+            )
+        return drama_id
+
+    def upsert_dramas(self, dramas) -> int:
+        """Insert or update every drama in one transaction; returns how many were written."""
+        count = 0
+        with self.conn:
+            for drama in dramas:
+                if drama.get("title"):
+                    self.upsert_drama(drama)
+                    count += 1
+        return count
+
+    def upsert_sources(self, title_to_url: dict[str, str]) -> None:
+        """Record the Wikipedia article of each title (linked to its drama once it exists)."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO sources (title, url, drama_id) "
+                "VALUES (?, ?, (SELECT id FROM dramas WHERE title = ? LIMIT 1)) "
+                "ON CONFLICT (title) DO UPDATE SET url = excluded.url, "
+                "drama_id = COALESCE(excluded.drama_id, drama_id)",
+                [(title, url, title) for title, url in title_to_url.items()],
+            )
+
+    def import_wikipedia_list(self, wikipedia_list_path: str | Path) -> int:
+        """Load a wikipedia_list.json ([{title: url}, ...]) into the sources table."""
+        with open(wikipedia_list_path, encoding="utf-8") as f:
+            raw_list = json.load(f)
+        title_to_url = dict(next(iter(entry.items())) for entry in raw_list)
+        self.upsert_sources(title_to_url)
+        return len(title_to_url)
+
+    def record_fetch(self, title: str, url: str, fetched_at: str, revision: int | None = None) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sources (title, url, fetched_at, revision) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (title) DO UPDATE SET url = excluded.url, "
+                "fetched_at = excluded.fetched_at, revision = excluded.revision",
+                (title, url, fetched_at, revision),
+            )
+
+    # Reads
+
+    def wikipedia_map(self) -> dict[str, str]:
+        """{title: url} for every known article, like build_wikipedia_map()."""
+        return dict(self.conn.execute("SELECT title, url FROM sources").fetchall())
+
+    def wikipedia_url(self, title: str) -> str | None:
+        row = self.conn.execute("SELECT url FROM sources WHERE title = ?", (title,)).fetchone()
+        return row["url"] if row else None
+
+    def get_drama(self, drama_id: int) -> dict | None:
+        """The drama as a dict, with people as lists and its Wikipedia `source` URL."""
+        row = self.conn.execute("SELECT * FROM dramas WHERE id = ?", (drama_id,)).fetchone()
+        if row is None:
+            return None
+        drama = dict(row)
+        for role in PEOPLE_FIELDS:
+            drama[role] = [
+                name
+                for (name,) in self.conn.execute(
+                    "SELECT p.name FROM credits c JOIN people p ON p.id = c.person_id "
+                    "WHERE c.drama_id = ? AND c.role = ? ORDER BY c.position",
+                    (drama_id, role),
+                )
+            ]
+        source = self.conn.execute(
+            "SELECT url FROM sources WHERE drama_id = ? LIMIT 1", (drama_id,)
+        ).fetchone()
+        drama["source"] = source["url"] if source else None
+        return drama
+
+    def find_by_title(self, title: str, year: int | None = None) -> list[dict]:
+        sql, params = "SELECT id FROM dramas WHERE title = ?", [title]
+        if year is not None:
+            sql += " AND start_year = ?"
+            params.append(year)
+        return [self.get_drama(row["id"]) for row in self.conn.execute(sql, params).fetchall()]
+
+    def dramas_by_person(self, name: str, role: str | None = None) -> list[dict]:
+        """Every drama crediting `name` (optionally only as `role`: cast/screenwriter/director)."""
+        sql = (
+            "SELECT DISTINCT c.drama_id FROM people p JOIN credits c ON c.person_id = p.id "
+            "WHERE p.name = ?"
+        )
+        params = [name]
+        if role is not None:
+            sql += " AND c.role = ?"
+            params.append(role)
+        ids = [row["drama_id"] for row in self.conn.execute(sql, params).fetchall()]
+        return [self.get_drama(drama_id) for drama_id in sorted(ids)]
+
+    def dramas_in_year(self, year: int) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT id FROM dramas WHERE start_year = ? ORDER BY title", (year,)
+        ).fetchall()
+        return [self.get_drama(row["id"]) for row in rows]
+
+    def dramas_missing(self, field: str) -> list[dict]:
+        """Dramas with no value for `field` (plot, network_provider, a people role, source, ...)."""
+        if field not in MISSING_CHECKS:
+            raise ValueError(f"Unknown field {field!r}; expected one of {sorted(MISSING_CHECKS)}")
+        rows = self.conn.execute(
+            f"SELECT d.id FROM dramas d WHERE {MISSING_CHECKS[field]} ORDER BY d.id"
+        ).fetchall()
+        return [self.get_drama(row["id"]) for row in rows]
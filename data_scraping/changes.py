@@ -0,0 +1,250 @@
+"""
+Change detection between runs.
+
+Each drama is reduced to the CSV row it is written as, and the row's typed values (as
+columnar.to_record() parses them, so "7.4" and "7.40" are equal) are hashed. Those hashes
+are compared with the previous output, which serves as the snapshot. The result is a
+changeset: rows added, rows removed, and rows modified (with old and new values per field).
+Outputs are only replaced when something changed, so an unchanged run leaves
+kdrama_list.csv byte for byte as it was, and downstream consumers can work from the
+changeset alone. A change to any row still rewrites the whole CSV: the changeset says which
+records differ, the file is not patched in place.
+"""
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .columnar import PEOPLE_FIELDS, parse_year_range, to_record
+from .metrics import get_metrics
+
+# Columns of kdrama_list.csv, in order
+CSV_FIELDS = [
+    "title",
+    "imdb_id",
+    "release_year",
+    "num_episodes",
+    "rating_type",
+    "rating_score",
+    "cast",
+    "short_description",
+    "network_provider",
+    "screenwriter",
+    "director",
+    "plot",
+    "source",
+]
+
+
+def csv_row(drama: dict) -> dict[str, str]:
+    """The CSV row of a drama dict (scraper output or CSV row): text values, people comma-joined."""
+    row = {}
+    for field in CSV_FIELDS:
+        value = drama.get(field)
+        if field in PEOPLE_FIELDS and isinstance(value, (list, tuple)):
+            value = ", ".join(value)
+        row[field] = "" if value is None else str(value)
+    return row
+
+
+def title_key(row: dict) -> tuple:
+    """
+    Title + first release year of a row: a still-airing '2021–' that becomes '2021–2022'
+    keeps its key.
+    """
+    start_year, _ = parse_year_range(row.get("release_year"))
+    return ("title", (row.get("title") or "").strip(), start_year)
+
+
+def record_key(row: dict) -> tuple:
+    """Identity of a row across runs: its IMDb id, else title_key()."""
+    if row.get("imdb_id"):
+        return ("imdb", row["imdb_id"])
+    return title_key(row)
+
+
+def typed_values(row: dict) -> dict:
+    """{field: typed value} of a row's CSV_FIELDS, as columnar.to_record() parses them."""
+    record = to_record(row)
+    values = {field: record.get(field) for field in CSV_FIELDS}
+    values["release_year"] = [record["start_year"], record["end_year"]]
+    return values
+
+
+def record_hash(row: dict) -> str:
+    """Digest of a row's typed values; rows that only differ in formatting hash equal."""
+    values = json.dumps(list(typed_values(row).values()), ensure_ascii=False)
+    return hashlib.blake2b(values.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_snapshot(path: str | Path) -> dict[tuple, list[dict]]:
+    """
+    {record_key: [row, ...]} of a previous output CSV (several rows when they share a key, e.g.
+    same title and year without IMDb ids, in file order); empty when there is none yet.
+    """
+    snapshot = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                snapshot.setdefault(record_key(row), []).append(csv_row(row))
+    except FileNotFoundError:
+        pass
+    return snapshot
+
+
+class ChangeTracker:
+    """
+    Compares rows, one at a time, with a previous snapshot ({record_key: [row, ...]}).
+    update() classifies each row; changeset() lists everything that differs so far, plus the
+    snapshot rows that were never matched (removed). Each snapshot row matches at most one
+    current row: an identical one if there is one, else the first in file order. A row with an
+    IMDb id also matches a snapshot row without one by title_key(), e.g. an output written
+    before the id was known.
+    """
+
+    def __init__(self, previous: dict[tuple, list[dict]]):
+        self.previous = previous
+        # (hash, row) of the snapshot rows not matched yet, per key
+        self._unmatched = {key: [(record_hash(row), row) for row in rows] for key, rows in previous.items()}
+        self._keys_by_title = {
+            title_key(row): key for key, rows in previous.items() for row in rows if not row.get("imdb_id")
+        }
+        self.added: list[dict] = []
+        self.modified: list[dict] = []
+        self.unchanged = 0
+
+    def update(self, row: dict) -> str:
+        """Record one current row; returns "added", "modified" or "unchanged"."""
+        key = record_key(row)
+        if not self._unmatched.get(key):
+            key = self._keys_by_title.get(title_key(row), key)
+        candidates = self._unmatched.get(key)
+        new_hash = record_hash(row)
+        if not candidates:
+            status = "added"
+            self.added.append(row)
+        else:
+            match = next((candidate for candidate in candidates if candidate[0] == new_hash), candidates[0])
+            candidates.remove(match)
+            old_hash, old = match
+            if old_hash == new_hash:
+                status = "unchanged"
+                self.unchanged += 1
+            else:
+                status = "modified"
+                old_values, new_values = typed_values(old), typed_values(row)
+                self.modified.append(
+                    {
+                        "title": row["title"],
+                        "imdb_id": row["imdb_id"],
+                        "release_year": row["release_year"],
+                        "fields": {
+                            field: [old.get(field, ""), row.get(field, "")]
+                            for field in CSV_FIELDS
+                            if old_values[field] != new_values[field]
+                        },
+                    }
+                )
+        get_metrics().inc("records_total", change=status)
+        return status
+
+    @property
+    def removed(self) -> list[dict]:
+        return [row for rows in self._unmatched.values() for _, row in rows]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def changeset(self) -> dict:
+        return {
+            "added": self.added,
+            "modified": self.modified,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_records(previous: dict[tuple, list[dict]], dramas: Iterable[dict]) -> dict:
+    """Changeset between a snapshot (see load_snapshot) and the current dramas."""
+    tracker = ChangeTracker(previous)
+    for drama in dramas:
+        tracker.update(csv_row(drama))
+    return tracker.changeset()
+
+
+def summary(changeset: dict) -> str:
+    return (
+        f"{len(changeset['added'])} added, {len(changeset['modified'])} modified, "
+        f"{len(changeset['removed'])} removed, {changeset['unchanged']} unchanged"
+    )
+
+
+class ChangeDetectingCSVWriter:
+    """
+    Writes kdrama_list.csv through a ChangeTracker against its previous contents.
+
+    Rows go to a temporary file that close() moves into place only when the changeset is not
+    empty (or there was no previous file); otherwise the old file is left untouched. The
+    changeset is written next to it as <name>.changes.json either way. Use it as a context
+    manager; on an error the previous output is kept.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.changes_path = self.path.with_suffix(".changes.json")
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.tracker = ChangeTracker(load_snapshot(self.path))
+        self._file = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+        self._writer.writeheader()
+
+    @property
+    def changed(self) -> bool:
+        return self.tracker.changed or not self.path.exists()
+
+    def write(self, drama: dict) -> str:
+        """Write a drama's row; returns its change status (see ChangeTracker.update)."""
+        row = csv_row(drama)
+        self._writer.writerow(row)
+        return self.tracker.update(row)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> dict:
+        """Publish the CSV if it changed and write the changeset; returns the changeset."""
+        self._file.close()
+        changeset = self.tracker.changeset()
+        metrics = get_metrics()
+        metrics.inc("records_total", len(changeset["removed"]), change="removed")
+        if self.changed:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.tmp_path.unlink()
+        with open(self.changes_path, "w", encoding="utf-8") as f:
+            json.dump(changeset, f, ensure_ascii=False, indent=2)
+        metrics.event(
+            "changeset",
+            added=len(changeset["added"]),
+            modified=len(changeset["modified"]),
+            removed=len(changeset["removed"]),
+            unchanged=changeset["unchanged"],
+        )
+        return changeset
+
+    def abort(self) -> None:
+        """Drop the partial file; the previous output stays in place."""
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
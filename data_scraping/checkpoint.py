@@ -0,0 +1,65 @@
+import json
+import os
+from pathlib import Path
+
+
+class ChunkJournal:
+    """
+    Append-only JSON-lines journal of completed enrichment chunks.
+
+    The first line identifies the run (input file and its size/mtime, chunk size); every following
+    line holds one committed chunk. Each line is flushed and fsync'ed before the next chunk
+    starts, so after a crash or Ctrl-C everything up to the last committed chunk survives,
+    and a torn final line is simply ignored.
+    """
+
+    def __init__(self, path: str | Path, run_key: dict):
+        self.path = Path(path)
+        self.run_key = run_key
+
+    def load(self) -> dict[int, dict]:
+        """Return {chunk_index: {"rows": [...], "manifest": {...}}} committed by a matching run."""
+        if not self.path.exists():
+            return {}
+
+        committed = {}
+        with open(self.path, encoding="utf-8") as f:
+            lines = iter(f)
+            try:
+                header = json.loads(next(lines))
+            except (StopIteration, ValueError):
+                return {}
+            if header.get("run") != self.run_key:
+                # Journal belongs to a different input or chunking; it can't be reused
+                return {}
+
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Partially written last line from an interrupted run
+                    break
+                committed[record["chunk"]] = record
+        return committed
+
+    def start(self, committed: dict[int, dict] | None = None) -> None:
+        """Begin a fresh journal, carrying over any chunks being resumed."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"run": self.run_key}) + "\n")
+            for chunk_index in sorted(committed or {}):
+                f.write(json.dumps(committed[chunk_index], ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def commit(self, chunk_index: int, rows: list[dict], manifest: dict[str, dict]) -> None:
+        """Durably append one finished chunk."""
+        record = {"chunk": chunk_index, "rows": rows, "manifest": manifest}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
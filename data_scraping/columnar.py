@@ -0,0 +1,168 @@
+"""
+Typed Parquet export of the drama catalog.
+
+The CSVs keep everything as text (comma-joined people, "2003–2004" year ranges, string
+ratings); here every row is converted once to the typed schema below and written in row
+groups of PARQUET_BATCH_SIZE, so analytics can load selected columns without re-parsing.
+pyarrow is optional: without it the CSV outputs still work and only this export is disabled.
+"""
+import os
+import re
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from .config import PARQUET_BATCH_SIZE
+
+YEAR_RE = re.compile(r"\d{4}")
+# Fields holding lists of names (comma-joined in the CSVs)
+PEOPLE_FIELDS = ("cast", "screenwriter", "director")
+TEXT_FIELDS = (
+    "title",
+    "imdb_id",
+    "rating_type",
+    "short_description",
+    "network_provider",
+    "plot",
+    "source",
+)
+
+if pa is not None:
+    SCHEMA = pa.schema(
+        [
+            ("title", pa.string()),
+            ("imdb_id", pa.string()),
+            ("start_year", pa.int16()),
+            ("end_year", pa.int16()),
+            ("num_episodes", pa.int32()),
+            ("rating_type", pa.string()),
+            ("rating_score", pa.float32()),
+            ("cast", pa.list_(pa.string())),
+            ("short_description", pa.string()),
+            ("network_provider", pa.string()),
+            ("screenwriter", pa.list_(pa.string())),
+            ("director", pa.list_(pa.string())),
+            ("plot", pa.string()),
+            ("source", pa.string()),
+        ]
+    )
+else:
+    SCHEMA = None
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def split_people(value) -> list[str]:
+    """A list of names, or a comma-joined string of them -> list of non-empty names."""
+    if isinstance(value, (list, tuple)):
+        names = value
+    else:
+        names = (value or "").split(",")
+    return [name.strip() for name in names if name and name.strip()]
+
+
+def parse_year_range(value) -> tuple[int | None, int | None]:
+    """
+    '2003–2004' -> (2003, 2004), '2007' -> (2007, 2007), '2021–' -> (2021, None) (still airing),
+    '' -> (None, None).
+    """
+    value = str(value or "").strip()
+    years = [int(year) for year in YEAR_RE.findall(value)]
+    if not years:
+        return None, None
+    if len(years) == 1:
+        # A trailing dash means the show has not ended yet
+        ongoing = value.rstrip().endswith(("–", "-"))
+        return years[0], None if ongoing else years[0]
+    return years[0], years[-1]
+
+
+def parse_float(value) -> float | None:
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_int(value) -> int | None:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def to_record(drama: dict) -> dict:
+    """Convert a drama dict (from the scrapers or a CSV row) to the typed SCHEMA columns."""
+    record = {field: drama.get(field) or None for field in TEXT_FIELDS}
+    record["start_year"], record["end_year"] = parse_year_range(drama.get("release_year"))
+    record["num_episodes"] = parse_int(drama.get("num_episodes"))
+    record["rating_score"] = parse_float(drama.get("rating_score"))
+    for field in PEOPLE_FIELDS:
+        record[field] = split_people(drama.get(field))
+    return record
+
+
+class ParquetBatchWriter:
+    """
+    Append dramas to a Parquet file, one row group per `batch_size` rows.
+
+    The file is written under a temporary name and moved into place by close(), so readers
+    never see a half-written file. Use it as a context manager.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = PARQUET_BATCH_SIZE):
+        if not available():
+            raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._writer = pq.ParquetWriter(self.tmp_path, SCHEMA)
+        self._batch: list[dict] = []
+        self.rows_written = 0
+
+    def write(self, drama: dict) -> None:
+        self._batch.append(to_record(drama))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, dramas) -> None:
+        for drama in dramas:
+            self.write(drama)
+
+    def flush(self) -> None:
+        if not self._batch:
+            return
+        self._writer.write_table(pa.Table.from_pylist(self._batch, schema=SCHEMA))
+        self.rows_written += len(self._batch)
+        self._batch = []
+
+    def close(self) -> None:
+        if self._writer is None:
+            return  # Already closed or aborted
+        self.flush()
+        self._writer.close()
+        self._writer = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Drop the partial file instead of publishing it (e.g. when nothing changed)."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .http_client import HttpClient
+from .scrapers.wikipedia_scraper import WikipediaScraper
+
+
+class RateLimiter:
+    """Thread-safe per-host rate limiter (at most `requests_per_second` requests to each host)."""
+
+    def __init__(self, requests_per_second: float | None = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the host of `url` is allowed."""
+        if not self.interval:
+            return
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            # Reserve the next free slot for this host, then sleep outside the lock
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AsyncRateLimiter:
+    """asyncio version of RateLimiter: callers await their slot instead of blocking a thread."""
+
+    def __init__(self, requests_per_second: float | None = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot: dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+
+        # No lock needed: nothing awaits between reading and reserving the slot
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def map_ordered(func, items, max_workers: int = 1) -> list:
+    """Apply `func` to every item using a thread pool; results come back in input order."""
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def make_parse_executor(parse_workers: int) -> ProcessPoolExecutor | None:
+    """
+    Process pool for the CPU-bound parse stage (None for 0 workers: parse in the fetching
+    threads). Fetch threads hand it raw page bytes and block on the result, so parsing is not
+    serialized by the GIL, but runs on at most as many cores as there are fetch threads.
+    """
+    if parse_workers <= 0:
+        return None
+    # Workers are started while fetch threads are running, which forking does not survive safely
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=context)
+
+
+def fetch_wikipedia_info(
+    urls,
+    headers: dict,
+    max_workers: int = 1,
+    requests_per_second: float | None = None,
+    rate_limiter: RateLimiter | None = None,
+    client: HttpClient | None = None,
+    parse_executor: Executor | None = None,
+) -> list[list[dict]]:
+    """
+    Fetch and parse every Wikipedia URL concurrently (parsing in `parse_executor` if given,
+    while the fetching thread waits for the result).
+
+    Returns one info list per URL (same order as `urls`); failed pages give an empty list,
+    just like WikipediaScraper.get_info_list().
+    """
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(requests_per_second)
+
+    def fetch_one(url: str) -> list[dict]:
+        rate_limiter.wait(url)
+        return WikipediaScraper(url, headers, client=client).get_info_list(parse_executor)
+
+    return map_ordered(fetch_one, urls, max_workers=max_workers)
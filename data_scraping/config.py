@@ -1,9 +1,20 @@
+import os
+from pathlib import Path
+
 URLs = {
     "2000s": 'https://www.imdb.com/list/ls565286044/',
     "2010s": "https://www.imdb.com/list/ls565286034/",
     "2020s": "https://www.imdb.com/list/ls565283980/",
 }
 
+# Additional IMDb list ids (e.g. "ls565286044") crawled alongside the period lists
+IMDB_EXTRA_LIST_IDS: list[str] = []
+# IMDb list pages fetched in parallel
+IMDB_MAX_WORKERS = 4
+
+# Periods whose IMDb list is rendered with JavaScript and must be scraped with a browser
+SELENIUM_PERIODS = {"2010s"}
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -11,4 +22,69 @@ HEADERS = {
         "Chrome/130.0.0.0 Safari/537.36"
     ),
     "Accept-Language": "en-US,en;q=0.9",
-}
\ No newline at end of file
+}
+
+# Wikipedia enrichment: number of pages fetched in parallel and the per-host request cap
+WIKIPEDIA_MAX_WORKERS = 8
+WIKIPEDIA_REQUESTS_PER_SECOND = 5.0
+# Wikipedia HTML parser backend: "html.parser" (pure Python) or "lxml" (faster, needs lxml).
+# lxml builds a different tree for some malformed markup, and its output has only been checked
+# against html.parser on the saved test pages, so it is opt-in.
+WIKIPEDIA_PARSER = "html.parser"
+# Processes that parse fetched pages outside the fetching process's GIL. Each fetch thread waits
+# for its page to be parsed, so at most as many pages as there are fetch threads are parsed at
+# once (0 = parse in the fetching threads)
+PARSE_WORKERS = os.cpu_count() or 1
+# MediaWiki Action API backend: endpoint and titles per request (the API allows at most 50)
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKIPEDIA_API_BATCH_SIZE = 50
+# Incremental enrichment re-fetches a title once its last successful fetch is older than this
+WIKIPEDIA_MAX_AGE_DAYS = 30
+# Fuzzy title -> Wikipedia matching: matches scoring below TITLE_MATCH_MIN_SCORE are dropped,
+# those below TITLE_MATCH_REVIEW_SCORE are not applied, only listed in a review report. An optional
+# cached JSON list of Wikipedia article titles adds candidates beyond wikipedia_list.json.
+TITLE_MATCH_MIN_SCORE = 0.6
+TITLE_MATCH_REVIEW_SCORE = 0.85
+WIKIPEDIA_TITLE_LIST_PATH = Path(__file__).parent / "data" / "wikipedia_titles.json"
+# Streaming pipeline: dramas in flight between the IMDb scrape and the CSV writer
+PIPELINE_BUFFER_SIZE = 32
+# Rows per row group in the typed Parquet export (needs pyarrow)
+PARQUET_BATCH_SIZE = 256
+# SQLite catalog of dramas, people, credits and Wikipedia sources
+CATALOG_PATH = Path(__file__).parent / "data" / "catalog.sqlite3"
+
+# Shared HTTP client: connect/read timeout (seconds), retries for transient errors and
+# exponential backoff base (0.5s, 1s, 2s, ...); Retry-After headers take precedence
+HTTP_TIMEOUT = 15
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_POOL_SIZE = WIKIPEDIA_MAX_WORKERS
+# Async client (async_http_client.py, needs aiohttp): requests in flight at once
+ASYNC_HTTP_MAX_CONCURRENCY = WIKIPEDIA_MAX_WORKERS
+
+# On-disk response cache (set HTTP_CACHE_DIR to None to disable). Cached pages younger than
+# HTTP_CACHE_TTL seconds are reused as-is, older ones are revalidated with ETag/Last-Modified.
+# Set KDRAMA_OFFLINE=1 to replay purely from the cache without touching the network.
+HTTP_CACHE_DIR = Path(__file__).parent / ".http_cache"
+HTTP_CACHE_TTL = 7 * 24 * 60 * 60
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Cache hits record their last use in memory, and on disk at most once per this many seconds
+HTTP_CACHE_TOUCH_INTERVAL = 60 * 60
+HTTP_OFFLINE = os.environ.get("KDRAMA_OFFLINE") == "1"
+
+# Selenium browser pool: headless Chrome by default. CHROMEDRIVER_PATH overrides the driver
+# binary (e.g. /opt/homebrew/bin/chromedriver); unset, Selenium Manager finds one.
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+SELENIUM_HEADLESS = os.environ.get("SELENIUM_HEADLESS", "1") != "0"
+SELENIUM_POOL_SIZE = 2
+# Seconds to wait for the list to appear, and for more items after each scroll
+SELENIUM_WAIT_TIMEOUT = 15
+SELENIUM_SETTLE_TIMEOUT = 2
+
+# Upper bounds (seconds) of the stage latency histograms in the metrics snapshots
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Offline benchmarks (python -m data_scraping.benchmark): recorded baseline, and how much slower
+# than it (0.5 = 50%) a case may get before it is reported as a regression
+BENCHMARK_BASELINE_PATH = Path(__file__).parent / "tests" / "fixtures" / "benchmark_baseline.json"
+BENCHMARK_REGRESSION_THRESHOLD = 0.5
@@ -1,23 +1,179 @@
+import argparse
 import csv
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from .config import HEADERS
-from .scrapers.wikipedia_scraper import WikipediaScraper
-from .run import build_wikipedia_map
+from .config import (
+    HEADERS,
+    PARSE_WORKERS,
+    WIKIPEDIA_API_BATCH_SIZE,
+    WIKIPEDIA_MAX_AGE_DAYS,
+    WIKIPEDIA_MAX_WORKERS,
+    WIKIPEDIA_REQUESTS_PER_SECOND,
+)
+from .catalog import Catalog
+from .checkpoint import ChunkJournal
+from .columnar import ParquetBatchWriter
+from .concurrency import RateLimiter, fetch_wikipedia_info, make_parse_executor
+from .helper import apply_wikipedia_info
+from .http_client import HttpClient
+from .metrics import get_metrics
+from .pipeline import iter_chunks
+from .scrapers.wikipedia_api import WikipediaApiScraper
+from .title_matcher import TitleMatcher, write_review_report
 
 
 CHUNK_SIZE = 10
 
+# Fetch backends: rendered article HTML, or batched wikitext from the MediaWiki Action API
+BACKENDS = ("html", "api")
+
+# Columns filled in from Wikipedia
+WIKI_FIELDS = ["network_provider", "screenwriter", "director", "plot", "source"]
+
+
+def load_manifest(manifest_path: Path) -> dict[str, dict]:
+    """
+    Load the {title: {"source": url, "fetched_at": iso timestamp, "revision": id, "absent": [field,
+    ...]}} manifest ("absent": the WIKI_FIELDS the article had no value for).
+    """
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path: Path, manifest: dict[str, dict]) -> None:
+    # Write to a temp file and rename so an interrupted run never leaves a truncated manifest
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def is_fresh(
+    entry: dict | None,
+    wiki_url: str,
+    max_age_days: float | None,
+    now: datetime,
+    revision: int | None = None,
+) -> bool:
+    """
+    True if the manifest entry was fetched from `wiki_url` and, when the article's current
+    `revision` id is known, recorded that revision; otherwise if it was fetched less than
+    `max_age_days` ago.
+    """
+    if not entry or entry.get("source") != wiki_url:
+        return False
+    if revision is not None:
+        return entry.get("revision") == revision
+    if max_age_days is None:
+        return True
+    fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    return now - fetched_at < timedelta(days=max_age_days)
+
+
+def blank_fields(row: dict) -> list[str]:
+    return [field for field in WIKI_FIELDS if not (row.get(field) or "").strip()]
+
+
+def has_missing_fields(row: dict, entry: dict | None = None) -> bool:
+    """
+    True if a Wikipedia field of a previous output row is blank although its article may have
+    a value: fields the last fetch recorded as absent (manifest `entry`) don't count.
+    """
+    absent = (entry or {}).get("absent", ())
+    return any(field not in absent for field in blank_fields(row))
+
+
+def copy_wiki_fields(source_row: dict, target_row: dict) -> None:
+    for field in WIKI_FIELDS:
+        target_row[field] = source_row.get(field, "")
+
+
+def keep_filled_fields(source_row: dict, target_row: dict) -> None:
+    """Copy the non-blank Wikipedia fields (e.g. hand-edited ones) of a previous row to a refetched one."""
+    for field in WIKI_FIELDS:
+        if (source_row.get(field) or "").strip():
+            target_row[field] = source_row[field]
+
+
+def load_existing_output(output_csv: Path) -> dict[str, dict]:
+    """Return {title: row} from a previous enrichment output (empty if there is none)."""
+    if not output_csv.exists():
+        return {}
+    with open(output_csv, encoding="utf-8") as f:
+        return {row["title"].strip(): row for row in csv.DictReader(f) if row.get("title")}
+
+
+def save_to_catalog(catalog: Catalog, rows: list[dict], chunk_manifest: dict[str, dict]) -> None:
+    catalog.upsert_dramas(rows)
+    for title, entry in chunk_manifest.items():
+        catalog.record_fetch(title, entry["source"], entry["fetched_at"], entry.get("revision"))
+
 
 def enrich_kdrama_list(
     input_csv: str | Path | None = None,
     wikipedia_list_path: str | Path | None = None,
     output_csv: str | Path | None = None,
+    max_workers: int = WIKIPEDIA_MAX_WORKERS,
+    requests_per_second: float | None = WIKIPEDIA_REQUESTS_PER_SECOND,
+    client: HttpClient | None = None,
+    incremental: bool = False,
+    max_age_days: float | None = WIKIPEDIA_MAX_AGE_DAYS,
+    manifest_path: str | Path | None = None,
+    resume: bool = False,
+    backend: str = "html",
+    chunk_size: int | None = None,
+    parquet_output: str | Path | None = None,
+    catalog_path: str | Path | None = None,
+    title_list_path: str | Path | None = None,
+    parse_workers: int = 0,
 ) -> None:
     """
     Read an existing kdrama_list.csv, enrich each row with Wikipedia data (if available),
-    and write out a new CSV with additional fields.
+    and write out a new CSV with additional fields. The input is streamed one chunk at a
+    time, so memory use does not grow with the size of the catalog.
+
+    Titles are matched to articles fuzzily (see title_matcher.py) against wikipedia_list.json
+    and the optional cached `title_list_path`; low-confidence and missing matches are listed
+    in a review CSV next to the output.
+
+    Pages are fetched by up to `max_workers` threads, with at most `requests_per_second`
+    requests per host; results are written back to their original rows. With
+    `parse_workers`, the fetched pages are parsed by that many processes instead of the
+    fetching threads, so parsing is not serialized by the GIL; each thread waits for its page,
+    so up to min(max_workers, parse_workers) pages are parsed at once (worth it for large runs:
+    the pool costs a fraction of a second to start).
+
+    With `incremental=True`, rows whose previous output came from the same Wikipedia URL less
+    than `max_age_days` ago (according to the manifest) keep their existing values, so only
+    new, previously failed, stale or missing-field titles (any Wikipedia field blank) are
+    fetched.
+
+    Every finished chunk is checkpointed to a journal next to the output CSV; with
+    `resume=True` an interrupted run picks up after its last committed chunk.
+
+    `backend="api"` fetches wikitext for a whole chunk (50 titles by default) per MediaWiki
+    Action API call instead of one rendered page per title, and records revision ids so
+    incremental runs can skip articles that have not been edited.
+
+    Stage timings, HTTP traffic, cache hits and per-field extraction results are logged to
+    `<output>.metrics.jsonl` (one line per chunk, plus a run summary) and snapshotted in
+    Prometheus text format to `<output>.metrics.prom`.
+
+    With `parquet_output`, the enriched rows are also written there with typed columns
+    (see columnar.py; needs pyarrow). With `catalog_path`, they are also upserted into that
+    SQLite catalog (see catalog.py) along with when each article was fetched.
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    if chunk_size is None:
+        chunk_size = WIKIPEDIA_API_BATCH_SIZE if backend == "api" else CHUNK_SIZE
+
     base_dir = Path(__file__).parent
 
     if input_csv is None:
@@ -36,78 +192,292 @@ def enrich_kdrama_list(
     else:
         output_csv = Path(output_csv)
 
+    if manifest_path is None:
+        manifest_path = output_csv.with_suffix(".manifest.json")
+    else:
+        manifest_path = Path(manifest_path)
+
+    metrics = get_metrics()
+    metrics.reset(output_csv.with_suffix(".metrics.jsonl"))
+
     print(f"Loading Wikipedia mapping from {wikipedia_list_path}")
-    title_to_url = build_wikipedia_map(wikipedia_list_path)
+    matcher = TitleMatcher.from_wikipedia_list(wikipedia_list_path, title_list_path)
+    review_rows = []
 
-    print(f"Loading input CSV from {input_csv}")
-    with open(input_csv, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        existing_fieldnames = reader.fieldnames or []
+    print(f"Streaming input CSV from {input_csv}")
+    input_file = open(input_csv, encoding="utf-8")
+    reader = csv.DictReader(input_file)
+    existing_fieldnames = reader.fieldnames or []
+    fieldnames = existing_fieldnames + [f for f in WIKI_FIELDS if f not in existing_fieldnames]
 
-    if not rows:
-        print("No rows found in input CSV. Nothing to enrich.")
-        return
+    manifest = load_manifest(manifest_path)
+    previous_rows = load_existing_output(output_csv) if incremental else {}
+    now = datetime.now(timezone.utc)
+
+    input_stat = input_csv.stat()
+    journal = ChunkJournal(
+        output_csv.with_suffix(".journal.jsonl"),
+        {
+            "input_csv": str(input_csv.resolve()),
+            "input_size": input_stat.st_size,
+            "input_mtime_ns": input_stat.st_mtime_ns,
+            "chunk_size": chunk_size,
+        },
+    )
+    committed = journal.load() if resume else {}
+    if resume:
+        print(f"Resuming: {len(committed)} chunks already committed in {journal.path}")
+    journal.start(committed)
 
-    total = len(rows)
-    print(f"Loaded {total} dramas from {input_csv}")
+    rate_limiter = RateLimiter(requests_per_second)
+    api_scraper = WikipediaApiScraper(HEADERS, client=client) if backend == "api" else None
 
-    extra_fields = ["network_provider", "screenwriter", "director", "plot", "source"]
-    fieldnames = existing_fieldnames + [f for f in extra_fields if f not in existing_fieldnames]
+    # Rows are streamed chunk by chunk into a temp file that replaces the output at the end,
+    # so only one chunk of the input is ever held in memory
+    tmp_csv = output_csv.with_name(output_csv.name + ".tmp")
+    output_file = open(tmp_csv, "w", newline="", encoding="utf-8")
+    writer = csv.DictWriter(output_file, fieldnames=fieldnames)
+    writer.writeheader()
+    parquet = ParquetBatchWriter(parquet_output) if parquet_output else None
+    catalog = Catalog(catalog_path) if catalog_path else None
+    # The API backend parses small wikitext batches, which is not worth a process hop
+    parse_executor = make_parse_executor(parse_workers) if api_scraper is None else None
 
     # Process in chunks so progress can be monitored
-    for start in range(0, total, CHUNK_SIZE):
-        end = min(start + CHUNK_SIZE, total)
-        chunk = rows[start:end]
-        chunk_index = start // CHUNK_SIZE + 1
-
-        attempts = 0
-        successes = 0
-
-        for row in chunk:
-            title = (row.get("title") or "").strip()
-            if not title:
-                continue
-
-            wiki_url = title_to_url.get(title)
-            if not wiki_url:
-                # No Wikipedia entry mapped for this title
-                continue
-
-            attempts += 1
-
-            wscraper = WikipediaScraper(wiki_url, HEADERS)
-            info_list = wscraper.get_info_list()
-
-            # If we couldn't fetch or parse the page, skip this drama
-            if not info_list:
-                continue
-
-            info = info_list[0]
-            row["network_provider"] = info.get("network", "")
-            row["screenwriter"] = ", ".join(info.get("screenwriter", []))
-            row["director"] = ", ".join(info.get("director", []))
-            row["plot"] = info.get("plot", "")
-            row["source"] = wiki_url
-            successes += 1
-
-        print(
-            f"Chunk {chunk_index}: rows {start + 1}-{end} | "
-            f"attempted {attempts} Wikipedia lookups | successes {successes}"
-        )
-
-    # Write out the enriched CSV (original rows are preserved; extra fields added when present)
-    print(f"Writing enriched CSV to {output_csv}")
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+    total = 0
+    try:
+        with input_file, output_file:
+            for chunk_index, chunk in enumerate(iter_chunks(reader, chunk_size), 1):
+                if chunk_index == 1:
+                    # Logged with the first row, so an empty input leaves no metrics files behind
+                    metrics.event(
+                        "run_start", input_csv=str(input_csv), backend=backend, incremental=incremental
+                    )
+                start, end = total, total + len(chunk)
+                total = end
+
+                if chunk_index in committed:
+                    # Finished before the interruption: restore its rows instead of re-fetching
+                    restored = committed[chunk_index]
+                    writer.writerows(restored["rows"])
+                    if parquet:
+                        parquet.write_many(restored["rows"])
+                    if catalog:
+                        save_to_catalog(catalog, restored["rows"], restored["manifest"])
+                    manifest.update(restored["manifest"])
+                    print(f"Chunk {chunk_index}: rows {start + 1}-{end} | restored from checkpoint")
+                    continue
+
+                chunk_started = time.perf_counter()
+                chunk_manifest = {}
+                current_revisions = {}
+                if incremental and api_scraper is not None:
+                    # One cheap ids-only query tells which previously enriched articles were edited
+                    current_revisions = api_scraper.get_revision_ids(
+                        previous_rows[title]["source"]
+                        for title in (row.get("title", "").strip() for row in chunk)
+                        if previous_rows.get(title, {}).get("source")
+                    )
+
+                # Collect the rows that have a Wikipedia entry mapped for their title
+                jobs = []
+                skipped = 0
+                for row in chunk:
+                    title = (row.get("title") or "").strip()
+                    if not title:
+                        continue
+
+                    match = matcher.match(title, row.get("release_year"))
+                    if match is None or match["needs_review"]:
+                        review_rows.append(
+                            {
+                                **(match or {}),
+                                "title": title,
+                                "year": row.get("release_year", ""),
+                                "status": "low confidence" if match else "no match",
+                            }
+                        )
+                    if match is None or match["needs_review"]:
+                        # No Wikipedia article found for this title, or only a low-confidence
+                        # one: fuzzy hits below the review score are mostly sequels and
+                        # near-namesakes ("Reply 1988" -> "Reply 1994"), so they are only reported
+                        continue
+                    wiki_url = match["url"]
+
+                    previous = previous_rows.get(title)
+                    if (
+                        previous
+                        and previous.get("source") == wiki_url
+                        and not has_missing_fields(previous, manifest.get(title))
+                        and is_fresh(
+                            manifest.get(title),
+                            wiki_url,
+                            max_age_days,
+                            now,
+                            current_revisions.get(wiki_url),
+                        )
+                    ):
+                        # Already enriched recently: keep the previous (possibly hand-edited) values
+                        copy_wiki_fields(previous, row)
+                        skipped += 1
+                        continue
 
+                    jobs.append((row, wiki_url))
+
+                attempts = len(jobs)
+                successes = 0
+
+                if api_scraper is not None:
+                    info_lists = api_scraper.get_info_lists(wiki_url for _, wiki_url in jobs)
+                else:
+                    info_lists = fetch_wikipedia_info(
+                        [wiki_url for _, wiki_url in jobs],
+                        HEADERS,
+                        max_workers=max_workers,
+                        rate_limiter=rate_limiter,
+                        client=client,
+                        parse_executor=parse_executor,
+                    )
+
+                for (row, wiki_url), info_list in zip(jobs, info_lists):
+                    # If we couldn't fetch or parse the page, skip this drama
+                    if not info_list:
+                        previous = previous_rows.get(row["title"].strip())
+                        if previous and previous.get("source") == wiki_url:
+                            # Keep the last good values instead of blanking them on a failed refresh
+                            copy_wiki_fields(previous, row)
+                        continue
+
+                    apply_wikipedia_info(row, info_list[0], wiki_url)
+                    chunk_manifest[row["title"].strip()] = {
+                        "source": wiki_url,
+                        "fetched_at": now.isoformat(timespec="seconds"),
+                        "revision": info_list[0].get("revision_id"),
+                        # Not missing next time: the article has nothing to fill them with
+                        "absent": blank_fields(row),
+                    }
+                    previous = previous_rows.get(row["title"].strip())
+                    if previous and previous.get("source") == wiki_url:
+                        # The refetch only fills blanks: earlier (possibly hand-edited) values stay
+                        keep_filled_fields(previous, row)
+                    successes += 1
+
+                manifest.update(chunk_manifest)
+                journal.commit(chunk_index, chunk, chunk_manifest)
+                with metrics.time("write"):
+                    # Original rows are preserved; extra fields added when present
+                    writer.writerows(chunk)
+                    if parquet:
+                        parquet.write_many(chunk)
+                    if catalog:
+                        save_to_catalog(catalog, chunk, chunk_manifest)
+
+                metrics.inc("enrich_rows_total", len(chunk))
+                metrics.event(
+                    "chunk",
+                    chunk=chunk_index,
+                    rows=len(chunk),
+                    attempted=attempts,
+                    successes=successes,
+                    up_to_date=skipped,
+                    seconds=round(time.perf_counter() - chunk_started, 3),
+                )
+                print(
+                    f"Chunk {chunk_index}: rows {start + 1}-{end} | "
+                    f"attempted {attempts} Wikipedia lookups | successes {successes}"
+                    + (f" | up to date {skipped}" if incremental else "")
+                )
+    except BaseException:
+        # Never publish a partial Parquet file; the CSV can still be resumed from the journal
+        if parquet:
+            parquet.abort()
+        raise
+    finally:
+        if catalog:
+            catalog.close()
+        if parse_executor:
+            parse_executor.shutdown()
+
+    if total == 0:
+        tmp_csv.unlink()
+        if parquet:
+            parquet.abort()
+        journal.remove()
+        print("No rows found in input CSV. Nothing to enrich.")
+        return
+
+    review_path = output_csv.with_suffix(".review.csv")
+    if review_rows:
+        write_review_report(review_path, review_rows)
+        print(f"{len(review_rows)} titles without a confident Wikipedia match listed in {review_path}")
+    else:
+        review_path.unlink(missing_ok=True)
+    os.replace(tmp_csv, output_csv)
+    print(f"Wrote {total} enriched rows to {output_csv}")
+    if parquet:
+        parquet.close()
+        print(f"Wrote {parquet.rows_written} typed rows to {parquet.path}")
+
+    save_manifest(manifest_path, manifest)
+    # The run is complete, so the checkpoints are no longer needed
+    journal.remove()
+
+    summary = metrics.summary()
+    metrics.event("run_summary", rows=total, **summary)
+    metrics.write_prometheus(output_csv.with_suffix(".metrics.prom"))
+    if summary["cache_hit_ratio"] is not None:
+        print(f"HTTP cache hit ratio: {summary['cache_hit_ratio']:.0%}")
     print("Done enriching kdrama list with Wikipedia data.")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich kdrama_list.csv with Wikipedia data.")
+    parser.add_argument("--input", dest="input_csv", help="IMDb CSV to enrich")
+    parser.add_argument("--wikipedia-list", dest="wikipedia_list_path", help="title -> URL JSON")
+    parser.add_argument("--output", dest="output_csv", help="enriched CSV to write")
+    parser.add_argument("--workers", dest="max_workers", type=int, default=WIKIPEDIA_MAX_WORKERS)
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="processes parsing the fetched pages (0 = parse in the fetching threads)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only fetch titles that are new, previously failed, missing a field or older than --max-age-days",
+    )
+    parser.add_argument("--max-age-days", type=float, default=WIKIPEDIA_MAX_AGE_DAYS)
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="html",
+        help="fetch rendered pages one by one (html) or wikitext in batches of 50 (api)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run after its last checkpointed chunk",
+    )
+    parser.add_argument(
+        "--parquet",
+        dest="parquet_output",
+        help="also write the enriched rows as typed Parquet to this path (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--title-list",
+        dest="title_list_path",
+        help="cached JSON list of Wikipedia article titles to match IMDb titles against",
+    )
+    parser.add_argument(
+        "--catalog",
+        dest="catalog_path",
+        help="also upsert the enriched rows into this SQLite catalog",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    enrich_kdrama_list()
+    enrich_kdrama_list(**vars(parse_args()))
 
 
@@ -9,4 +9,12 @@ def preprocess_title(title):
 
 def preprocess_episodes(episodes):
     # Remove 'eps' and space between the number and eps and convert it to an integer
-    return int(episodes.replace('eps', '').strip())
\ No newline at end of file
+    return int(episodes.replace('eps', '').strip())
+
+def apply_wikipedia_info(drama, info, wiki_url):
+    # Map the Wikipedia info dict into our CSV schema (people lists are comma-joined)
+    drama["network_provider"] = info.get("network", "")
+    drama["screenwriter"] = ", ".join(info.get("screenwriter", []))
+    drama["director"] = ", ".join(info.get("director", []))
+    drama["plot"] = info.get("plot", "")
+    drama["source"] = wiki_url
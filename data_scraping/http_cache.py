@@ -0,0 +1,200 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .config import HTTP_CACHE_TOUCH_INTERVAL
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache.
+
+    Bodies are stored content-addressed under `objects/<sha256 of body>` (identical pages are
+    stored once); `entries/<sha256 of url>.json` holds the validators (ETag / Last-Modified),
+    fetch time and last use of each URL. Entries older than `ttl` seconds are revalidated with
+    a conditional GET, and the least recently used entries are evicted once the bodies take
+    more than `max_bytes`.
+
+    Cache hits only update `last_used` in memory; it is written back once the stored value is
+    more than `touch_interval` seconds old, and for every entry by flush() (run at exit).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        offline: bool = False,
+        touch_interval: float = HTTP_CACHE_TOUCH_INTERVAL,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.touch_interval = touch_interval
+
+        self.entries_dir = self.cache_dir / "entries"
+        self.objects_dir = self.cache_dir / "objects"
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        # last_used of each entry as it is on disk, for entries touched since
+        self._saved_last_used: dict[str, float] = {}
+        atexit.register(self.flush)
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> dict[str, dict]:
+        index = {}
+        for path in self.entries_dir.glob("*.json"):
+            try:
+                index[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                # A half-written or corrupt entry is just a cache miss
+                path.unlink(missing_ok=True)
+        return index
+
+    def _save_entry(self, key: str, entry: dict) -> None:
+        self._saved_last_used.pop(key, None)
+        _atomic_write(self.entries_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+
+    def get(self, url: str) -> dict | None:
+        """Return the cache entry for `url` (without the body), or None."""
+        with self._lock:
+            entry = self._index.get(self.url_key(url))
+            if entry is None or not (self.objects_dir / entry["body"]).exists():
+                return None
+            return dict(entry)
+
+    def is_fresh(self, entry: dict) -> bool:
+        if self.ttl is None:
+            return True
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def read_body(self, entry: dict) -> bytes:
+        return (self.objects_dir / entry["body"]).read_bytes()
+
+    def touch(self, url: str, revalidated: bool = False) -> None:
+        """Mark `url` as used (and, after a 304, as freshly fetched)."""
+        key = self.url_key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return
+            now = time.time()
+            saved_last_used = self._saved_last_used.setdefault(key, entry["last_used"])
+            entry["last_used"] = now
+            if revalidated:
+                entry["fetched_at"] = now
+            if revalidated or now - saved_last_used >= self.touch_interval:
+                self._save_entry(key, entry)
+
+    def flush(self) -> None:
+        """Write back the last_used times that were only updated in memory."""
+        with self._lock:
+            for key, saved_last_used in list(self._saved_last_used.items()):
+                entry = self._index.get(key)
+                if entry is not None and entry["last_used"] != saved_last_used:
+                    try:
+                        self._save_entry(key, entry)
+                    except OSError:
+                        pass  # The cache directory is gone; last_used is only a hint
+            self._saved_last_used.clear()
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Cache a successful response body together with its validators."""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self.objects_dir / digest
+        if not object_path.exists():
+            _atomic_write(object_path, body)
+
+        now = time.time()
+        key = self.url_key(url)
+        entry = {
+            "url": url,
+            "body": digest,
+            "size": len(body),
+            "content_type": response.headers.get("Content-Type", ""),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "last_used": now,
+        }
+        with self._lock:
+            previous = self._index.get(key)
+            self._index[key] = entry
+            self._save_entry(key, entry)
+            if previous and previous["body"] != digest:
+                self._drop_body_if_unused(previous["body"])
+            self._evict()
+
+    def _drop_body_if_unused(self, digest: str) -> None:
+        if not any(entry["body"] == digest for entry in self._index.values()):
+            (self.objects_dir / digest).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the stored bodies fit in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+
+        sizes = {entry["body"]: entry["size"] for entry in self._index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        refcounts: dict[str, int] = {}
+        for entry in self._index.values():
+            refcounts[entry["body"]] = refcounts.get(entry["body"], 0) + 1
+
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            del self._index[key]
+            (self.entries_dir / f"{key}.json").unlink(missing_ok=True)
+            refcounts[entry["body"]] -= 1
+            if refcounts[entry["body"]] == 0:
+                (self.objects_dir / entry["body"]).unlink(missing_ok=True)
+                total -= entry["size"]
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """Validators for a conditional GET of a cached URL."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def to_response(self, entry: dict) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = entry["url"]
+        response._content = self.read_body(entry)
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": entry.get("content_type", ""), "X-Cache": "HIT"}
+        )
+        return response
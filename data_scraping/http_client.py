@@ -0,0 +1,149 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    HEADERS,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_TTL,
+    HTTP_OFFLINE,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+)
+from .http_cache import CacheMissError, ResponseCache
+from .metrics import get_metrics
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP session with retries, exponential backoff and timeouts.
+
+    With a ResponseCache, fresh cached pages are served without touching the network, stale
+    ones are revalidated with a conditional GET (a 304 reuses the cached body), and in offline
+    mode everything is served from the cache.
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        pool_size: int = HTTP_POOL_SIZE,
+        cache: ResponseCache | None = None,
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS if headers is None else headers)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=True,
+            # Hand the last response back instead of raising so callers see the real status
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: dict | None = None, refresh: bool = False) -> requests.Response:
+        """
+        GET `url` through the pooled session; raises requests.HTTPError on a final 4xx/5xx.
+        With `refresh`, a cached copy is revalidated even while it is fresh (offline mode still
+        serves it), for answers that must be current, like an article's latest revision.
+        """
+        if self.cache is None:
+            response = self.fetch(url, headers)
+            response.raise_for_status()
+            return response
+
+        metrics = get_metrics()
+        entry = self.cache.get(url)
+        if entry is not None and (self.cache.offline or (not refresh and self.cache.is_fresh(entry))):
+            metrics.inc("http_cache_requests_total", result="hit")
+            self.cache.touch(url)
+            return self.cache.to_response(entry)
+        if self.cache.offline:
+            metrics.inc("http_cache_requests_total", result="miss")
+            raise CacheMissError(f"{url} is not cached (offline mode)")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        response = self.fetch(url, request_headers)
+        if response.status_code == 304 and entry is not None:
+            # Unchanged upstream: reuse the cached body and restart its TTL
+            metrics.inc("http_cache_requests_total", result="revalidated")
+            self.cache.touch(url, revalidated=True)
+            return self.cache.to_response(entry)
+
+        metrics.inc("http_cache_requests_total", result="miss")
+        response.raise_for_status()
+        self.cache.store(url, response)
+        return response
+
+    def fetch(self, url: str, headers: dict | None) -> requests.Response:
+        """One network GET, recording its latency, status, size and retries in the metrics."""
+        metrics = get_metrics()
+        host = urlsplit(url).netloc
+        try:
+            with metrics.time("fetch", host=host):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            metrics.inc("http_requests_total", host=host, status=type(exc).__name__)
+            metrics.event("fetch_failed", url=url, error=repr(exc))
+            raise
+
+        metrics.inc("http_requests_total", host=host, status=response.status_code)
+        metrics.inc("http_bytes_total", len(response.content), host=host)
+        # urllib3 keeps the attempts that were retried before this final response
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            metrics.inc("http_retries_total", len(retries.history), host=host)
+        if response.status_code >= 400:
+            metrics.event("fetch_failed", url=url, status=response.status_code)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HttpClient:
+    """Return the process-wide client shared by all scrapers that were not given one."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            cache = None
+            if HTTP_CACHE_DIR is not None:
+                cache = ResponseCache(
+                    HTTP_CACHE_DIR,
+                    ttl=HTTP_CACHE_TTL,
+                    max_bytes=HTTP_CACHE_MAX_BYTES,
+                    offline=HTTP_OFFLINE,
+                )
+            _default_client = HttpClient(cache=cache)
+        return _default_client
@@ -0,0 +1,182 @@
+"""
+Lightweight run instrumentation.
+
+Counters and latency histograms are kept in a process-wide Metrics registry (see
+get_metrics()) that the fetch, parse, match and write stages report to. Progress events
+(finished chunks, failed fetches, run summaries) are appended to a JSON-lines log as they
+happen, and the registry can be written out as a Prometheus text-format snapshot.
+"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import METRICS_LATENCY_BUCKETS
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: dict | None = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics: `le` upper bounds)."""
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (inf if past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+
+class Metrics:
+    """Thread-safe registry of labelled counters and histograms."""
+
+    def __init__(self, jsonl_path: str | Path | None = None):
+        self._lock = threading.Lock()
+        self.counters: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, Histogram]] = {}
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+
+    def reset(self, jsonl_path: str | Path | None = None) -> None:
+        """Forget everything recorded so far and (re)direct events to `jsonl_path`."""
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        return self.counters.get(name, {}).get(_label_key(labels), 0)
+
+    @contextmanager
+    def time(self, stage: str, **labels):
+        """Record the duration of the block in stage_duration_seconds{stage=...}."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_duration_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+    def event(self, kind: str, **fields) -> None:
+        """Append one JSON line {"ts", "event", **fields} to the log, if there is one."""
+        if self.jsonl_path is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), "event": kind, **fields}, ensure_ascii=False)
+        with self._lock:
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def cache_hit_ratio(self) -> float | None:
+        """Share of cached-client requests answered from the cache (fresh hits and 304s)."""
+        results = self.counters.get("http_cache_requests_total", {})
+        total = sum(results.values())
+        if not total:
+            return None
+        hits = sum(count for key, count in results.items() if dict(key).get("result") != "miss")
+        return hits / total
+
+    def summary(self) -> dict:
+        """Plain dict of every series (histograms as count/sum/p50/p95), for logs and tests."""
+        with self._lock:
+            summary = {
+                "counters": {
+                    name + _format_labels(key): value
+                    for name, series in self.counters.items()
+                    for key, value in series.items()
+                },
+                "histograms": {
+                    name + _format_labels(key): {
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "p50": histogram.quantile(0.5),
+                        "p95": histogram.quantile(0.95),
+                    }
+                    for name, series in self.histograms.items()
+                    for key, histogram in series.items()
+                },
+            }
+        summary["cache_hit_ratio"] = self.cache_hit_ratio()
+        return summary
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self.counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self.counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self.histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(key, {'le': le})} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        ratio = self.cache_hit_ratio()
+        if ratio is not None:
+            lines.append("# TYPE http_cache_hit_ratio gauge")
+            lines.append(f"http_cache_hit_ratio {ratio:.4f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        # Atomic, so a node_exporter textfile collector never reads a half-written file
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide registry every instrumented stage reports to."""
+    return _metrics
@@ -0,0 +1,181 @@
+"""
+Vectorized normalization of a whole scraped frame with pandas.
+
+The per-item helpers (helper.preprocess_title / preprocess_episodes, and columnar's
+parse_year_range / parse_float / parse_int / split_people) are applied here as column-wise
+string operations, with identical results, so tens of thousands of rows are cleaned in
+milliseconds:
+
+    frame = read_csv("kdrama_list_with_wiki.csv")
+    dramas = normalize_frame(frame)     # typed columns, like columnar.to_record() per row
+    people = people_table(frame)        # one row per (drama, role, person)
+
+pandas is optional: without it only this module is unavailable.
+"""
+from pathlib import Path
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+from .columnar import PEOPLE_FIELDS, TEXT_FIELDS
+
+# Columns of normalize_frame(), in the order of columnar.SCHEMA
+NORMALIZED_COLUMNS = (
+    "title",
+    "imdb_id",
+    "start_year",
+    "end_year",
+    "num_episodes",
+    "rating_type",
+    "rating_score",
+    "cast",
+    "short_description",
+    "network_provider",
+    "screenwriter",
+    "director",
+    "plot",
+    "source",
+)
+# helper.preprocess_title keeps what follows the first ". " ("12. Heirs" -> "Heirs")
+TITLE_NUMBER_RE = r"\.\s+(.*)"
+YEAR_RE = r"\d{4}"
+# First and last YEAR_RE match of a release_year value
+YEAR_RANGE_RE = rf"({YEAR_RE})(?:.*?({YEAR_RE}))*"
+INTEGER_RE = r"[+-]?\d+"
+
+
+def available() -> bool:
+    return pd is not None
+
+
+def read_csv(path: str | Path) -> "pd.DataFrame":
+    """Load a kdrama CSV as text, exactly as csv.DictReader sees it (no type guessing, no NaN)."""
+    if pd is None:
+        raise ImportError("pandas is required for batch normalization (pip install pandas)")
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def _text(values: "pd.Series") -> "pd.Series":
+    return values.astype("string")
+
+
+def clean_titles(titles: "pd.Series") -> "pd.Series":
+    """helper.preprocess_title over a column: '12. Heirs' -> 'Heirs', other titles stripped."""
+    titles = _text(titles)
+    numbered = titles.str.extract(TITLE_NUMBER_RE, expand=False).str.strip()
+    return numbered.fillna(titles.str.strip())
+
+
+def parse_episodes(episodes: "pd.Series") -> "pd.Series":
+    """helper.preprocess_episodes over a column ('20 eps' -> 20); unparseable values become <NA>."""
+    if pd.api.types.is_numeric_dtype(episodes):
+        return episodes.astype("Int32")
+    text = _text(episodes).str.replace("eps", "", regex=False).str.strip()
+    valid = text.str.fullmatch(INTEGER_RE).fillna(False).astype(bool)
+    return pd.to_numeric(text.where(valid), errors="coerce").astype("Int32")
+
+
+def split_year_ranges(years: "pd.Series") -> "pd.DataFrame":
+    """
+    columnar.parse_year_range over a column: start_year / end_year (<NA> while still airing,
+    e.g. '2021–').
+    """
+    text = _text(years).fillna("").str.strip()
+    # The repeated group keeps its last capture: the last of re.findall(YEAR_RE, ...)
+    found = text.str.extract(YEAR_RANGE_RE)
+    start = pd.to_numeric(found[0], errors="coerce")
+    last = pd.to_numeric(found[1].fillna(found[0]), errors="coerce")
+    ongoing = found[1].isna() & text.str.endswith(("–", "-"))
+    return pd.DataFrame(
+        {"start_year": start.astype("Int16"), "end_year": last.mask(ongoing).astype("Int16")},
+        index=years.index,
+    )
+
+
+def parse_ratings(ratings: "pd.Series") -> "pd.Series":
+    """columnar.parse_float over a column ('8.1' -> 8.1, blanks -> <NA>)."""
+    if pd.api.types.is_numeric_dtype(ratings):
+        return ratings.astype("Float64")
+    return pd.to_numeric(_text(ratings).str.strip(), errors="coerce").astype("Float64")
+
+
+def explode_people(values: "pd.Series") -> "pd.Series":
+    """
+    One name per entry, indexed by the row it came from: comma-joined strings (CSV rows) are
+    split and lists (scraper output) exploded; names are stripped and blanks dropped.
+    """
+    split = values.str.split(",")
+    # Lists are not strings, so .str.split leaves them as NaN: keep the lists themselves
+    split = split.where(split.notna(), values)
+    names = _text(split.explode()).str.strip()
+    return names[names.notna() & (names != "")]
+
+
+def split_people(values: "pd.Series") -> "pd.Series":
+    """columnar.split_people over a column: a list of names per row (empty when there are none)."""
+    names = explode_people(values.reset_index(drop=True))
+    # explode() keeps each row's names together and in row order: slice them out per row
+    bounds = np.searchsorted(names.index.to_numpy(), np.arange(len(values) + 1))
+    flat = names.tolist()
+    lists = [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    return pd.Series(lists, index=values.index, dtype=object)
+
+
+def _column(frame: "pd.DataFrame", name: str) -> "pd.Series":
+    if name in frame:
+        return frame[name]
+    return pd.Series(pd.NA, index=frame.index, dtype="string")
+
+
+def normalize_frame(frame: "pd.DataFrame", raw_titles: bool = False) -> "pd.DataFrame":
+    """
+    Typed, analysis-ready NORMALIZED_COLUMNS for every row of a scraped or CSV-loaded frame,
+    matching columnar.to_record() row by row (with <NA> for None), except that raw "20 eps"
+    episode counts are parsed too. `raw_titles` runs the title cleanup, for titles that still
+    carry the list's "12. " numbering.
+    """
+    if pd is None:
+        raise ImportError("pandas is required for batch normalization (pip install pandas)")
+    frame = frame.reset_index(drop=True)
+
+    columns = {}
+    for field in TEXT_FIELDS:
+        values = _text(_column(frame, field))
+        if field == "title" and raw_titles:
+            values = clean_titles(values)
+        columns[field] = values.replace("", pd.NA)
+    years = split_year_ranges(_column(frame, "release_year"))
+    columns["start_year"] = years["start_year"]
+    columns["end_year"] = years["end_year"]
+    columns["num_episodes"] = parse_episodes(_column(frame, "num_episodes"))
+    columns["rating_score"] = parse_ratings(_column(frame, "rating_score"))
+    for field in PEOPLE_FIELDS:
+        columns[field] = split_people(_column(frame, field))
+
+    return pd.DataFrame({name: columns[name] for name in NORMALIZED_COLUMNS}, index=frame.index)
+
+
+def people_table(frame: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Long format of the people columns: one (row, role, position, name) per person credited
+    on a drama, with repeats of a name within the same drama and role dropped.
+    """
+    if pd is None:
+        raise ImportError("pandas is required for batch normalization (pip install pandas)")
+    frame = frame.reset_index(drop=True)
+
+    parts = []
+    for role in PEOPLE_FIELDS:
+        if role not in frame:
+            continue
+        names = explode_people(frame[role])
+        parts.append(pd.DataFrame({"row": names.index, "role": role, "name": names.to_numpy()}))
+    if not parts:
+        return pd.DataFrame(columns=["row", "role", "position", "name"])
+
+    table = pd.concat(parts, ignore_index=True).drop_duplicates(["row", "role", "name"])
+    table["position"] = table.groupby(["row", "role"]).cumcount()
+    return table[["row", "role", "position", "name"]].reset_index(drop=True)
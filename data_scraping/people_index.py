@@ -0,0 +1,280 @@
+"""
+In-memory index of the people credited on the dramas.
+
+Every person gets a stable integer id, in order of first appearance (or the order of a
+saved name list), under a normalized name key that folds case, accents, hyphenation,
+citation marks ("Ahn Gil-ho[1]") and common romanizations of Korean surnames ("Yi", "Rhee"
+-> "Lee"), so the spellings of one person share an id. Credits are kept as flat arrays of
+ids, drama -> people with per-drama offsets, and the person -> dramas postings are derived
+from them on first query:
+
+    index = PeopleIndex.from_csv("kdrama_list_with_wiki.csv")
+    index.most_prolific("screenwriter", limit=5)
+    index.costars("Lee Min-ho")
+"""
+import csv
+import json
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+from .columnar import PEOPLE_FIELDS, split_people
+from .scrapers.imdb_crawler import drama_key
+
+# Role of a credit, stored as one byte
+ROLE_CODES = {role: code for code, role in enumerate(PEOPLE_FIELDS)}
+# "[1]", "[a]", "[note 2]": footnote marks copied over from Wikipedia infoboxes
+CITATION_RE = re.compile(r"\[[^\]]*\]")
+NON_WORD_RE = re.compile(r"[^\w\s]+")
+# Romanizations of the same Korean surname -> the spelling used in the key
+SURNAME_VARIANTS = {
+    "yi": "lee",
+    "rhee": "lee",
+    "ri": "lee",
+    "pak": "park",
+    "bak": "park",
+    "gim": "kim",
+    "choe": "choi",
+    "jeong": "jung",
+    "chung": "jung",
+    "sin": "shin",
+    "yun": "yoon",
+    "gang": "kang",
+    "jo": "cho",
+    "lim": "im",
+    "roh": "noh",
+    "suh": "seo",
+    "an": "ahn",
+    "chang": "jang",
+    "paik": "baek",
+    "yu": "yoo",
+}
+
+
+def clean_name(name: str) -> str:
+    """Display form of a credited name: citation marks dropped, whitespace collapsed."""
+    return " ".join(CITATION_RE.sub("", name or "").split())
+
+
+def person_key(name: str) -> str:
+    """
+    Normalized key of a name: 'Lee Min-ho', 'LEE Minho' and 'Yi Min Ho' -> 'lee minho'.
+    The surname (first word, Korean order) is mapped through SURNAME_VARIANTS; the given
+    name is folded into one word, as romanizations hyphenate and space it differently.
+    """
+    name = unicodedata.normalize("NFKD", clean_name(name))
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).casefold()
+    words = NON_WORD_RE.sub(" ", name).split()
+    if not words:
+        return ""
+    surname = SURNAME_VARIANTS.get(words[0], words[0])
+    return " ".join([surname, "".join(words[1:])]) if len(words) > 1 else surname
+
+
+class PeopleIndex:
+    """
+    Interned people and array-backed drama <-> person postings.
+
+    `people` is an optional list of names in id order (e.g. a previous run's people_names()
+    or save() output); they keep their ids and new people are numbered after them.
+    """
+
+    def __init__(self, people: Iterable[str] | None = None):
+        self._ids: dict[str, int] = {}
+        self._spellings: list[Counter] = []
+        self._dramas: list[dict] = []
+        self._drama_ids: dict[tuple, int] = {}
+
+        # Credits of drama d: positions _drama_offsets[d] to _drama_offsets[d + 1]
+        self._credit_people = array("I")
+        self._credit_roles = array("B")
+        self._drama_offsets = array("I", [0])
+        # person -> credits, built from the above on first query after a change
+        self._postings: tuple[array, array, array] | None = None
+
+        # Saved names only reserve their ids: spellings are counted from the credits alone
+        for name in people or ():
+            self.intern(name, count=False)
+
+    @classmethod
+    def from_dramas(cls, dramas: Iterable[dict], people: Iterable[str] | None = None) -> "PeopleIndex":
+        index = cls(people)
+        for drama in dramas:
+            index.add_drama(drama)
+        return index
+
+    @classmethod
+    def from_csv(cls, path: str | Path, people: Iterable[str] | None = None) -> "PeopleIndex":
+        """Index a kdrama CSV (comma-joined cast, screenwriter and director columns)."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dramas(csv.DictReader(f), people)
+
+    # Building
+
+    def intern(self, name: str, count: bool = True) -> int | None:
+        """
+        Id of `name` (assigning the next one to a new person); None for a blank name.
+        `count` adds one to the spelling's tally, which name() picks the display name from.
+        """
+        key = person_key(name)
+        if not key:
+            return None
+        person_id = self._ids.get(key)
+        if person_id is None:
+            person_id = self._ids[key] = len(self._spellings)
+            self._spellings.append(Counter())
+        spellings = self._spellings[person_id]
+        if count:
+            spellings[clean_name(name)] += 1
+        else:
+            spellings.setdefault(clean_name(name), 0)
+        return person_id
+
+    def add_drama(self, drama: dict) -> int:
+        """Index the people of a drama dict (scraper output or CSV row); returns its drama id."""
+        key = drama_key(drama)
+        if key in self._drama_ids:
+            return self._drama_ids[key]
+
+        drama_id = len(self._dramas)
+        self._drama_ids[key] = drama_id
+        self._dramas.append(
+            {
+                "title": drama.get("title") or "",
+                "release_year": drama.get("release_year") or "",
+                "imdb_id": drama.get("imdb_id"),
+            }
+        )
+        for role, code in ROLE_CODES.items():
+            seen = set()
+            for name in split_people(drama.get(role)):
+                person_id = self.intern(name)
+                # The same person listed twice for one role counts once
+                if person_id is None or person_id in seen:
+                    continue
+                seen.add(person_id)
+                self._credit_people.append(person_id)
+                self._credit_roles.append(code)
+        self._drama_offsets.append(len(self._credit_people))
+        self._postings = None
+        return drama_id
+
+    def _person_postings(self) -> tuple[array, array, array]:
+        """(offsets, drama ids, role codes) of every person's credits, in drama order."""
+        if self._postings is None:
+            counts = array("I", [0]) * (len(self._spellings) + 1)
+            for person_id in self._credit_people:
+                counts[person_id + 1] += 1
+            for i in range(1, len(counts)):
+                counts[i] += counts[i - 1]
+            offsets = array("I", counts)
+
+            dramas = array("I", [0]) * len(self._credit_people)
+            roles = array("B", [0]) * len(self._credit_people)
+            fill = array("I", offsets)
+            for drama_id in range(len(self._dramas)):
+                for credit in range(self._drama_offsets[drama_id], self._drama_offsets[drama_id + 1]):
+                    person_id = self._credit_people[credit]
+                    dramas[fill[person_id]] = drama_id
+                    roles[fill[person_id]] = self._credit_roles[credit]
+                    fill[person_id] += 1
+            self._postings = (offsets, dramas, roles)
+        return self._postings
+
+    # Lookups
+
+    def __len__(self) -> int:
+        return len(self._spellings)
+
+    @property
+    def drama_count(self) -> int:
+        return len(self._dramas)
+
+    def person_id(self, name: str) -> int | None:
+        return self._ids.get(person_key(name))
+
+    def _resolve(self, person: str | int) -> int | None:
+        return person if isinstance(person, int) else self.person_id(person)
+
+    def name(self, person_id: int) -> str:
+        """The most credited spelling of a person (the first seen on a tie, e.g. a saved name)."""
+        return self._spellings[person_id].most_common(1)[0][0]
+
+    def spellings(self, person_id: int) -> list[str]:
+        return list(self._spellings[person_id])
+
+    def people_names(self) -> list[str]:
+        """Display names in id order; pass them back as `people` to keep the same ids."""
+        return [self.name(person_id) for person_id in range(len(self))]
+
+    def drama(self, drama_id: int) -> dict:
+        """{title, release_year, imdb_id} of an indexed drama."""
+        return dict(self._dramas[drama_id])
+
+    def people_of(self, drama_id: int, role: str | None = None) -> list[int]:
+        """Person ids credited on a drama (optionally only as `role`), in credit order."""
+        start, end = self._drama_offsets[drama_id], self._drama_offsets[drama_id + 1]
+        if role is None:
+            return list(dict.fromkeys(self._credit_people[start:end]))
+        code = ROLE_CODES[role]
+        return [
+            self._credit_people[credit] for credit in range(start, end) if self._credit_roles[credit] == code
+        ]
+
+    def dramas_of(self, person: str | int, role: str | None = None) -> list[int]:
+        """Drama ids crediting a person (by name or id, optionally only as `role`)."""
+        person_id = self._resolve(person)
+        if person_id is None:
+            return []
+        offsets, dramas, roles = self._person_postings()
+        start, end = offsets[person_id], offsets[person_id + 1]
+        if role is None:
+            return list(dict.fromkeys(dramas[start:end]))
+        code = ROLE_CODES[role]
+        return [dramas[credit] for credit in range(start, end) if roles[credit] == code]
+
+    # Queries
+
+    def most_prolific(self, role: str | None = None, limit: int | None = 10) -> list[tuple[str, int]]:
+        """(name, number of dramas) of the most credited people, optionally in one role."""
+        counts = Counter({person_id: len(self.dramas_of(person_id, role)) for person_id in range(len(self))})
+        return [(self.name(person_id), count) for person_id, count in counts.most_common(limit) if count]
+
+    def costars(self, person: str | int, role: str = "cast", limit: int | None = None) -> list[tuple[str, int]]:
+        """People credited in `role` on the same dramas as a person, with how many they share."""
+        person_id = self._resolve(person)
+        if person_id is None:
+            return []
+        counts = Counter()
+        for drama_id in self.dramas_of(person_id):
+            counts.update(other for other in self.people_of(drama_id, role) if other != person_id)
+        return [(self.name(other), count) for other, count in counts.most_common(limit)]
+
+    def co_occurrences(self, role: str = "cast", min_count: int = 2) -> list[tuple[str, str, int]]:
+        """Pairs of people credited together in `role` on at least `min_count` dramas."""
+        pairs = Counter()
+        for drama_id in range(len(self._dramas)):
+            people = sorted(self.people_of(drama_id, role))
+            pairs.update(
+                (people[i], people[j]) for i in range(len(people)) for j in range(i + 1, len(people))
+            )
+        return [
+            (self.name(first), self.name(second), count)
+            for (first, second), count in pairs.most_common()
+            if count >= min_count
+        ]
+
+    # Persistence
+
+    def save(self, path: str | Path) -> None:
+        """Write the display names in id order, so a later index can keep the same ids."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.people_names(), f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def load_people(path: str | Path) -> list[str]:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,72 @@
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from .concurrency import RateLimiter
+from .config import PIPELINE_BUFFER_SIZE
+from .helper import apply_wikipedia_info
+from .http_client import HttpClient
+from .scrapers.wikipedia_scraper import WikipediaScraper
+from .title_matcher import TitleMatcher
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to `size` consecutive items, reading `items` lazily."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def bounded_map(func, items: Iterable, max_workers: int = 1, buffer_size: int = PIPELINE_BUFFER_SIZE):
+    """
+    Lazy, ordered map over a thread pool.
+
+    Items are pulled from `items` only as results are consumed, with at most `buffer_size`
+    of them in flight, so an unbounded input never piles up in memory.
+    """
+    if max_workers <= 1:
+        yield from map(func, items)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max(buffer_size, max_workers):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def enrich_stream(
+    dramas: Iterable[dict],
+    matcher: TitleMatcher,
+    headers: dict,
+    max_workers: int = 1,
+    requests_per_second: float | None = None,
+    client: HttpClient | None = None,
+    buffer_size: int = PIPELINE_BUFFER_SIZE,
+    parse_executor: Executor | None = None,
+) -> Iterator[dict]:
+    """
+    Yield each drama (in input order) with its Wikipedia fields filled in when `matcher` finds
+    an article for its title. Dramas without a confident match, or whose page could not be
+    parsed, pass through. Pages are fetched by `max_workers` threads and parsed in `parse_executor`, when
+    given, so parsing is not bound by the GIL of the fetching process.
+    """
+    rate_limiter = RateLimiter(requests_per_second)
+
+    def enrich_one(drama: dict) -> dict:
+        match = matcher.match(drama.get("title", ""), drama.get("release_year"))
+        # Low-confidence matches are left out, as in enrich_kdrama_list
+        if match is None or match["needs_review"]:
+            return drama
+        wiki_url = match["url"]
+        rate_limiter.wait(wiki_url)
+        info_list = WikipediaScraper(wiki_url, headers, client=client).get_info_list(parse_executor)
+        if info_list:
+            apply_wikipedia_info(drama, info_list[0], wiki_url)
+        return drama
+
+    return bounded_map(enrich_one, dramas, max_workers=max_workers, buffer_size=buffer_size)
@@ -1,84 +1,51 @@
-import csv
 import json
+import time
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from pathlib import Path
 
-from .config import URLs, HEADERS
-from .scrapers.imdb_scraper import IMDBScraper
-from .scrapers.wikipedia_scraper import WikipediaScraper
-from . import helper
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-
-def scrape_2010s_with_selenium(url: str):
-    """Return a list of drama dicts for the 2010s list using Selenium."""
-    options = Options()
-    # Uncomment to run headless once everything is stable:
-    # options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-
-    service = Service("/opt/homebrew/bin/chromedriver")
-    driver = webdriver.Chrome(service=service, options=options)
-
-    try:
-        driver.get(url)
-        print("2010s current URL:", driver.current_url)
-
-        # Wait until the list container is present (same as in test.py)
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div[data-testid='list-page-mc-list-content'] ul.ipc-metadata-list")
-            )
-        )
-
-        # Optional: scroll to bottom in case of lazy-load
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-        html = driver.page_source
-    finally:
-        driver.quit()
-
-    soup = BeautifulSoup(html, "html.parser")
-    container = soup.select_one("div[data-testid='list-page-mc-list-content'] ul.ipc-metadata-list")
-    if container is None:
-        raise RuntimeError("Could not find list container for 2010s page")
-
-    dramas = []
-    for item in container.select("li.ipc-metadata-list-summary-item"):
-        drama_object = {}
-
-        # Title
-        raw_title = item.find("h3", class_="ipc-title__text").get_text(strip=True)
-        drama_object["title"] = helper.preprocess_title(raw_title)
-
-        # Year + episodes
-        spans = item.find_all("span", class_="sc-b4f120f6-7 hoOxkw dli-title-metadata-item")
-        release_year = spans[0].get_text(strip=True)
-        num_episodes = spans[1].get_text(strip=True)
-        drama_object["release_year"] = release_year
-        drama_object["num_episodes"] = helper.preprocess_episodes(num_episodes)
-
-        # Rating
-        rating = item.find("span", class_="ipc-rating-star--rating")
-        drama_object["rating_type"] = "imdb"
-        drama_object["rating_score"] = rating.get_text(strip=True) if rating else ""
-
-        # Cast
-        cast = item.find_all("span", class_="sc-9d52d06f-2 cWCmUf title-description-credit")
-        drama_object["cast"] = [actor.get_text(strip=True) for actor in cast]
-
-        # Short description
-        description = item.find("div", class_="ipc-html-content-inner-div")
-        drama_object["short_description"] = description.get_text(strip=True) if description else ""
-
-        dramas.append(drama_object)
-
+from .browser_pool import BrowserPool
+from .catalog import Catalog
+from .concurrency import make_parse_executor
+from .metrics import get_metrics
+from .config import (
+    URLs,
+    HEADERS,
+    IMDB_EXTRA_LIST_IDS,
+    PARSE_WORKERS,
+    PIPELINE_BUFFER_SIZE,
+    SELENIUM_PERIODS,
+    WIKIPEDIA_MAX_WORKERS,
+    WIKIPEDIA_REQUESTS_PER_SECOND,
+    WIKIPEDIA_TITLE_LIST_PATH,
+)
+from .pipeline import enrich_stream
+from .scrapers.imdb_crawler import crawl_lists, drama_key, imdb_list_url
+from .scrapers.imdb_extractor import extract_list_page, page_count, rendered_item_count
+from .scrapers.imdb_scraper import page_url
+from .title_matcher import TitleMatcher
+from . import changes, columnar
+
+
+def scrape_selenium_page(url: str, pool: BrowserPool) -> tuple[list[dict], int | None]:
+    """(dramas, total titles in the list) of one JS-rendered IMDb list page."""
+    # Waits for the list container, then scrolls until lazy-loaded items stop appearing
+    html = pool.get_page_source(url)
+
+    # The rendered item count keeps a stale __NEXT_DATA__ from hiding scrolled-in items
+    return extract_list_page(html, min_items=rendered_item_count(html))
+
+
+def scrape_with_selenium(url: str, pool: BrowserPool | None = None):
+    """Return a list of drama dicts from every page of a JS-rendered IMDb list using a (pooled) browser."""
+    if pool is None:
+        with BrowserPool(size=1) as own_pool:
+            return scrape_with_selenium(url, own_pool)
+
+    # As in crawl_lists(), the first page tells how many pages the list has
+    dramas, total = scrape_selenium_page(url, pool)
+    for page in range(2, page_count(total, len(dramas)) + 1):
+        dramas += scrape_selenium_page(page_url(url, page), pool)[0]
     return dramas
 
 
@@ -94,84 +61,108 @@ def build_wikipedia_map(wikipedia_list_path: Path) -> dict[str, str]:
     return title_to_url
 
 
-def main():
-    # 1) Collect all dramas from IMDb (2000s + 2020s via requests, 2010s via Selenium)
-    all_dramas: list[dict] = []
+def iter_imdb_dramas(pool: BrowserPool, seen: set | None = None, parse_executor: Executor | None = None):
+    """
+    Yield every drama from IMDb as soon as its page is scraped: JS-rendered periods in
+    SELENIUM_PERIODS via the browser pool, every page of the other lists (plus
+    IMDB_EXTRA_LIST_IDS) via parallel requests, parsed in `parse_executor` when given.
+    Titles appearing in several lists are kept once.
+    """
+    if seen is None:
+        seen = set()
 
     for period, URL in URLs.items():
-        if period == "2010s":
-            dramas = scrape_2010s_with_selenium(URL)
-        else:
-            scraper_obj = IMDBScraper(URL, HEADERS)
-            dramas = scraper_obj.get_drama_list()
+        if period not in SELENIUM_PERIODS:
+            continue
+        for drama in scrape_with_selenium(URL, pool):
+            if drama_key(drama) not in seen:
+                seen.add(drama_key(drama))
+                yield drama
 
-        all_dramas.extend(dramas)
+    list_urls = [URL for period, URL in URLs.items() if period not in SELENIUM_PERIODS]
+    list_urls += [imdb_list_url(list_id) for list_id in IMDB_EXTRA_LIST_IDS]
+    yield from crawl_lists(list_urls, HEADERS, seen=seen, parse_executor=parse_executor)
 
-    # 2) Enrich with Wikipedia info where available
-    wikipedia_list_path = Path(__file__).parent / "data" / "wikipedia_list.json"
-    title_to_url = build_wikipedia_map(wikipedia_list_path)
 
-    for drama in all_dramas:
-        title = drama["title"]
-        wiki_url = title_to_url.get(title)
-        if not wiki_url:
-            continue
+def main():
+    # Dramas stream from IMDb through the Wikipedia enrichment into the CSV, with at most
+    # PIPELINE_BUFFER_SIZE of them in flight, so nothing is held for the whole catalog
+
+    # Stage timings, traffic and extraction results go to kdrama_list.metrics.{jsonl,prom}
+    metrics = get_metrics()
+    metrics.reset("kdrama_list.metrics.jsonl")
+    metrics.event("run_start")
+
+    # Pages are fetched by threads and parsed by PARSE_WORKERS processes (the Selenium
+    # fallback still parses in this process). Every resource is entered as soon as it is
+    # created, so a failure while setting up the rest still shuts down the worker processes
+    with (
+        make_parse_executor(PARSE_WORKERS) or nullcontext() as parse_executor,
+        BrowserPool() as pool,
+        Catalog() as catalog,
+    ):
+        # 1) Collect dramas from IMDb
+        dramas = iter_imdb_dramas(pool, parse_executor=parse_executor)
+
+        # 2) Enrich with Wikipedia info where available; titles are matched fuzzily to the
+        #    articles of wikipedia_list.json (plus the cached Wikipedia title list, when there
+        #    is one). The JSON stays the source of truth, so titles removed or corrected there
+        #    are not matched to old URLs still recorded in the catalog
+        wikipedia_list_path = Path(__file__).parent / "data" / "wikipedia_list.json"
+        catalog.import_wikipedia_list(wikipedia_list_path)
+        title_list_path = WIKIPEDIA_TITLE_LIST_PATH if WIKIPEDIA_TITLE_LIST_PATH.exists() else None
+        matcher = TitleMatcher.from_wikipedia_list(wikipedia_list_path, title_list_path)
+        dramas = enrich_stream(
+            dramas,
+            matcher,
+            HEADERS,
+            max_workers=WIKIPEDIA_MAX_WORKERS,
+            requests_per_second=WIKIPEDIA_REQUESTS_PER_SECOND,
+            parse_executor=parse_executor,
+        )
 
-        wscraper = WikipediaScraper(wiki_url, HEADERS)
-        info_list = wscraper.get_info_list()
-        if not info_list:
-            continue
+        # 3) Write final CSV with IMDb + Wikipedia fields, compared with the previous run's: the
+        #    file is only replaced when a row was added, removed or modified, and the changeset
+        #    goes to kdrama_list.changes.json
+        csv_output = "kdrama_list.csv"
 
-        info = info_list[0]
-        # Map Wikipedia fields into our schema
-        drama["network_provider"] = info.get("network", "")
-        drama["screenwriter"] = ", ".join(info.get("screenwriter", []))
-        drama["director"] = ", ".join(info.get("director", []))
-        drama["plot"] = info.get("plot", "")
-        drama["source"] = wiki_url
-
-    # 3) Write final CSV with IMDb + Wikipedia fields
-    csv_output = "kdrama_list.csv"
-    fieldnames = [
-        "title",
-        "release_year",
-        "num_episodes",
-        "rating_type",
-        "rating_score",
-        "cast",
-        "short_description",
-        "network_provider",
-        "screenwriter",
-        "director",
-        "plot",
-        "source",
-    ]
-
-    with open(csv_output, "w", newline="", encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(fieldnames)
-
-        for drama in all_dramas:
-            print(
-                f"{drama['title']} {drama['release_year']} {drama['num_episodes']} "
-                f"{drama['rating_type']} {drama['rating_score']} {drama['cast']} {drama['short_description']}"
-            )
-            writer.writerow(
-                [
-                    drama.get("title", ""),
-                    drama.get("release_year", ""),
-                    drama.get("num_episodes", ""),
-                    drama.get("rating_type", ""),
-                    drama.get("rating_score", ""),
-                    ", ".join(drama.get("cast", [])),
-                    drama.get("short_description", ""),
-                    drama.get("network_provider", ""),
-                    drama.get("screenwriter", ""),
-                    drama.get("director", ""),
-                    drama.get("plot", ""),
-                    drama.get("source", ""),
-                ]
-            )
+        # ...and the same rows, typed, as Parquet when pyarrow is installed
+        parquet_output = "kdrama_list.parquet"
+        if columnar.available():
+            parquet = columnar.ParquetBatchWriter(parquet_output)
+        else:
+            print("pyarrow is not installed; skipping the Parquet export")
+            parquet = None
+
+        # ...and upsert every drama into the catalog, one transaction per batch (unchanged rows
+        # too, so a new or emptied catalog is filled in)
+        with parquet or nullcontext(), changes.ChangeDetectingCSVWriter(csv_output) as output:
+            batch = []
+            for count, drama in enumerate(dramas, 1):
+                print(
+                    f"{drama['title']} {drama['release_year']} {drama['num_episodes']} "
+                    f"{drama['rating_type']} {drama['rating_score']} {drama['cast']} {drama['short_description']}"
+                )
+                write_started = time.perf_counter()
+                output.write(drama)
+                batch.append(drama)
+                if parquet:
+                    parquet.write(drama)
+                if count % PIPELINE_BUFFER_SIZE == 0:
+                    output.flush()
+                    catalog.upsert_dramas(batch)
+                    batch = []
+                    metrics.event("progress", rows=count)
+                metrics.observe("stage_duration_seconds", time.perf_counter() - write_started, stage="write")
+
+            catalog.upsert_dramas(batch)
+            # Nothing changed: keep the previous Parquet file as well
+            if parquet and not output.changed and Path(parquet_output).exists():
+                parquet.abort()
+
+    print(f"{csv_output}: {changes.summary(output.tracker.changeset())}")
+    metrics.event("run_summary", **metrics.summary())
+    metrics.write_prometheus("kdrama_list.metrics.prom")
 
 
 if __name__ == "__main__":
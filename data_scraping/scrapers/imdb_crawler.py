@@ -0,0 +1,85 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Iterator
+
+from ..config import HEADERS, IMDB_MAX_WORKERS
+from ..http_client import HttpClient
+from .imdb_extractor import page_count, record_list_page, timed_parse_list_page
+from .imdb_scraper import IMDBScraper, page_url
+
+
+def imdb_list_url(list_id: str) -> str:
+    return f"https://www.imdb.com/list/{list_id}/"
+
+
+def drama_key(drama: dict) -> tuple:
+    """Identity of a title across lists: its IMDb id, or title + year when the id is missing."""
+    if drama.get("imdb_id"):
+        return ("imdb", drama["imdb_id"])
+    return ("title", (drama.get("title") or "").strip(), (drama.get("release_year") or "").strip())
+
+
+def fetch_list_page(
+    url: str,
+    headers: dict,
+    client: HttpClient | None,
+    rating_type: str,
+    parse_executor: Executor | None = None,
+):
+    """
+    Fetch one list page and parse it (in `parse_executor` if given, waiting for the result);
+    returns (page count of the list, dramas on the page).
+    """
+    content = IMDBScraper(url, headers, client=client).fetch_content()
+    if parse_executor is None:
+        dramas, total, source, seconds = timed_parse_list_page(content, rating_type)
+    else:
+        future = parse_executor.submit(timed_parse_list_page, content, rating_type)
+        dramas, total, source, seconds = future.result()
+    record_list_page(dramas, source, seconds)
+    return page_count(total, len(dramas)), dramas
+
+
+def crawl_lists(
+    list_urls,
+    headers: dict = HEADERS,
+    client: HttpClient | None = None,
+    max_workers: int = IMDB_MAX_WORKERS,
+    rating_type: str = "imdb",
+    seen: set | None = None,
+    parse_executor: Executor | None = None,
+) -> Iterator[dict]:
+    """
+    Crawl every page of every IMDb list concurrently, yielding dramas as each page completes.
+
+    The first page of each list tells how many pages it has; the remaining pages are queued
+    as soon as it arrives. Pages are parsed in `parse_executor` when given. Titles already
+    in `seen` (shared across calls to deduplicate between lists and periods) are skipped.
+    """
+    if seen is None:
+        seen = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(fetch_list_page, url, headers, client, rating_type, parse_executor): (url, 1)
+            for url in dict.fromkeys(list_urls)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                list_url, page = pending.pop(future)
+                page_count, dramas = future.result()
+
+                if page == 1:
+                    for next_page in range(2, page_count + 1):
+                        next_url = page_url(list_url, next_page)
+                        future = executor.submit(
+                            fetch_list_page, next_url, headers, client, rating_type, parse_executor
+                        )
+                        pending[future] = (list_url, next_page)
+
+                for drama in dramas:
+                    key = drama_key(drama)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield drama
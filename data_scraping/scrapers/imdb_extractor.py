@@ -0,0 +1,346 @@
+"""
+One extractor for IMDb list pages, shared by the requests and Selenium fetch paths.
+
+A page is read, in order of preference, from:
+
+1. the `__NEXT_DATA__` JSON that IMDb embeds for hydration: found with a regex on the raw
+   HTML and mapped straight to drama dicts, without building a DOM at all;
+2. the DOM, following ITEM_SPEC: for every field, selectors tried in order, stable
+   `data-testid` / `ipc-*` / `dli-*` hooks first and the hashed styled-component classes
+   (`sc-b4f120f6-7 hoOxkw`, ...) only as a last resort. The selectors are compiled once and
+   every item is filled in during a single walk over the list container;
+3. the JSON-LD ItemList (title, id, rating and description only).
+"""
+import html as html_lib
+import json
+import math
+import re
+import time
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+from .. import helper
+from ..metrics import get_metrics
+
+TITLE_ID_RE = re.compile(r"tt\d+")
+NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+JSON_LD_RE = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+# List items as serialized by both the server and a browser's page_source
+DOM_ITEM_RE = re.compile(r'class="ipc-metadata-list-summary-item"')
+TOTAL_ITEMS_RE = re.compile(r"([\d,]+)\s+titles?")
+YEAR_RANGE_RE = re.compile(r"^\d{4}(?:–(?:\d{4})?)?$")
+# "16 eps", or "1 ep" for a single episode
+EPISODES_RE = re.compile(r"^(\d+)\s*eps?$")
+
+CONTAINER_SELECTORS = (
+    "div[data-testid='list-page-mc-list-content'] ul.ipc-metadata-list",
+    "ul.ipc-metadata-list.detailed-list-view",
+)
+ITEM_SELECTOR = "li.ipc-metadata-list-summary-item"
+TOTAL_ITEMS_SELECTOR = "[data-testid='list-page-mc-total-items']"
+
+# field -> (what to read from the matches, selectors in order of preference). "text" and
+# "href" read the first match of the best selector that matched, "texts" every match of it.
+ITEM_SPEC = {
+    "title": ("text", ("h3.ipc-title__text", "a.ipc-title-link-wrapper")),
+    "imdb_id": ("href", ("a.ipc-title-link-wrapper", "a.ipc-lockup-overlay")),
+    "metadata": (
+        "texts",
+        ("span.dli-title-metadata-item", "div.dli-title-metadata > span", "span.sc-b4f120f6-7.hoOxkw"),
+    ),
+    "rating_score": (
+        "text",
+        (
+            "[data-testid='ratingGroup--imdb-rating'] span.ipc-rating-star--rating",
+            "span.ipc-rating-star--rating",
+        ),
+    ),
+    "cast": ("texts", ("span.title-description-credit", "span.sc-9d52d06f-2.cWCmUf")),
+    "short_description": (
+        "text",
+        (
+            "div.title-description-plot-container div.ipc-html-content-inner-div",
+            "div.ipc-html-content-inner-div",
+        ),
+    ),
+}
+
+
+def _compile(selector: str) -> tuple:
+    """
+    (tag name or None, classes, matcher) for a selector. The tag name and classes of its last
+    compound are checked first, so soupsieve only runs on tags that can possibly match.
+    """
+    last = selector.split()[-1]
+    name = re.match(r"[a-z][a-z0-9]*", last)
+    classes = frozenset(re.findall(r"\.([\w-]+)", re.sub(r"\[[^\]]*\]", "", last)))
+    return (name.group(0) if name else None, classes, soupsieve.compile(selector))
+
+
+# [(field, read, priority, (tag name, classes, matcher))], grouped by tag name below
+_RULES = [
+    (field, read, priority, _compile(selector))
+    for field, (read, selectors) in ITEM_SPEC.items()
+    for priority, selector in enumerate(selectors)
+]
+_RULES_BY_NAME: dict[str | None, list] = {}
+for _rule in _RULES:
+    _RULES_BY_NAME.setdefault(_rule[3][0], []).append(_rule)
+_CONTAINERS = [soupsieve.compile(selector) for selector in CONTAINER_SELECTORS]
+_ITEM = soupsieve.compile(ITEM_SELECTOR)
+
+
+def page_count(total: int | None, per_page: int) -> int:
+    """Pages of a list of `total` titles shown `per_page` at a time (1 when unknown)."""
+    if not total or per_page == 0:
+        return 1
+    return max(1, math.ceil(total / per_page))
+
+
+def format_year_range(year: int | None, end_year: int | None, ongoing: bool = False) -> str:
+    """The list page's year label: 2013, 2010–2011, or 2021– for a series still airing."""
+    if year is None:
+        return ""
+    if end_year is not None and end_year != year:
+        return f"{year}–{end_year}"
+    if end_year is None and ongoing:
+        return f"{year}–"
+    return str(year)
+
+
+def _html_text(page) -> str:
+    if isinstance(page, bytes):
+        return page.decode("utf-8", errors="replace")
+    return page
+
+
+# __NEXT_DATA__
+
+
+def _dig(data, *keys):
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _next_data_drama(item: dict, rating_type: str) -> dict:
+    release = item.get("releaseYear") or {}
+    series = _dig(item, "titleType", "id") == "tvSeries"
+    rating = _dig(item, "ratingsSummary", "aggregateRating")
+    episodes = _dig(item, "episodes", "episodes", "total")
+
+    # The "Stars" credit group (the only one list pages carry for series)
+    groups = item.get("principalCreditsV2") or []
+    stars = [g for g in groups if _dig(g, "grouping", "text") == "Stars"] or groups[:1]
+    cast = [
+        _dig(credit, "name", "nameText", "text")
+        for group in stars
+        for credit in group.get("credits") or []
+    ]
+
+    return {
+        "title": (_dig(item, "titleText", "text") or "").strip(),
+        "imdb_id": item.get("id") or "",
+        "release_year": format_year_range(release.get("year"), release.get("endYear"), series),
+        "num_episodes": episodes if episodes is not None else "",
+        "rating_type": rating_type,
+        "rating_score": f"{rating:.1f}" if rating is not None else "",
+        "cast": [name for name in cast if name],
+        "short_description": _dig(item, "plot", "plotText", "plainText") or "",
+    }
+
+
+def extract_next_data(page, rating_type: str = "imdb") -> tuple[list[dict], int | None] | None:
+    """(dramas, total titles in the list) from the embedded __NEXT_DATA__, or None without it."""
+    if isinstance(page, BeautifulSoup):
+        script = page.find("script", id="__NEXT_DATA__")
+        raw = script.string if script else None
+    else:
+        match = NEXT_DATA_RE.search(_html_text(page))
+        raw = match.group(1) if match else None
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+
+    search = _dig(data, "props", "pageProps", "mainColumnData", "list", "titleListItemSearch")
+    if not isinstance(search, dict) or not isinstance(search.get("edges"), list):
+        return None
+    dramas = [
+        _next_data_drama(edge["listItem"], rating_type)
+        for edge in search["edges"]
+        if isinstance(edge, dict) and isinstance(edge.get("listItem"), dict)
+    ]
+    total = search.get("total")
+    return dramas, total if isinstance(total, int) else None
+
+
+# DOM
+
+
+def _fill(found: dict, tag: Tag) -> None:
+    """Record `tag` against every rule it matches, keeping the best-priority selector per field."""
+    classes = tag.get("class") or ()
+    for rules in (_RULES_BY_NAME.get(tag.name, ()), _RULES_BY_NAME.get(None, ())):
+        for field, read, priority, (_, required, matcher) in rules:
+            best = found.get(field)
+            if best is not None and (best[0] < priority or (best[0] == priority and read != "texts")):
+                continue
+            if not required.issubset(classes) or not matcher.match(tag):
+                continue
+            if best is None or best[0] > priority:
+                found[field] = best = (priority, [])
+            best[1].append(tag)
+
+
+def _dom_drama(found: dict, rating_type: str) -> dict:
+    def first(field: str) -> Tag | None:
+        return found[field][1][0] if field in found else None
+
+    def text(tag: Tag | None) -> str:
+        return tag.get_text(strip=True) if tag is not None else ""
+
+    link = first("imdb_id")
+    match = TITLE_ID_RE.search(link.get("href", "")) if link is not None else None
+    metadata = [text(tag) for tag in found.get("metadata", (0, []))[1]]
+    release_year = next((value for value in metadata if YEAR_RANGE_RE.match(value)), "")
+    episodes = next(filter(None, map(EPISODES_RE.match, metadata)), None)
+
+    return {
+        "title": helper.preprocess_title(text(first("title"))),
+        "imdb_id": match.group(0) if match else "",
+        "release_year": release_year,
+        "num_episodes": int(episodes.group(1)) if episodes else "",
+        "rating_type": rating_type,
+        "rating_score": text(first("rating_score")),
+        "cast": [text(tag) for tag in found.get("cast", (0, []))[1]],
+        "short_description": text(first("short_description")),
+    }
+
+
+def extract_dom(soup: BeautifulSoup, rating_type: str = "imdb") -> list[dict] | None:
+    """Dramas from the rendered list, in one pass over its container; None without a container."""
+    container = None
+    for selector in _CONTAINERS:
+        container = selector.select_one(soup)
+        if container is not None:
+            break
+    if container is None:
+        return None
+
+    items = []
+    found = None
+    for tag in container.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        # Items are siblings, so everything up to the next item belongs to the current one
+        if tag.name == "li" and _ITEM.match(tag):
+            found = {}
+            items.append(found)
+        elif found is not None:
+            _fill(found, tag)
+    return [_dom_drama(found, rating_type) for found in items]
+
+
+def dom_total(soup: BeautifulSoup) -> int | None:
+    """The list's "N titles" total."""
+    total_items = soup.select_one(TOTAL_ITEMS_SELECTOR)
+    match = TOTAL_ITEMS_RE.search(total_items.get_text(" ", strip=True)) if total_items else None
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+# JSON-LD
+
+
+def extract_json_ld(page, rating_type: str = "imdb") -> list[dict] | None:
+    """Dramas from the JSON-LD ItemList (no year, episodes or cast), or None without one."""
+    if isinstance(page, BeautifulSoup):
+        scripts = [script.string or "" for script in page.find_all("script", type="application/ld+json")]
+    else:
+        scripts = JSON_LD_RE.findall(_html_text(page))
+    for raw in scripts:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(data, dict) or data.get("@type") != "ItemList":
+            continue
+        dramas = []
+        for element in data.get("itemListElement") or []:
+            item = element.get("item") or {}
+            match = TITLE_ID_RE.search(item.get("url", ""))
+            rating = _dig(item, "aggregateRating", "ratingValue")
+            dramas.append(
+                {
+                    "title": html_lib.unescape(item.get("alternateName") or item.get("name") or ""),
+                    "imdb_id": match.group(0) if match else "",
+                    "release_year": "",
+                    "num_episodes": "",
+                    "rating_type": rating_type,
+                    "rating_score": f"{rating:.1f}" if isinstance(rating, (int, float)) else "",
+                    "cast": [],
+                    "short_description": html_lib.unescape(item.get("description") or ""),
+                }
+            )
+        return dramas
+    return None
+
+
+def rendered_item_count(page) -> int:
+    """Number of list items in the page's markup, without parsing it."""
+    return len(DOM_ITEM_RE.findall(_html_text(page)))
+
+
+def parse_list_page(page, rating_type: str = "imdb", min_items: int = 0) -> tuple[list[dict], int | None, str]:
+    """
+    (dramas, total titles in the list, where they came from) for a list page given as HTML
+    (str or bytes) or an already parsed BeautifulSoup. __NEXT_DATA__ is only used when it has
+    at least `min_items` dramas: a browser that scrolled in more items than the server
+    rendered passes the rendered count, so the DOM wins then.
+
+    Pure and picklable, so it can run in a parse worker process; see extract_list_page() for
+    the instrumented version.
+    """
+    next_data = extract_next_data(page, rating_type)
+    if next_data is not None and next_data[0] and len(next_data[0]) >= min_items:
+        return next_data[0], next_data[1], "next_data"
+
+    soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, "html.parser")
+    dramas = extract_dom(soup, rating_type)
+    if dramas is not None:
+        return dramas, dom_total(soup), "dom"
+
+    dramas = extract_json_ld(soup, rating_type)
+    if dramas is not None:
+        return dramas, dom_total(soup), "json_ld"
+    raise RuntimeError("Could not find drama list container in HTML response")
+
+
+def timed_parse_list_page(page, rating_type: str = "imdb", min_items: int = 0) -> tuple:
+    """parse_list_page() and the seconds it took, for parse worker processes."""
+    start = time.perf_counter()
+    return *parse_list_page(page, rating_type, min_items), time.perf_counter() - start
+
+
+def record_list_page(dramas: list[dict], source: str, seconds: float) -> None:
+    metrics = get_metrics()
+    metrics.observe("stage_duration_seconds", seconds, stage="extract", source="imdb")
+    metrics.inc("imdb_pages_total", source=source)
+    metrics.inc("imdb_dramas_total", len(dramas))
+
+
+def extract_list_page(page, rating_type: str = "imdb", min_items: int = 0) -> tuple[list[dict], int | None]:
+    """(dramas, total titles in the list) for a list page (see parse_list_page), with metrics."""
+    dramas, total, source, seconds = timed_parse_list_page(page, rating_type, min_items)
+    record_list_page(dramas, source, seconds)
+    return dramas, total
+
+
+def extract_dramas(page, rating_type: str = "imdb", min_items: int = 0) -> list[dict]:
+    """The dramas of a list page (see extract_list_page)."""
+    return extract_list_page(page, rating_type, min_items)[0]
@@ -0,0 +1,283 @@
+import re
+from urllib.parse import unquote, urlencode, urlsplit
+
+import requests
+
+from ..config import WIKIPEDIA_API_BATCH_SIZE, WIKIPEDIA_API_URL
+from ..http_client import HttpClient, get_default_client
+from ..metrics import get_metrics
+from .wikipedia_scraper import record_extraction
+
+# Infobox parameters we keep, mapped to the keys WikipediaScraper.get_info_list() returns
+INFOBOX_FIELDS = {
+    "writer": "screenwriter",
+    "director": "director",
+    "network": "network",
+    "channel": "network",
+}
+PLOT_SECTIONS = ("Synopsis", "Plot")
+
+REF_RE = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.S | re.I)
+COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+BR_RE = re.compile(r"<br\s*/?>", re.I)
+TAG_RE = re.compile(r"</?[a-z][^>]*>", re.I)
+FILE_LINK_RE = re.compile(r"\[\[(?:File|Image):[^\[\]]*(?:\[\[[^\]]*\]\][^\[\]]*)*\]\]", re.I)
+LINK_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]")
+EXTERNAL_LINK_RE = re.compile(r"\[https?://\S+\s*([^\]]*)\]")
+HEADING_RE = re.compile(r"^(=+)\s*(.*?)\s*\1\s*$", re.M)
+# Templates whose arguments are the list items themselves
+LIST_TEMPLATES = {"ubl", "unbulleted list", "plainlist", "plain list", "flatlist", "hlist", "nowrap"}
+
+
+def title_from_url(url: str) -> str:
+    """'https://en.wikipedia.org/wiki/Coffee_Prince_(2007_TV_series)' -> 'Coffee Prince (2007 TV series)'"""
+    path = urlsplit(url).path
+    return unquote(path.split("/wiki/", 1)[-1]).replace("_", " ")
+
+
+def split_top_level(text: str, separator: str = "|") -> list[str]:
+    """Split on `separator` outside of nested [[links]] and {{templates}}."""
+    parts, depth, current = [], 0, []
+    i = 0
+    while i < len(text):
+        pair = text[i:i + 2]
+        if pair in ("{{", "[["):
+            depth += 1
+            current.append(pair)
+            i += 2
+            continue
+        if pair in ("}}", "]]") and depth:
+            depth -= 1
+            current.append(pair)
+            i += 2
+            continue
+        if text[i] == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(text[i])
+        i += 1
+    parts.append("".join(current))
+    return parts
+
+
+def find_template(wikitext: str, name_prefix: str) -> str | None:
+    """Return the inner text of the first {{name_prefix...}} template (braces balanced)."""
+    match = re.search(r"\{\{\s*" + re.escape(name_prefix), wikitext, re.I)
+    if not match:
+        return None
+    depth, i = 0, match.start()
+    while i < len(wikitext) - 1:
+        pair = wikitext[i:i + 2]
+        if pair == "{{":
+            depth += 1
+            i += 2
+        elif pair == "}}":
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return wikitext[match.start() + 2:i - 2]
+        else:
+            i += 1
+    return None
+
+
+def expand_templates(text: str) -> str:
+    """Replace list-like templates by their items (one per line) and drop all other templates."""
+    while True:
+        match = re.search(r"\{\{([^{}]*)\}\}", text)
+        if not match:
+            return text
+        parts = split_top_level(match.group(1))
+        name = parts[0].strip().lower()
+        if name in LIST_TEMPLATES:
+            items = [part for part in parts[1:] if "=" not in part.split("[[")[0]]
+            replacement = "\n".join(items)
+        else:
+            replacement = ""
+        text = text[:match.start()] + replacement + text[match.end():]
+
+
+def clean_wikitext(text: str) -> str:
+    """Strip references, comments, templates, markup and links down to plain text."""
+    text = REF_RE.sub("", COMMENT_RE.sub("", text))
+    text = FILE_LINK_RE.sub("", text)
+    text = expand_templates(text)
+    text = BR_RE.sub("\n", text)
+    text = TAG_RE.sub("", text)
+    text = LINK_RE.sub(r"\1", text)
+    text = EXTERNAL_LINK_RE.sub(r"\1", text)
+    text = text.replace("'''", "").replace("''", "")
+    return text.replace("&nbsp;", " ").replace("&amp;", "&")
+
+
+def parse_people(value: str) -> list[str]:
+    """Infobox value (plainlist, ubl, <br> or bullets) -> list of names."""
+    people = []
+    for line in clean_wikitext(value).splitlines():
+        name = line.strip().lstrip("*").strip()
+        if name:
+            people.append(name)
+    return people
+
+
+def parse_plot(wikitext: str) -> str | None:
+    """Plain text of the Synopsis (or Plot) section, or None if the article has neither."""
+    headings = list(HEADING_RE.finditer(wikitext))
+    for section in PLOT_SECTIONS:
+        for index, heading in enumerate(headings):
+            if heading.group(2) != section:
+                continue
+            level = len(heading.group(1))
+            end = len(wikitext)
+            for next_heading in headings[index + 1:]:
+                if len(next_heading.group(1)) <= level:
+                    end = next_heading.start()
+                    break
+            body = HEADING_RE.sub("", wikitext[heading.end():end])
+            paragraphs = [" ".join(p.split()) for p in clean_wikitext(body).split("\n\n")]
+            return " ".join(p for p in paragraphs if p)
+    return None
+
+
+def parse_wikitext_info(wikitext: str) -> dict | None:
+    """
+    Parse article wikitext into the same keys as WikipediaScraper.get_info_list()
+    (screenwriter, director, network, plot). Returns None when there is no infobox.
+    """
+    infobox = find_template(wikitext, "Infobox")
+    if infobox is None:
+        return None
+
+    obj = {}
+    for param in split_top_level(infobox)[1:]:
+        key, sep, value = param.partition("=")
+        key = key.strip().lower()
+        if not sep or key not in INFOBOX_FIELDS or not value.strip():
+            continue
+        field = INFOBOX_FIELDS[key]
+        if field == "network":
+            obj.setdefault(field, ", ".join(parse_people(value)))
+        else:
+            obj[field] = parse_people(value)
+
+    plot = parse_plot(wikitext)
+    if plot is not None:
+        obj["plot"] = plot
+    return obj
+
+
+class WikipediaApiScraper:
+    """
+    Fetch many articles per request through the MediaWiki Action API.
+
+    Titles are batched (up to 50 per call) into action=query requests returning the latest
+    revision's wikitext and revision id, so a few dozen calls replace thousands of page loads.
+    """
+
+    def __init__(
+        self,
+        headers,
+        client: HttpClient | None = None,
+        api_url: str = WIKIPEDIA_API_URL,
+        batch_size: int = WIKIPEDIA_API_BATCH_SIZE,
+    ):
+        self.headers = headers
+        self.client = client or get_default_client()
+        self.api_url = api_url
+        self.batch_size = batch_size
+
+    def query(self, titles: list[str], rvprop: str) -> dict[str, dict]:
+        """Run one batched query (following continuations); returns {requested title: page}."""
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "prop": "revisions",
+            "rvprop": rvprop,
+            "rvslots": "main",
+            "redirects": "1",
+            "titles": "|".join(titles),
+        }
+        pages: dict[str, dict] = {}
+        aliases: dict[str, str] = {}
+        continuation: dict = {}
+        while True:
+            # Revision ids decide what is refetched, so a cached answer must not be reused as-is
+            response = self.client.get(
+                f"{self.api_url}?{urlencode({**params, **continuation})}", headers=self.headers, refresh=True
+            )
+            data = response.json()
+            query = data.get("query", {})
+            # Requested titles may be normalized and/or redirected before they reach a page
+            for key in ("normalized", "redirects"):
+                for item in query.get(key, []):
+                    aliases[item["from"]] = item["to"]
+            for page in query.get("pages", []):
+                existing = pages.setdefault(page["title"], page)
+                if "revisions" in page:
+                    existing["revisions"] = page["revisions"]
+            if "continue" not in data:
+                break
+            continuation = data["continue"]
+
+        results = {}
+        for title in titles:
+            resolved, seen = title, set()
+            while resolved in aliases and resolved not in seen:
+                seen.add(resolved)
+                resolved = aliases[resolved]
+            if resolved in pages:
+                results[title] = pages[resolved]
+        return results
+
+    def batches(self, urls):
+        urls = list(dict.fromkeys(urls))
+        for start in range(0, len(urls), self.batch_size):
+            yield urls[start:start + self.batch_size]
+
+    def get_info_lists(self, urls) -> list[list[dict]]:
+        """
+        One info list per URL (same order), like WikipediaScraper.get_info_list(); each info
+        dict also carries the article's `revision_id`. Missing or failed pages give [].
+        """
+        urls = list(urls)
+        by_url: dict[str, list[dict]] = {}
+        for batch in self.batches(urls):
+            titles = {url: title_from_url(url) for url in batch}
+            try:
+                pages = self.query(list(titles.values()), rvprop="ids|content")
+            except (requests.RequestException, ValueError):
+                # Same contract as the HTML scraper: a failed fetch is an empty result
+                for _ in titles:
+                    record_extraction(None, "api")
+                continue
+            for url, title in titles.items():
+                page = pages.get(title)
+                if not page or page.get("missing") or not page.get("revisions"):
+                    record_extraction(None, "api")
+                    continue
+                revision = page["revisions"][0]
+                with get_metrics().time("parse", source="wikipedia", parser="wikitext"):
+                    info = parse_wikitext_info(revision["slots"]["main"].get("content", ""))
+                record_extraction([info] if info is not None else [], "api")
+                if info is None:
+                    continue
+                info["revision_id"] = revision["revid"]
+                by_url[url] = [info]
+        return [by_url.get(url, []) for url in urls]
+
+    def get_revision_ids(self, urls) -> dict[str, int]:
+        """Latest revision id per URL (cheap: no content), for freshness checks."""
+        revisions = {}
+        for batch in self.batches(urls):
+            titles = {url: title_from_url(url) for url in batch}
+            try:
+                pages = self.query(list(titles.values()), rvprop="ids")
+            except (requests.RequestException, ValueError):
+                continue
+            for url, title in titles.items():
+                page = pages.get(title)
+                if page and page.get("revisions"):
+                    revisions[url] = page["revisions"][0]["revid"]
+        return revisions
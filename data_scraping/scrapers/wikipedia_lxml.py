@@ -0,0 +1,137 @@
+"""
+lxml fast path for WikipediaScraper.
+
+Produces the same info dicts as the BeautifulSoup/html.parser code in wikipedia_scraper.py on
+the saved test pages (checked by tests/wikipedia_parser_test.py), but parses with libxml2 and
+only walks the infobox rows and the siblings of the Plot/Synopsis heading. libxml2 repairs
+malformed markup differently, so the backend is opt-in (WIKIPEDIA_PARSER = "lxml").
+"""
+from bs4 import UnicodeDammit
+from lxml import etree, html
+
+# Text inside these tags is not part of BeautifulSoup's get_text() output
+HIDDEN_TEXT_TAGS = {"style", "script", "template", "rt", "rp"}
+
+INFOBOX_XPATHS = [
+    etree.XPath("//table[normalize-space(@class)='infobox ib-tv vevent']"),
+    etree.XPath("//table[normalize-space(@class)='infobox vevent']"),
+    etree.XPath("//table[contains(concat(' ', normalize-space(@class), ' '), ' infobox ')]"),
+]
+PLOT_HEADING_XPATHS = [etree.XPath("//*[@id='Synopsis']"), etree.XPath("//*[@id='Plot']")]
+
+
+def has_class(element, class_name: str) -> bool:
+    return class_name in (element.get("class") or "").split()
+
+
+def find_first(element, tag: str, class_name: str | None = None):
+    """Like bs4's element.find(tag, class_=class_name): first matching descendant."""
+    for descendant in element.iterdescendants(tag):
+        if class_name is None or has_class(descendant, class_name):
+            return descendant
+    return None
+
+
+def iter_strings(element, hidden: bool = False, line_breaks: bool = False):
+    """
+    Yield the text nodes under `element` in document order, skipping comments and hidden tags
+    (and, with `line_breaks`, None for every <br>).
+    """
+    hidden = hidden or element.tag in HIDDEN_TEXT_TAGS
+    if element.text and not hidden:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have a non-string tag; their text is not content
+        if isinstance(child.tag, str):
+            if line_breaks and child.tag == "br":
+                yield None
+            yield from iter_strings(child, hidden, line_breaks)
+        if child.tail and not hidden:
+            yield child.tail
+
+
+def get_text(element) -> str:
+    """Equivalent of bs4's element.get_text(strip=True)."""
+    return "".join(s.strip() for s in iter_strings(element) if s.strip())
+
+
+def get_lines(element) -> list[str]:
+    """get_text() of each <br>-separated line of `element`, blank lines dropped."""
+    lines = [[]]
+    for s in iter_strings(element, line_breaks=True):
+        if s is None:
+            lines.append([])
+        elif s.strip():
+            lines[-1].append(s.strip())
+    return ["".join(line) for line in lines if line]
+
+
+def parse_people(td) -> list[str]:
+    people = []
+    plainlist_div = find_first(td, "div", "plainlist")
+    if plainlist_div is not None:
+        for li in plainlist_div.iterdescendants("li"):
+            a_tag = find_first(li, "a")
+            if a_tag is not None:
+                people.append(get_text(a_tag))
+            else:
+                people.append(get_text(li))
+    else:
+        # Names without a list are separated by <br>
+        people.extend(get_lines(td))
+    return people
+
+
+def parse_info_list_lxml(content: bytes | str) -> list[dict]:
+    """Parse a Wikipedia article into the same [info] list as WikipediaScraper.get_info_list."""
+    info_list = []
+    if isinstance(content, bytes):
+        # Decode the same way BeautifulSoup does so both backends see identical text
+        content = UnicodeDammit(content, is_html=True).unicode_markup
+    root = html.document_fromstring(content)
+
+    table = None
+    for xpath in INFOBOX_XPATHS:
+        matches = xpath(root)
+        if matches:
+            table = matches[0]
+            break
+    if table is None:
+        return info_list
+
+    tbody = find_first(table, "tbody")
+    if tbody is None:
+        tbody = table
+
+    obj = {}
+    for row in tbody.iterdescendants("tr"):
+        header = find_first(row, "th", "infobox-label")
+        if header is None:
+            continue
+        label = get_text(header)
+        if label == "Written by":
+            obj["screenwriter"] = parse_people(find_first(row, "td", "infobox-data"))
+        elif label == "Directed by":
+            obj["director"] = parse_people(find_first(row, "td", "infobox-data"))
+        elif label == "Network":
+            obj["network"] = get_text(find_first(row, "td", "infobox-data"))
+
+    plot_heading = None
+    for xpath in PLOT_HEADING_XPATHS:
+        matches = xpath(root)
+        if matches:
+            plot_heading = matches[0]
+            break
+    if plot_heading is not None:
+        plot = ""
+        for sibling in plot_heading.getparent().itersiblings():
+            if not isinstance(sibling.tag, str):
+                continue
+            if sibling.tag.startswith("h"):
+                break
+            if sibling.tag == "p":
+                plot += get_text(sibling) + " "
+        obj["plot"] = plot.strip()
+
+    info_list.append(obj)
+    return info_list
@@ -1,103 +1,238 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+
 import requests
 from .. import helper
-from bs4 import BeautifulSoup
+from ..async_http_client import AsyncHttpClient
+from ..config import WIKIPEDIA_PARSER
+from ..http_client import HttpClient, get_default_client
+from ..metrics import get_metrics
+from bs4 import BeautifulSoup, Tag
+
+try:
+    from .wikipedia_lxml import parse_info_list_lxml
+except ImportError:  # lxml is optional; fall back to the pure-Python parser
+    parse_info_list_lxml = None
+
+# Available parser backends for WikipediaScraper(parser=...)
+PARSERS = ("html.parser", "lxml")
+# Fields whose extraction success is counted in the metrics
+EXTRACTED_FIELDS = ("screenwriter", "director", "network", "plot")
+
 
 class WikipediaScraper:
-    def __init__(self, url, headers):
+    def __init__(self, url, headers, client: HttpClient | None = None, parser: str = WIKIPEDIA_PARSER):
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}; expected one of {PARSERS}")
         self.url = url
         self.headers = headers
+        # Shared pooled session unless a specific client is injected
+        self.client = client or get_default_client()
+        self.parser = parser
     
-    def fetch_page(self):
-        """Fetch the IMDb list page using requests (no JS)."""
+    def fetch_content(self):
+        """Fetch the raw Wikipedia page bytes, or None if the page could not be fetched."""
         try:
-            response = requests.get(self.url, headers=self.headers)
-            response.raise_for_status()
+            # Transient 429/5xx responses are retried with backoff inside the client
+            response = self.client.get(self.url, headers=self.headers)
         except requests.RequestException:
             # If the page is missing or any network error occurs, signal failure to the caller
             return None
 
-        return BeautifulSoup(response.content, "html.parser")
+        return response.content
 
-    def get_info_list(self):
-        info_list = []
-        soup = self.fetch_page()
+    def fetch_page(self):
+        """Fetch the Wikipedia page using requests (no JS)."""
+        content = self.fetch_content()
+        if content is None:
+            return None
+        return BeautifulSoup(content, "html.parser")
+
+    def get_info_list(self, parse_executor: Executor | None = None):
+        """
+        Fetch and parse the page. With a `parse_executor` (e.g. a process pool from
+        concurrency.make_parse_executor) the bytes are parsed there instead of in this thread.
+        """
+        content = self.fetch_content()
         # If the page could not be fetched (404, network error, etc.), just return empty
-        if soup is None:
-            return info_list
-        # Try several common infobox variants; Wikipedia markup can change between pages
-        table = (
-            soup.find("table", class_="infobox ib-tv vevent")
-            or soup.find("table", class_="infobox vevent")
-            or soup.find("table", class_="infobox")
-        )
-
-        # If we still can't find an infobox, just return an empty list so the caller can skip this title
-        if table is None:
-            # Optional: you could log/print the URL here for debugging
-            return info_list
-
-        # Get the tbody element inside the table (if missing, operate directly on the table)
-        tbody = table.find("tbody") or table
-        rows = tbody.find_all("tr")
-        
-        # Find the row that has <th> with class_= "infobox-label" Extract screenwriter & director
-        # <th> and <td> are on the same level
-        obj = {}
-        for row in rows:
-            header = row.find("th", class_="infobox-label")
-            if header:
-                label = header.get_text(strip=True)
-                if label == "Written by":
-                    screenwriter_td = row.find("td", class_="infobox-data")
-                    # There might be more than 1 screenwriter. If that's the case, get the div with the class "plainlist" and inside the dive, get the li elements inside the ul element
-                    # If the <li> has a <a> tag, get the text inside the <a> tag
-                    screenwriter = []
-                    plainlist_div = screenwriter_td.find("div", class_="plainlist")
-                    if plainlist_div:
-                        for li in plainlist_div.find_all("li"):
-                            a_tag = li.find("a")
-                            if a_tag:
-                                screenwriter.append(a_tag.get_text(strip=True))
-                            else:
-                                screenwriter.append(li.get_text(strip=True))
-                    else:
-                        screenwriter.append(screenwriter_td.get_text(strip=True))
-                    obj["screenwriter"] = screenwriter
-                
-                # Get the director   
-                elif label == "Directed by":
-                    director_td = row.find("td", class_="infobox-data")
-                    director = []
-                    plainlist_div = director_td.find("div", class_="plainlist")
-                    if plainlist_div:
-                        for li in plainlist_div.find_all("li"):
-                            a_tag = li.find("a")
-                            if a_tag:
-                                director.append(a_tag.get_text(strip=True))
-                            else:
-                                director.append(li.get_text(strip=True))
-                    else:
-                        director.append(director_td.get_text(strip=True))
-                    obj["director"] = director
-                
-                # Get the network
-                elif label == "Network":
-                    network_td = row.find("td", class_="infobox-data")
-                    network = network_td.get_text(strip=True)
-                    obj["network"] = network
-                
-        # Extract the plot
-        # Find the heading with an id of Synopsis or Plot
-        plot_heading = soup.find(id="Synopsis") or soup.find(id="Plot")
-        # Extract all the text of the <p> elements until the next heading
-        plot = ""
-        if plot_heading:
-            for sibling in plot_heading.parent.find_next_siblings():
-                if sibling.name and sibling.name.startswith("h"):
-                    break
-                if sibling.name == "p":
-                    plot += sibling.get_text(strip=True) + " "
-            obj["plot"] = plot.strip()
-        
-        info_list.append(obj)
-        return info_list
\ No newline at end of file
+        if content is None:
+            record_extraction(None, "html")
+            return []
+        if parse_executor is None:
+            info_list, seconds = timed_parse_info_list(content, self.parser)
+        else:
+            info_list, seconds = parse_executor.submit(timed_parse_info_list, content, self.parser).result()
+        return record_parse(info_list, seconds, self.parser)
+
+
+class AsyncWikipediaScraper:
+    """
+    asyncio version of WikipediaScraper: the page is fetched through an AsyncHttpClient
+    without blocking the event loop, and the info list has the same shape.
+    """
+
+    def __init__(self, url, headers, client: AsyncHttpClient, parser: str = WIKIPEDIA_PARSER):
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}; expected one of {PARSERS}")
+        self.url = url
+        self.headers = headers
+        self.client = client
+        self.parser = parser
+
+    async def fetch_content(self):
+        """Fetch the raw Wikipedia page bytes, or None if the page could not be fetched."""
+        try:
+            response = await self.client.get(self.url, headers=self.headers)
+        except requests.RequestException:
+            return None
+        return response.content
+
+    async def get_info_list(self, parse_executor: Executor | None = None):
+        """
+        Fetch and parse the page. Parsing runs on the event loop (a few milliseconds per
+        article) unless a `parse_executor` process pool is given.
+        """
+        content = await self.fetch_content()
+        if content is None:
+            record_extraction(None, "html")
+            return []
+        if parse_executor is None:
+            info_list, seconds = timed_parse_info_list(content, self.parser)
+        else:
+            loop = asyncio.get_running_loop()
+            info_list, seconds = await loop.run_in_executor(
+                parse_executor, timed_parse_info_list, content, self.parser
+            )
+        return record_parse(info_list, seconds, self.parser)
+
+
+def record_parse(info_list, seconds: float, parser: str):
+    """Record a parsed page's timing and extraction results; returns `info_list`."""
+    get_metrics().observe("stage_duration_seconds", seconds, stage="parse", source="wikipedia", parser=parser)
+    record_extraction(info_list, "html")
+    return info_list
+
+
+def record_extraction(info_list, backend: str) -> None:
+    """Count the page outcome (None = fetch failed) and which fields were found on it."""
+    metrics = get_metrics()
+    if info_list is None:
+        metrics.inc("wikipedia_pages_total", backend=backend, result="fetch_failed")
+        return
+    if not info_list:
+        metrics.inc("wikipedia_pages_total", backend=backend, result="no_infobox")
+        return
+    metrics.inc("wikipedia_pages_total", backend=backend, result="parsed")
+    for field in EXTRACTED_FIELDS:
+        result = "found" if info_list[0].get(field) else "missing"
+        metrics.inc("wikipedia_fields_total", backend=backend, field=field, result=result)
+
+
+def parse_info_list(content, parser: str = WIKIPEDIA_PARSER):
+    """Parse raw page content with the chosen backend; both return identical info lists."""
+    if parser == "lxml" and parse_info_list_lxml is not None:
+        return parse_info_list_lxml(content)
+    return parse_info_list_soup(BeautifulSoup(content, "html.parser"))
+
+
+def timed_parse_info_list(content, parser: str = WIKIPEDIA_PARSER):
+    """parse_info_list() and the seconds it took; picklable, so it can run in a worker process."""
+    start = time.perf_counter()
+    info_list = parse_info_list(content, parser)
+    return info_list, time.perf_counter() - start
+
+
+def cell_lines(cell) -> list[str]:
+    """get_text(strip=True) of each <br>-separated line of an infobox cell, blank lines dropped."""
+    lines = [[]]
+    for node in cell.descendants:
+        if isinstance(node, Tag):
+            if node.name == "br":
+                lines.append([])
+        elif type(node) in cell.interesting_string_types and node.strip():
+            lines[-1].append(node.strip())
+    return ["".join(line) for line in lines if line]
+
+
+def parse_info_list_soup(soup):
+    """Extract screenwriter, director, network and plot from a parsed Wikipedia article."""
+    info_list = []
+    # Try several common infobox variants; Wikipedia markup can change between pages
+    table = (
+        soup.find("table", class_="infobox ib-tv vevent")
+        or soup.find("table", class_="infobox vevent")
+        or soup.find("table", class_="infobox")
+    )
+
+    # If we still can't find an infobox, just return an empty list so the caller can skip this title
+    if table is None:
+        # Optional: you could log/print the URL here for debugging
+        return info_list
+
+    # Get the tbody element inside the table (if missing, operate directly on the table)
+    tbody = table.find("tbody") or table
+    rows = tbody.find_all("tr")
+    
+    # Find the row that has <th> with class_= "infobox-label" Extract screenwriter & director
+    # <th> and <td> are on the same level
+    obj = {}
+    for row in rows:
+        header = row.find("th", class_="infobox-label")
+        if header:
+            label = header.get_text(strip=True)
+            if label == "Written by":
+                screenwriter_td = row.find("td", class_="infobox-data")
+                # There might be more than 1 screenwriter. If that's the case, get the div with the class "plainlist" and inside the dive, get the li elements inside the ul element
+                # If the <li> has a <a> tag, get the text inside the <a> tag
+                screenwriter = []
+                plainlist_div = screenwriter_td.find("div", class_="plainlist")
+                if plainlist_div:
+                    for li in plainlist_div.find_all("li"):
+                        a_tag = li.find("a")
+                        if a_tag:
+                            screenwriter.append(a_tag.get_text(strip=True))
+                        else:
+                            screenwriter.append(li.get_text(strip=True))
+                else:
+                    # Names without a list are separated by <br>
+                    screenwriter.extend(cell_lines(screenwriter_td))
+                obj["screenwriter"] = screenwriter
+            
+            # Get the director   
+            elif label == "Directed by":
+                director_td = row.find("td", class_="infobox-data")
+                director = []
+                plainlist_div = director_td.find("div", class_="plainlist")
+                if plainlist_div:
+                    for li in plainlist_div.find_all("li"):
+                        a_tag = li.find("a")
+                        if a_tag:
+                            director.append(a_tag.get_text(strip=True))
+                        else:
+                            director.append(li.get_text(strip=True))
+                else:
+                    director.extend(cell_lines(director_td))
+                obj["director"] = director
+            
+            # Get the network
+            elif label == "Network":
+                network_td = row.find("td", class_="infobox-data")
+                network = network_td.get_text(strip=True)
+                obj["network"] = network
+            
+    # Extract the plot
+    # Find the heading with an id of Synopsis or Plot
+    plot_heading = soup.find(id="Synopsis") or soup.find(id="Plot")
+    # Extract all the text of the <p> elements until the next heading
+    plot = ""
+    if plot_heading:
+        for sibling in plot_heading.parent.find_next_siblings():
+            if sibling.name and sibling.name.startswith("h"):
+                break
+            if sibling.name == "p":
+                plot += sibling.get_text(strip=True) + " "
+        obj["plot"] = plot.strip()
+    
+    info_list.append(obj)
+    return info_list
\ No newline at end of file
@@ -0,0 +1,116 @@
+import asyncio
+import csv
+import threading
+
+import pytest
+import requests
+
+pytest.importorskip("aiohttp")
+
+from data_scraping import async_enrich
+from data_scraping.async_http_client import AsyncHttpClient
+from data_scraping.concurrency import AsyncRateLimiter
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_cache import ResponseCache
+from data_scraping.http_client import HttpClient
+from data_scraping.scrapers.imdb_scraper import AsyncIMDBScraper, IMDBScraper
+from data_scraping.scrapers.wikipedia_scraper import AsyncWikipediaScraper, WikipediaScraper
+from data_scraping.tests.concurrent_enrich_test import PAGES, read_rows, write_inputs
+from data_scraping.tests.http_cache_test import PAGE, ETagHandler, etag_server  # noqa: F401
+from data_scraping.tests.http_client_test import FlakyHandler, flaky_server  # noqa: F401
+
+
+def test_async_scrapers_return_the_same_dicts(wiki_server, imdb_server):
+    async def scrape():
+        async with AsyncHttpClient() as client:
+            return await asyncio.gather(
+                AsyncWikipediaScraper(f"{wiki_server}/Damo_TV_series.html", {}, client).get_info_list(),
+                AsyncWikipediaScraper(f"{wiki_server}/Does_Not_Exist.html", {}, client).get_info_list(),
+                AsyncIMDBScraper(f"{imdb_server}/list/ls001/", {}, client).get_drama_list(),
+            )
+
+    info_list, missing, dramas = asyncio.run(scrape())
+    assert info_list == WikipediaScraper(f"{wiki_server}/Damo_TV_series.html", {}, client=HttpClient()).get_info_list()
+    assert missing == []
+    assert dramas == IMDBScraper(f"{imdb_server}/list/ls001/", {}, client=HttpClient()).get_drama_list()
+
+
+def test_async_client_retries_and_raises_requests_errors(flaky_server):  # noqa: F811
+    async def fetch():
+        async with AsyncHttpClient(backoff_factor=0) as client:
+            FlakyHandler.failures = [503, 429]
+            page = await client.get(f"{flaky_server}/page")
+            with pytest.raises(requests.HTTPError):
+                await client.get(f"{flaky_server}/missing")
+            return page
+
+    page = asyncio.run(fetch())
+    assert page.status_code == 200
+    assert b"Kim Young-hyun" in page.content
+    # Two retried failures, the page, then the 404 that is not retried
+    assert FlakyHandler.hits == 4
+
+
+class ThreadRecordingCache(ResponseCache):
+    """ResponseCache noting the thread each disk-touching call runs in."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def get(self, url):
+        self.threads.append(threading.get_ident())
+        return super().get(url)
+
+    def touch(self, url, revalidated=False):
+        self.threads.append(threading.get_ident())
+        super().touch(url, revalidated)
+
+    def store(self, url, response):
+        self.threads.append(threading.get_ident())
+        super().store(url, response)
+
+
+def test_async_client_cache_io_stays_off_the_event_loop(tmp_path, etag_server):  # noqa: F811
+    cache = ThreadRecordingCache(tmp_path, ttl=0)
+    url = f"{etag_server}/damo"
+
+    async def fetch():
+        async with AsyncHttpClient(cache=cache) as client:
+            first = await client.get(url)
+            second = await client.get(url)
+            return threading.get_ident(), first, second
+
+    loop_thread, first, second = asyncio.run(fetch())
+    assert first.content == second.content == PAGE
+    # The stale copy was revalidated with a 304 rather than downloaded again
+    assert ETagHandler.requests_seen == [("/damo", None), ("/damo", '"v1"')]
+    # get + store, then get + touch
+    assert len(cache.threads) == 4
+    assert loop_thread not in cache.threads
+
+
+def test_async_enrichment_matches_sync(tmp_path, wiki_server):
+    input_csv, wikipedia_list = write_inputs(tmp_path, wiki_server)
+    enrich_kdrama_list(input_csv, wikipedia_list, tmp_path / "sync.csv", requests_per_second=None, client=HttpClient())
+
+    total = asyncio.run(
+        async_enrich.enrich_kdrama_list(input_csv, wikipedia_list, tmp_path / "async.csv", requests_per_second=None)
+    )
+
+    assert total == len(PAGES) + 1
+    assert read_rows(tmp_path / "async.csv") == read_rows(tmp_path / "sync.csv")
+    with open(tmp_path / "async.review.csv", encoding="utf-8") as f:
+        assert [row["title"] for row in csv.DictReader(f)] == ["Unmapped Drama"]
+
+
+def test_async_rate_limiter_spaces_requests_per_host():
+    async def run():
+        limiter = AsyncRateLimiter(requests_per_second=20)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(limiter.wait("http://a.example/page") for _ in range(5)))
+        return loop.time() - start
+
+    # 5 requests at 20/s need at least 4 intervals of 50ms
+    assert asyncio.run(run()) >= 0.19
@@ -0,0 +1,32 @@
+from data_scraping.benchmark import BENCHMARKS, find_regressions, load_baseline, measure
+
+
+def test_every_case_runs_offline_on_the_fixtures():
+    counts = {name: setup()() for name, (setup, _) in BENCHMARKS.items()}
+    assert counts["imdb_get_drama_list"] == counts["imdb_extract_dom"] == 44
+    # Every saved article except No_Infobox.html has an infobox
+    assert counts["wikipedia_get_info_list_html_parser"] == counts["wikipedia_get_info_list_lxml"] == 4
+    assert counts["helper_preprocess"] == 1000
+    assert counts["enrich_end_to_end"] == 200
+    assert counts["calibration"] == 2000
+
+
+def test_baseline_covers_every_case():
+    assert set(load_baseline()) == set(BENCHMARKS)
+
+
+def test_measure_and_regression_threshold():
+    result = measure(lambda: 3, repeat=2, min_time=0.001)
+    assert result["items"] == 3
+    assert result["min_s"] <= result["median_s"]
+
+    # Times are compared relative to the calibration case, so a machine twice as slow
+    # overall (calibration included) reports no regression
+    baseline = {"calibration": {"relative": 1.0}, "a": {"relative": 2.0}, "b": {"relative": 2.0}}
+    results = {
+        "calibration": {"relative": 1.0},
+        "a": {"relative": 2.8},
+        "b": {"relative": 3.2},
+        "new": {"relative": 9.0},
+    }
+    assert find_regressions(results, baseline, threshold=0.5) == {"b": 1.6}
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from selenium.common.exceptions import NoSuchElementException
+
+from data_scraping.browser_pool import BrowserPool, build_chrome_options
+from data_scraping.run import scrape_with_selenium
+
+SAVED_LIST = (Path(__file__).parent.parent / "imdb_2010s_debug.html").read_text(encoding="utf-8")
+IMDB_FIXTURES = Path(__file__).parent / "fixtures" / "imdb"
+
+
+class FakeDriver:
+    """Stands in for webdriver.Chrome: the list grows by 10 items per scroll up to 44."""
+
+    def __init__(self):
+        self.visited = []
+        self.scrolls = 0
+        self.quit_called = False
+
+    def get(self, url):
+        self.visited.append(url)
+        self.scrolls = 0
+
+    def find_element(self, by, value):
+        if not self.visited:
+            raise NoSuchElementException(value)
+        return object()
+
+    def find_elements(self, by, value):
+        return [object()] * min(14 + 10 * self.scrolls, 44)
+
+    def execute_script(self, script):
+        self.scrolls += 1
+
+    @property
+    def page_source(self):
+        return SAVED_LIST
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_drivers_across_urls():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    with BrowserPool(size=2, settle_timeout=0.05, driver_factory=factory) as pool:
+        first = scrape_with_selenium("https://www.imdb.com/list/ls1/", pool)
+        second = scrape_with_selenium("https://www.imdb.com/list/ls2/", pool)
+
+    assert len(drivers) == 1
+    assert drivers[0].visited == ["https://www.imdb.com/list/ls1/", "https://www.imdb.com/list/ls2/"]
+    # Scrolled until the item count stopped growing (14 -> 24 -> 34 -> 44 -> 44)
+    assert drivers[0].scrolls == 4
+    assert drivers[0].quit_called
+    assert len(first) == len(second) == 44
+    assert first[0]["title"] == "Heirs"
+
+
+class PagedDriver(FakeDriver):
+    """Serves the two pages of the saved ls001 list (5 titles, 3 per page) by URL."""
+
+    @property
+    def page_source(self):
+        page = "page2" if self.visited[-1].endswith("?page=2") else "page1"
+        return (IMDB_FIXTURES / f"ls001_{page}.html").read_text(encoding="utf-8")
+
+
+def test_browser_path_follows_every_page_of_a_list():
+    driver = PagedDriver()
+    with BrowserPool(size=1, settle_timeout=0.01, driver_factory=lambda: driver) as pool:
+        dramas = scrape_with_selenium("https://www.imdb.com/list/ls001/", pool)
+
+    assert driver.visited == ["https://www.imdb.com/list/ls001/", "https://www.imdb.com/list/ls001/?page=2"]
+    assert len(dramas) == 5
+
+
+def test_headless_by_default():
+    assert "--headless=new" in build_chrome_options().arguments
+    assert "--headless=new" not in build_chrome_options(headless=False).arguments
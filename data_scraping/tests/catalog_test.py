@@ -0,0 +1,113 @@
+import csv
+import json
+
+import pytest
+
+from data_scraping.catalog import Catalog
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+
+COFFEE_PRINCE = {
+    "title": "The 1st Shop of Coffee Prince",
+    "imdb_id": "tt1058934",
+    "release_year": "2007",
+    "num_episodes": 17,
+    "rating_type": "imdb",
+    "rating_score": "8.1",
+    "cast": ["Gong Yoo", "Yoon Eun-hye"],
+    "short_description": "A tomboy, mistaken for a lad...",
+}
+JEWEL = {
+    "title": "Jewel in the Palace",
+    "release_year": "2003–2004",
+    "num_episodes": "54",
+    "cast": "Lee Yeong-ae, Ji Jin-hee",
+    "screenwriter": "Kim Young-hyun",
+    "director": "Lee Byung-hoon",
+    "plot": "The story is set in Korea...",
+    "source": "https://en.wikipedia.org/wiki/Jewel_in_the_Palace",
+}
+
+
+@pytest.fixture
+def catalog():
+    with Catalog(":memory:") as catalog:
+        yield catalog
+
+
+def test_upsert_and_lookup(catalog):
+    assert catalog.upsert_dramas([COFFEE_PRINCE, JEWEL, {"title": ""}]) == 2
+
+    (jewel,) = catalog.find_by_title("Jewel in the Palace")
+    assert jewel["start_year"] == 2003
+    assert jewel["end_year"] == 2004
+    assert jewel["num_episodes"] == 54
+    assert jewel["cast"] == ["Lee Yeong-ae", "Ji Jin-hee"]
+    assert jewel["source"] == "https://en.wikipedia.org/wiki/Jewel_in_the_Palace"
+
+    assert [d["title"] for d in catalog.dramas_by_person("Lee Byung-hoon", role="director")] == [
+        "Jewel in the Palace"
+    ]
+    assert catalog.dramas_by_person("Lee Byung-hoon", role="cast") == []
+    assert [d["title"] for d in catalog.dramas_missing("plot")] == ["The 1st Shop of Coffee Prince"]
+    assert [d["title"] for d in catalog.dramas_in_year(2007)] == ["The 1st Shop of Coffee Prince"]
+
+
+def test_upsert_updates_in_place_without_blanking(catalog):
+    catalog.upsert_dramas([COFFEE_PRINCE])
+    # The enrichment CSV has no IMDb id: matched by title + year, and fills in Wikipedia fields
+    catalog.upsert_dramas(
+        [
+            {
+                "title": "The 1st Shop of Coffee Prince",
+                "release_year": "2007",
+                "rating_score": "",
+                "director": "Lee Yoon-jung",
+                "plot": "Choi Han-gyeol is the grandson...",
+            }
+        ]
+    )
+
+    (drama,) = catalog.find_by_title("The 1st Shop of Coffee Prince")
+    assert drama["imdb_id"] == "tt1058934"
+    assert drama["rating_score"] == pytest.approx(8.1)
+    assert drama["cast"] == ["Gong Yoo", "Yoon Eun-hye"]
+    assert drama["director"] == ["Lee Yoon-jung"]
+    assert catalog.dramas_missing("plot") == []
+
+
+def test_wikipedia_list_import(catalog, tmp_path):
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(json.dumps([{"Damo": "https://en.wikipedia.org/wiki/Damo_(TV_series)"}]))
+
+    assert catalog.import_wikipedia_list(wikipedia_list) == 1
+    assert catalog.wikipedia_map() == {"Damo": "https://en.wikipedia.org/wiki/Damo_(TV_series)"}
+    assert catalog.wikipedia_url("Unknown") is None
+    with pytest.raises(ValueError):
+        catalog.dramas_missing("title")
+
+
+def test_enrichment_upserts_into_catalog(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year", "cast"])
+        writer.writerow(["The 1st Shop of Coffee Prince", "2007", "Gong Yoo, Yoon Eun-hye"])
+        writer.writerow(["Unmapped Drama", "2010", ""])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    url = f"{wiki_server}/Coffee_Prince_2007_TV_series.html"
+    wikipedia_list.write_text(json.dumps([{"The 1st Shop of Coffee Prince": url}]), encoding="utf-8")
+    catalog_path = tmp_path / "catalog.sqlite3"
+
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, tmp_path / "out.csv",
+        requests_per_second=None, client=HttpClient(), catalog_path=catalog_path,
+    )
+
+    with Catalog(catalog_path) as catalog:
+        (drama,) = catalog.dramas_by_person("Jang Hyun-joo", role="screenwriter")
+        assert drama["title"] == "The 1st Shop of Coffee Prince"
+        assert drama["source"] == url
+        assert [d["title"] for d in catalog.dramas_missing("source")] == ["Unmapped Drama"]
+        fetched_at = catalog.conn.execute("SELECT fetched_at FROM sources").fetchone()[0]
+        assert fetched_at is not None
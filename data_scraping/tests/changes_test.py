@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from data_scraping.changes import ChangeDetectingCSVWriter, csv_row, diff_records, load_snapshot, record_key
+
+DRAMAS = [
+    {
+        "title": "Heirs",
+        "release_year": "2013",
+        "num_episodes": 20,
+        "rating_type": "imdb",
+        "rating_score": 7.4,
+        "cast": ["Lee Min-ho", "Park Shin-hye"],
+        "plot": "Kim Tan is the heir of a conglomerate.",
+    },
+    {"title": "Signal", "release_year": "2016", "num_episodes": 16, "rating_score": 8.5, "cast": ["Lee Je-hoon"]},
+    {"title": "Goblin", "release_year": "2016–2017", "num_episodes": 16, "rating_score": 8.6},
+]
+
+
+def write_run(path, dramas):
+    with ChangeDetectingCSVWriter(path) as output:
+        statuses = [output.write(drama) for drama in dramas]
+    with open(output.changes_path, encoding="utf-8") as f:
+        return statuses, json.load(f)
+
+
+def snapshot(dramas):
+    snapshot = {}
+    for drama in dramas:
+        row = csv_row(drama)
+        snapshot.setdefault(record_key(row), []).append(row)
+    return snapshot
+
+
+def snapshot_rows(path):
+    return [row for rows in load_snapshot(path).values() for row in rows]
+
+
+def test_diff_records_lists_field_changes():
+    previous = snapshot([DRAMAS[0], {"title": "Mouse", "release_year": "2021"}])
+    current = [{**DRAMAS[0], "rating_score": 7.5, "plot": "Edited."}, DRAMAS[1]]
+
+    changeset = diff_records(previous, current)
+
+    assert [row["title"] for row in changeset["added"]] == ["Signal"]
+    assert [row["title"] for row in changeset["removed"]] == ["Mouse"]
+    assert changeset["modified"] == [
+        {
+            "title": "Heirs",
+            "imdb_id": "",
+            "release_year": "2013",
+            "fields": {"rating_score": ["7.4", "7.5"], "plot": ["Kim Tan is the heir of a conglomerate.", "Edited."]},
+        }
+    ]
+    assert changeset["unchanged"] == 0
+
+
+def test_rows_are_compared_by_identity_and_typed_values():
+    previous = snapshot(
+        [
+            {"title": "Mouse", "release_year": "2021–", "rating_score": "8.1"},
+            {"title": "Heirs", "release_year": "2013", "num_episodes": "20", "rating_score": "7.4"},
+            # Same title and year, told apart by their IMDb ids
+            {"title": "Happiness", "imdb_id": "tt1", "release_year": "2021"},
+            {"title": "Happiness", "imdb_id": "tt2", "release_year": "2021"},
+        ]
+    )
+    current = [
+        # The ongoing show ended: one modified row, not an add and a remove
+        {"title": "Mouse", "release_year": "2021–2022", "rating_score": 8.1},
+        # Same values, formatted differently; the IMDb id is new
+        {
+            "title": "Heirs",
+            "imdb_id": "tt3",
+            "release_year": "2013",
+            "num_episodes": 20,
+            "rating_score": "7.40",
+        },
+        {"title": "Happiness", "imdb_id": "tt1", "release_year": "2021"},
+        {"title": "Happiness", "imdb_id": "tt2", "release_year": "2021", "plot": "A new plot."},
+    ]
+
+    changeset = diff_records(previous, current)
+
+    assert changeset["added"] == []
+    assert changeset["removed"] == []
+    assert [(row["title"], row["fields"]) for row in changeset["modified"]] == [
+        ("Mouse", {"release_year": ["2021–", "2021–2022"]}),
+        ("Heirs", {"imdb_id": ["", "tt3"]}),
+        ("Happiness", {"plot": ["", "A new plot."]}),
+    ]
+    assert changeset["unchanged"] == 1
+
+
+def test_rows_sharing_a_key_are_all_kept(tmp_path):
+    path = tmp_path / "kdrama_list.csv"
+    # Two unrelated dramas with the same title and year, and no IMDb ids
+    namesakes = [
+        {"title": "Happiness", "release_year": "2021", "network_provider": "tvN"},
+        {"title": "Happiness", "release_year": "2021", "network_provider": "KBS2"},
+    ]
+    write_run(path, namesakes)
+    assert len(snapshot_rows(path)) == 2
+
+    statuses, changeset = write_run(path, namesakes)
+    assert statuses == ["unchanged", "unchanged"]
+    assert changeset["added"] == changeset["removed"] == []
+
+    # Each previous row matches one current row, an identical one first
+    statuses, changeset = write_run(path, [namesakes[1], {**namesakes[0], "plot": "New."}])
+    assert statuses == ["unchanged", "modified"]
+    assert changeset["modified"][0]["fields"] == {"plot": ["", "New."]}
+
+    statuses, changeset = write_run(path, [namesakes[1]])
+    assert statuses == ["unchanged"]
+    assert [row["network_provider"] for row in changeset["removed"]] == ["tvN"]
+
+
+def test_output_is_only_rewritten_when_something_changed(tmp_path):
+    path = tmp_path / "kdrama_list.csv"
+
+    statuses, changeset = write_run(path, DRAMAS)
+    assert statuses == ["added"] * 3
+    assert [row["cast"] for row in snapshot_rows(path)] == ["Lee Min-ho, Park Shin-hye", "Lee Je-hoon", ""]
+    written = path.stat().st_mtime_ns, path.read_bytes()
+
+    statuses, changeset = write_run(path, DRAMAS)
+    assert statuses == ["unchanged"] * 3
+    assert changeset == {"added": [], "modified": [], "removed": [], "unchanged": 3}
+    assert (path.stat().st_mtime_ns, path.read_bytes()) == written
+    assert not (tmp_path / "kdrama_list.csv.tmp").exists()
+
+    statuses, changeset = write_run(path, [{**DRAMAS[1], "rating_score": 8.4}, DRAMAS[2]])
+    assert statuses == ["modified", "unchanged"]
+    assert changeset["modified"][0]["fields"] == {"rating_score": ["8.5", "8.4"]}
+    assert [row["title"] for row in changeset["removed"]] == ["Heirs"]
+    assert [row["rating_score"] for row in snapshot_rows(path)] == ["8.4", "8.6"]
+
+
+def test_failed_run_keeps_the_previous_output(tmp_path):
+    path = tmp_path / "kdrama_list.csv"
+    write_run(path, DRAMAS)
+    before = path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with ChangeDetectingCSVWriter(path) as output:
+            output.write({**DRAMAS[0], "rating_score": 1.0})
+            raise RuntimeError("scrape failed")
+
+    assert path.read_bytes() == before
+    assert not (tmp_path / "kdrama_list.csv.tmp").exists()
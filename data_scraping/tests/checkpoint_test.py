@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pytest
+
+from data_scraping.checkpoint import ChunkJournal
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+
+TITLES = [f"Drama {i}" for i in range(25)]
+
+
+class CrashingClient(HttpClient):
+    """Counts requests and fails once `crash_after` pages have been fetched."""
+
+    def __init__(self, crash_after=None):
+        super().__init__()
+        self.crash_after = crash_after
+        self.calls = 0
+
+    def get(self, url, headers=None):
+        if self.crash_after is not None and self.calls >= self.crash_after:
+            raise RuntimeError("simulated crash")
+        self.calls += 1
+        return super().get(url, headers=headers)
+
+
+@pytest.fixture
+def inputs(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title"])
+        writer.writerows([title] for title in TITLES)
+
+    pages = ["Damo_TV_series.html", "Jewel_in_the_Palace.html", "Coffee_Prince_2007_TV_series.html"]
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps([{title: f"{wiki_server}/{pages[i % 3]}"} for i, title in enumerate(TITLES)]),
+        encoding="utf-8",
+    )
+    return input_csv, wikipedia_list
+
+
+def test_resume_skips_committed_chunks(tmp_path, inputs):
+    input_csv, wikipedia_list = inputs
+    output_csv = tmp_path / "out.csv"
+    journal_path = tmp_path / "out.journal.jsonl"
+
+    with pytest.raises(RuntimeError):
+        enrich_kdrama_list(
+            input_csv, wikipedia_list, output_csv,
+            max_workers=1, requests_per_second=None, client=CrashingClient(crash_after=12),
+        )
+    # Only the first chunk of 10 rows made it into the journal; no partial CSV was written
+    assert not output_csv.exists()
+    assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    client = CrashingClient()
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, output_csv,
+        max_workers=1, requests_per_second=None, client=client, resume=True,
+    )
+    assert client.calls == 15
+    assert not journal_path.exists()
+
+    expected_csv = tmp_path / "expected.csv"
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, expected_csv,
+        max_workers=1, requests_per_second=None, client=HttpClient(),
+    )
+    assert output_csv.read_text(encoding="utf-8") == expected_csv.read_text(encoding="utf-8")
+
+
+def test_journal_ignores_torn_lines_and_other_runs(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ChunkJournal(path, {"input_csv": "a.csv", "chunk_size": 10, "rows": 20})
+    journal.start()
+    journal.commit(1, [{"title": "Damo"}], {})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"chunk": 2, "rows": [{"tit')
+
+    assert list(journal.load()) == [1]
+    assert ChunkJournal(path, {"input_csv": "b.csv", "chunk_size": 10, "rows": 20}).load() == {}
@@ -0,0 +1,89 @@
+import csv
+import json
+
+import pytest
+
+from data_scraping.columnar import ParquetBatchWriter, parse_year_range, split_people, to_record
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parse_year_range():
+    assert parse_year_range("2003–2004") == (2003, 2004)
+    assert parse_year_range("2007") == (2007, 2007)
+    assert parse_year_range("2021–") == (2021, None)
+    assert parse_year_range("") == (None, None)
+
+
+def test_to_record_types_every_column():
+    record = to_record(
+        {
+            "title": "Jewel in the Palace",
+            "release_year": "2003–2004",
+            "num_episodes": "54",
+            "rating_type": "imdb",
+            "rating_score": "8.4",
+            "cast": "Lee Yeong-ae, Hong Ri-na, Ji Jin-hee",
+            "screenwriter": ["Kim Young-hyun"],
+            "director": "",
+        }
+    )
+    assert record["start_year"] == 2003
+    assert record["end_year"] == 2004
+    assert record["num_episodes"] == 54
+    assert record["rating_score"] == 8.4
+    assert record["cast"] == ["Lee Yeong-ae", "Hong Ri-na", "Ji Jin-hee"]
+    assert record["screenwriter"] == ["Kim Young-hyun"]
+    assert record["director"] == []
+    assert record["plot"] is None
+    assert split_people(None) == []
+
+
+def test_enrichment_writes_typed_parquet(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year", "num_episodes", "rating_score", "cast"])
+        writer.writerow(["The 1st Shop of Coffee Prince", "2007", "17", "8.1", "Gong Yoo, Yoon Eun-hye"])
+        writer.writerow(["Unmapped Drama", "2021–", "", "", ""])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps([{"The 1st Shop of Coffee Prince": f"{wiki_server}/Coffee_Prince_2007_TV_series.html"}]),
+        encoding="utf-8",
+    )
+    parquet_output = tmp_path / "out.parquet"
+
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, tmp_path / "out.csv",
+        requests_per_second=None, client=HttpClient(), chunk_size=1, parquet_output=parquet_output,
+    )
+
+    table = pq.read_table(parquet_output)
+    assert table.schema.field("screenwriter").type.value_type == "string"
+    assert table.schema.field("rating_score").type == "float"
+    rows = table.to_pylist()
+    assert rows[0]["screenwriter"] == ["Lee Jung-ah", "Jang Hyun-joo"]
+    assert rows[0]["cast"] == ["Gong Yoo", "Yoon Eun-hye"]
+    assert rows[0]["num_episodes"] == 17
+    assert rows[1]["start_year"] == 2021
+    assert rows[1]["end_year"] is None
+    assert rows[1]["rating_score"] is None
+
+    # Only the requested columns are read back
+    assert pq.read_table(parquet_output, columns=["title"]).column_names == ["title"]
+    assert not (tmp_path / "out.parquet.tmp").exists()
+
+
+def test_aborted_writer_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "kdrama_list.parquet"
+    with ParquetBatchWriter(path) as writer:
+        writer.write({"title": "Heirs", "release_year": "2013"})
+
+    with ParquetBatchWriter(path) as writer:
+        writer.write({"title": "Signal", "release_year": "2016"})
+        writer.abort()
+
+    assert pq.read_table(path).column("title").to_pylist() == ["Heirs"]
+    assert not writer.tmp_path.exists()
@@ -0,0 +1,109 @@
+import csv
+import json
+import time
+
+from data_scraping.concurrency import RateLimiter, fetch_wikipedia_info, map_ordered
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+
+PAGES = {
+    "The 1st Shop of Coffee Prince": "Coffee_Prince_2007_TV_series.html",
+    "Jewel in the Palace": "Jewel_in_the_Palace.html",
+    "Damo": "Damo_TV_series.html",
+    "Some Drama Without Infobox": "No_Infobox.html",
+    "Missing Page": "Does_Not_Exist.html",
+}
+
+
+def write_inputs(tmp_path, base_url):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        for title in [*PAGES, "Unmapped Drama"]:
+            writer.writerow([title, "2007"])
+
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps([{title: f"{base_url}/{page}"} for title, page in PAGES.items()]),
+        encoding="utf-8",
+    )
+    return input_csv, wikipedia_list
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_map_ordered_keeps_input_order():
+    def slow_square(n):
+        time.sleep(0.01 * (5 - n))
+        return n * n
+
+    assert map_ordered(slow_square, range(5), max_workers=5) == [0, 1, 4, 9, 16]
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = RateLimiter(requests_per_second=20)
+    start = time.monotonic()
+    map_ordered(lambda _: limiter.wait("http://a.example/page"), range(5), max_workers=5)
+    # 5 requests at 20/s need at least 4 intervals of 50ms
+    assert time.monotonic() - start >= 0.19
+
+    start = time.monotonic()
+    for host in "bcdef":
+        limiter.wait(f"http://{host}.example/page")
+    # Different hosts do not wait on each other
+    assert time.monotonic() - start < 0.05
+
+
+def test_fetch_wikipedia_info_returns_results_in_order(wiki_server):
+    urls = [f"{wiki_server}/{page}" for page in PAGES.values()]
+    info_lists = fetch_wikipedia_info(urls, {}, max_workers=4, client=HttpClient())
+
+    assert info_lists[0][0]["screenwriter"] == ["Lee Jung-ah", "Jang Hyun-joo"]
+    assert info_lists[1][0]["screenwriter"] == ["Kim Young-hyun"]
+    assert info_lists[2][0]["network"] == "MBC TV"
+    assert info_lists[3] == []
+    assert info_lists[4] == []
+
+
+def test_concurrent_enrichment_matches_serial(tmp_path, wiki_server):
+    input_csv, wikipedia_list = write_inputs(tmp_path, wiki_server)
+
+    serial_csv = tmp_path / "serial.csv"
+    concurrent_csv = tmp_path / "concurrent.csv"
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, serial_csv,
+        max_workers=1, requests_per_second=None, client=HttpClient(),
+    )
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, concurrent_csv,
+        max_workers=8, requests_per_second=50, client=HttpClient(),
+    )
+
+    serial_rows = read_rows(serial_csv)
+    assert read_rows(concurrent_csv) == serial_rows
+    assert [row["title"] for row in serial_rows] == [*PAGES, "Unmapped Drama"]
+    assert serial_rows[0]["director"] == "Lee Yoon-jung"
+    assert serial_rows[0]["source"] == f"{wiki_server}/Coffee_Prince_2007_TV_series.html"
+    assert serial_rows[-1]["source"] == ""
+
+
+def test_process_pool_parsing_matches_in_thread_parsing(tmp_path, wiki_server):
+    input_csv, wikipedia_list = write_inputs(tmp_path, wiki_server)
+
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, tmp_path / "threads.csv",
+        max_workers=4, requests_per_second=None, client=HttpClient(),
+    )
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, tmp_path / "processes.csv",
+        max_workers=4, requests_per_second=None, client=HttpClient(), parse_workers=2,
+    )
+
+    assert read_rows(tmp_path / "processes.csv") == read_rows(tmp_path / "threads.csv")
+    # Parse timings of the 4 fetched pages come back from the worker processes
+    prom = (tmp_path / "processes.metrics.prom").read_text()
+    assert 'stage_duration_seconds_count{parser="html.parser",source="wikipedia",stage="parse"} 4' in prom
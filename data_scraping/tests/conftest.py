@@ -0,0 +1,60 @@
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serve saved pages without logging every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ImdbListHandler(QuietHandler):
+    """Map /list/<id>/?page=N to the saved fixtures/imdb/<id>_pageN.html."""
+
+    requested: list[str] = []
+
+    def translate_path(self, path):
+        parts = urlsplit(path)
+        list_id = parts.path.strip("/").split("/")[-1]
+        page = parse_qs(parts.query).get("page", ["1"])[0]
+        type(self).requested.append(f"{list_id}_page{page}")
+        return str(FIXTURES_DIR / "imdb" / f"{list_id}_page{page}.html")
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def imdb_server():
+    """Local HTTP stand-in for IMDb serving the saved list pages in fixtures/imdb."""
+    ImdbListHandler.requested = []
+    server = serve(ImdbListHandler)
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def wiki_server():
+    """Local HTTP stand-in for Wikipedia serving the saved pages in fixtures/wikipedia."""
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR / "wikipedia"))
+    server = serve(handler)
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,139 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_scraping.http_cache import CacheMissError, ResponseCache
+from data_scraping.http_client import HttpClient
+from data_scraping.scrapers.wikipedia_scraper import WikipediaScraper
+from data_scraping.tests.conftest import FIXTURES_DIR
+
+PAGE = (FIXTURES_DIR / "wikipedia" / "Damo_TV_series.html").read_bytes()
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serve `body` with an ETag and answer 304 to a matching If-None-Match."""
+
+    protocol_version = "HTTP/1.1"
+    body = PAGE
+    etag = '"v1"'
+    requests_seen: list[tuple[str, str | None]] = []
+
+    def do_GET(self):
+        if_none_match = self.headers.get("If-None-Match")
+        type(self).requests_seen.append((self.path, if_none_match))
+        if if_none_match == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server():
+    ETagHandler.body = PAGE
+    ETagHandler.etag = '"v1"'
+    ETagHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fresh_entries_skip_the_network(tmp_path, etag_server):
+    client = HttpClient(cache=ResponseCache(tmp_path, ttl=60))
+    url = f"{etag_server}/damo"
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.content == second.content == PAGE
+    assert second.headers["X-Cache"] == "HIT"
+    assert len(ETagHandler.requests_seen) == 1
+
+    # A new cache instance over the same directory replays the stored page
+    reloaded = HttpClient(cache=ResponseCache(tmp_path, ttl=60))
+    info = WikipediaScraper(url, {}, client=reloaded).get_info_list()
+    assert info[0]["director"] == ["Lee Jae-kyoo", "Jung Hyung-soo"]
+    assert len(ETagHandler.requests_seen) == 1
+
+
+def test_stale_entries_are_revalidated(tmp_path, etag_server):
+    client = HttpClient(cache=ResponseCache(tmp_path, ttl=0))
+    url = f"{etag_server}/damo"
+
+    client.get(url)
+    response = client.get(url)
+
+    assert response.content == PAGE
+    assert ETagHandler.requests_seen == [("/damo", None), ("/damo", '"v1"')]
+
+    # Changed upstream content replaces the cached body
+    ETagHandler.body = PAGE.replace(b"MBC TV", b"KBS2")
+    ETagHandler.etag = '"v2"'
+    assert b"KBS2" in client.get(url).content
+    assert len(list((tmp_path / "objects").iterdir())) == 1
+
+
+def test_offline_mode_serves_only_from_cache(tmp_path, etag_server):
+    url = f"{etag_server}/damo"
+    HttpClient(cache=ResponseCache(tmp_path)).get(url)
+
+    offline = HttpClient(cache=ResponseCache(tmp_path, ttl=0, offline=True))
+    assert offline.get(url).content == PAGE
+    with pytest.raises(CacheMissError):
+        offline.get(f"{etag_server}/never-fetched")
+    assert WikipediaScraper(f"{etag_server}/never-fetched", {}, client=offline).get_info_list() == []
+    assert len(ETagHandler.requests_seen) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, etag_server):
+    cache = ResponseCache(tmp_path, max_bytes=2 * len(PAGE) + 10)
+    client = HttpClient(cache=cache)
+
+    for page in ("a", "b"):
+        ETagHandler.body = PAGE + page.encode()
+        client.get(f"{etag_server}/{page}")
+        time.sleep(0.01)
+    client.get(f"{etag_server}/a")  # refresh "a" so "b" is the oldest
+    time.sleep(0.01)
+    ETagHandler.body = PAGE + b"c"
+    client.get(f"{etag_server}/c")
+
+    assert cache.get(f"{etag_server}/a") is not None
+    assert cache.get(f"{etag_server}/b") is None
+    assert cache.get(f"{etag_server}/c") is not None
+    assert len(list((tmp_path / "objects").iterdir())) == 2
+
+
+def test_cache_hits_do_not_rewrite_entries(tmp_path, etag_server):
+    cache = ResponseCache(tmp_path, ttl=60)
+    client = HttpClient(cache=cache)
+    url = f"{etag_server}/damo"
+    client.get(url)
+    entry_path = tmp_path / "entries" / f"{ResponseCache.url_key(url)}.json"
+    stored = entry_path.read_bytes()
+
+    for _ in range(3):
+        client.get(url)
+    assert entry_path.read_bytes() == stored
+
+    # flush() writes the in-memory last use back
+    cache.flush()
+    assert ResponseCache(tmp_path).get(url)["last_used"] == cache.get(url)["last_used"]
+    assert entry_path.read_bytes() != stored
@@ -0,0 +1,90 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from data_scraping.http_client import HttpClient, get_default_client
+from data_scraping.scrapers.wikipedia_scraper import WikipediaScraper
+from data_scraping.tests.conftest import FIXTURES_DIR
+
+PAGE = (FIXTURES_DIR / "wikipedia" / "Jewel_in_the_Palace.html").read_bytes()
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answer 503 (with Retry-After) / 429 a few times before serving the saved page."""
+
+    protocol_version = "HTTP/1.1"
+    failures: list[int] = []
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        if self.failures:
+            status = self.failures.pop(0)
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.failures = []
+    FlakyHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_transient_errors_are_retried(flaky_server):
+    FlakyHandler.failures = [503, 429]
+    client = HttpClient(backoff_factor=0)
+
+    info = WikipediaScraper(f"{flaky_server}/page", {}, client=client).get_info_list()
+
+    assert info[0]["screenwriter"] == ["Kim Young-hyun"]
+    assert FlakyHandler.hits == 3
+
+
+def test_gives_up_after_configured_retries(flaky_server):
+    FlakyHandler.failures = [503] * 5
+    client = HttpClient(retries=2, backoff_factor=0)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(f"{flaky_server}/page")
+    assert FlakyHandler.hits == 3
+
+    # The scraper still reports a failed page as an empty result
+    FlakyHandler.failures = [503] * 5
+    assert WikipediaScraper(f"{flaky_server}/page", {}, client=client).get_info_list() == []
+
+
+def test_client_errors_are_not_retried(flaky_server):
+    client = HttpClient(backoff_factor=0)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(f"{flaky_server}/missing")
+    assert FlakyHandler.hits == 1
+
+
+def test_scrapers_share_the_default_client():
+    scraper = WikipediaScraper("https://en.wikipedia.org/wiki/Damo_(TV_series)", {})
+    assert scraper.client is get_default_client()
@@ -0,0 +1,51 @@
+from data_scraping.concurrency import make_parse_executor
+from data_scraping.http_client import HttpClient
+from data_scraping.scrapers.imdb_crawler import crawl_lists
+from data_scraping.scrapers.imdb_extractor import extract_list_page, page_count
+from data_scraping.scrapers.imdb_scraper import page_url
+from data_scraping.tests.conftest import FIXTURES_DIR, ImdbListHandler
+
+
+def test_page_url():
+    assert page_url("https://www.imdb.com/list/ls1/", 1) == "https://www.imdb.com/list/ls1/"
+    assert page_url("https://www.imdb.com/list/ls1/", 3) == "https://www.imdb.com/list/ls1/?page=3"
+    assert page_url("https://www.imdb.com/list/ls1/?sort=rank&page=2", 4) == (
+        "https://www.imdb.com/list/ls1/?sort=rank&page=4"
+    )
+
+
+def test_page_count_from_total():
+    # 5 titles, 3 per page
+    dramas, total = extract_list_page((FIXTURES_DIR / "imdb" / "ls001_page1.html").read_text())
+    assert page_count(total, len(dramas)) == 2
+    dramas, total = extract_list_page((FIXTURES_DIR / "imdb" / "ls002_page1.html").read_text())
+    assert page_count(total, len(dramas)) == 1
+
+
+def test_crawl_fetches_every_page_and_deduplicates(imdb_server):
+    urls = [f"{imdb_server}/list/ls001/", f"{imdb_server}/list/ls002/"]
+    dramas = list(crawl_lists(urls, {}, client=HttpClient(), max_workers=3))
+
+    assert sorted(ImdbListHandler.requested) == ["ls001_page1", "ls001_page2", "ls002_page1"]
+    # 5 + 2 titles, one of which appears on both lists
+    ids = [drama["imdb_id"] for drama in dramas]
+    assert len(ids) == len(set(ids)) == 6
+    assert {drama["title"] for drama in dramas} >= {"Heirs", "City Hunter"}
+
+
+def test_seen_titles_are_skipped(imdb_server):
+    seen = set()
+    first = list(crawl_lists([f"{imdb_server}/list/ls002/"], {}, client=HttpClient(), seen=seen))
+    second = list(crawl_lists([f"{imdb_server}/list/ls001/"], {}, client=HttpClient(), seen=seen))
+    assert len(first) == 2
+    assert len(second) == 4
+
+
+def test_crawl_parses_in_worker_processes(imdb_server):
+    urls = [f"{imdb_server}/list/ls001/", f"{imdb_server}/list/ls002/"]
+    with make_parse_executor(2) as parse_executor:
+        dramas = list(crawl_lists(urls, {}, client=HttpClient(), parse_executor=parse_executor))
+    assert sorted(d["imdb_id"] for d in dramas) == sorted(
+        d["imdb_id"] for d in crawl_lists(urls, {}, client=HttpClient())
+    )
+    assert len(dramas) == 6
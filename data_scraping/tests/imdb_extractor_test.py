@@ -0,0 +1,90 @@
+import re
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from data_scraping.scrapers.imdb_extractor import (
+    extract_dom,
+    extract_dramas,
+    extract_json_ld,
+    extract_list_page,
+    extract_next_data,
+    format_year_range,
+    rendered_item_count,
+)
+from data_scraping.tests.conftest import FIXTURES_DIR
+
+SAVED_LIST = (Path(__file__).parent.parent / "imdb_2010s_debug.html").read_text(encoding="utf-8")
+
+
+def test_next_data_agrees_with_the_dom():
+    from_json, total = extract_next_data(SAVED_LIST)
+    from_dom = extract_dom(BeautifulSoup(SAVED_LIST, "html.parser"))
+
+    assert total == len(from_json) == len(from_dom) == 44
+    assert from_json[0] == {
+        "title": "Heirs",
+        "imdb_id": "tt3243098",
+        "release_year": "2013",
+        "num_episodes": 20,
+        "rating_type": "imdb",
+        "rating_score": "7.5",
+        "cast": ["Lee Min-ho", "Park Shin-hye", "Kim Woo-bin", "Choi Jin-hyuk"],
+        "short_description": from_dom[0]["short_description"],
+    }
+    for json_drama, dom_drama in zip(from_json, from_dom):
+        # The rendered list shows fewer stars (and lumps creators in with them)
+        assert {**json_drama, "cast": None} == {**dom_drama, "cast": None}
+        assert set(dom_drama["cast"]) - set(json_drama["cast"]) <= {"Kaoru Tada"}
+
+
+def test_dom_fallback_without_hashed_classes():
+    # Strip the styled-component hashes: only the stable ipc-* / dli-* / data-testid hooks remain
+    html = re.sub(r"\bsc-[0-9a-f]{8}-\d+ [A-Za-z]{6}\b", "", (FIXTURES_DIR / "imdb" / "ls001_page1.html").read_text())
+    dramas, total = extract_list_page(html)
+
+    assert total == 5
+    assert [drama["title"] for drama in dramas] == ["Heirs", "City Hunter", "The Moon Embracing the Sun"]
+    assert dramas[1]["release_year"] == "2011"
+    assert dramas[1]["num_episodes"] == 20
+    assert dramas[1]["cast"] == ["Lee Min-ho", "Park Min-young", "Kim Sang-jung"]
+
+
+def test_single_episode_titles():
+    # City Hunter (the second title), as if it were a one-off special
+    heirs, city_hunter, rest = (FIXTURES_DIR / "imdb" / "ls001_page1.html").read_text().split("20 eps", 2)
+    page = heirs + "20 eps" + city_hunter + "1 ep" + rest
+
+    dramas = extract_dramas(page)
+
+    assert [drama["num_episodes"] for drama in dramas] == [20, 1, 20]
+
+
+def test_json_ld_fallback():
+    soup = BeautifulSoup(SAVED_LIST, "html.parser")
+    for tag in soup.select("script#__NEXT_DATA__, div[data-testid='list-page-mc-list-content']"):
+        tag.decompose()
+    dramas, _ = extract_list_page(soup)
+
+    assert dramas == extract_json_ld(SAVED_LIST)
+    assert dramas[0]["title"] == "Heirs"
+    assert dramas[0]["imdb_id"] == "tt3243098"
+    assert "Korea's" in dramas[0]["short_description"]
+
+
+def test_scrolled_in_items_beat_a_shorter_next_data():
+    assert rendered_item_count(SAVED_LIST) == 44
+    with pytest.raises(RuntimeError):
+        extract_list_page("<html><body>Nothing here</body></html>")
+    # __NEXT_DATA__ is skipped when the browser rendered more items than it holds
+    dramas, _ = extract_list_page(SAVED_LIST, min_items=45)
+    assert dramas[0]["cast"] == ["Lee Min-ho", "Park Shin-hye", "Kim Woo-bin"]
+
+
+def test_format_year_range():
+    assert format_year_range(2013, 2013) == "2013"
+    assert format_year_range(2010, 2011) == "2010–2011"
+    assert format_year_range(2021, None, ongoing=True) == "2021–"
+    assert format_year_range(2021, None) == "2021"
+    assert format_year_range(None, None) == ""
@@ -0,0 +1,139 @@
+import csv
+import json
+
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list, load_manifest
+from data_scraping.http_client import HttpClient
+
+
+class RecordingClient(HttpClient):
+    """HttpClient that remembers which URLs were requested."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetched = []
+
+    def get(self, url, headers=None):
+        self.fetched.append(url.rsplit("/", 1)[-1])
+        return super().get(url, headers=headers)
+
+
+def write_csv(path, titles):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        for title in titles:
+            writer.writerow([title, "2007"])
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as f:
+        return {row["title"]: row for row in csv.DictReader(f)}
+
+
+def run(tmp_path, wiki_server, titles, **kwargs):
+    input_csv = tmp_path / "kdrama_list.csv"
+    write_csv(input_csv, titles)
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps(
+            [
+                {"Damo": f"{wiki_server}/Damo_TV_series.html"},
+                {"Jewel in the Palace": f"{wiki_server}/Jewel_in_the_Palace.html"},
+                {"Missing Page": f"{wiki_server}/Does_Not_Exist.html"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    client = RecordingClient()
+    output_csv = tmp_path / "kdrama_list_with_wiki.csv"
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, client=client, **kwargs)
+    return client.fetched, output_csv
+
+
+def test_incremental_run_only_fetches_new_and_failed_titles(tmp_path, wiki_server):
+    fetched, output_csv = run(tmp_path, wiki_server, ["Damo", "Missing Page"], incremental=True)
+    assert sorted(fetched) == ["Damo_TV_series.html", "Does_Not_Exist.html"]
+    assert set(load_manifest(tmp_path / "kdrama_list_with_wiki.manifest.json")) == {"Damo"}
+
+    # Hand-edit a value, as is done for the fields the scraper cannot find
+    rows = read_rows(output_csv)
+    rows["Damo"]["screenwriter"] = "Jung Hyung-soo"
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows["Damo"]))
+        writer.writeheader()
+        writer.writerows(rows.values())
+
+    fetched, output_csv = run(
+        tmp_path, wiki_server, ["Damo", "Missing Page", "Jewel in the Palace"], incremental=True
+    )
+    # Damo is fresh; the failed page is retried and the new title is fetched
+    assert sorted(fetched) == ["Does_Not_Exist.html", "Jewel_in_the_Palace.html"]
+
+    rows = read_rows(output_csv)
+    assert list(rows) == ["Damo", "Missing Page", "Jewel in the Palace"]
+    assert rows["Damo"]["screenwriter"] == "Jung Hyung-soo"
+    assert rows["Jewel in the Palace"]["screenwriter"] == "Kim Young-hyun"
+
+
+def test_stale_titles_are_refetched(tmp_path, wiki_server):
+    run(tmp_path, wiki_server, ["Damo"])
+
+    manifest_path = tmp_path / "kdrama_list_with_wiki.manifest.json"
+    manifest = load_manifest(manifest_path)
+    manifest["Damo"]["fetched_at"] = "2000-01-01T00:00:00+00:00"
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    fetched, _ = run(tmp_path, wiki_server, ["Damo"], incremental=True, max_age_days=30)
+    assert fetched == ["Damo_TV_series.html"]
+
+    fetched, _ = run(tmp_path, wiki_server, ["Damo"], incremental=True, max_age_days=30)
+    assert fetched == []
+
+
+def write_rows(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(next(iter(rows.values()))))
+        writer.writeheader()
+        writer.writerows(rows.values())
+
+
+def test_rows_missing_a_field_are_refetched(tmp_path, wiki_server):
+    titles = ["Damo", "Jewel in the Palace"]
+    _, output_csv = run(tmp_path, wiki_server, titles)
+    manifest_path = tmp_path / "kdrama_list_with_wiki.manifest.json"
+    # Damo's article has no screenwriter or plot: they are recorded as absent, not missing
+    assert load_manifest(manifest_path)["Damo"]["absent"] == ["screenwriter", "plot"]
+
+    # Jewel in the Palace lost its director but has a hand-edited screenwriter
+    rows = read_rows(output_csv)
+    director = rows["Jewel in the Palace"]["director"]
+    rows["Jewel in the Palace"]["director"] = ""
+    rows["Jewel in the Palace"]["screenwriter"] = "Kim Young-hyun, Jung Hyung-soo"
+    write_rows(output_csv, rows)
+
+    fetched, output_csv = run(tmp_path, wiki_server, titles, incremental=True)
+    assert fetched == ["Jewel_in_the_Palace.html"]
+    jewel = read_rows(output_csv)["Jewel in the Palace"]
+    assert jewel["director"] == director != ""
+    assert jewel["screenwriter"] == "Kim Young-hyun, Jung Hyung-soo"
+
+    # A manifest written before fields were recorded as absent: Damo is refetched once,
+    # keeping its hand-edited screenwriter
+    manifest = load_manifest(manifest_path)
+    del manifest["Damo"]["absent"]
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    rows = read_rows(output_csv)
+    rows["Damo"]["screenwriter"] = "Jung Hyung-soo"
+    write_rows(output_csv, rows)
+
+    fetched, output_csv = run(tmp_path, wiki_server, titles, incremental=True)
+    assert fetched == ["Damo_TV_series.html"]
+    assert read_rows(output_csv)["Damo"]["screenwriter"] == "Jung Hyung-soo"
+    fetched, _ = run(tmp_path, wiki_server, titles, incremental=True)
+    assert fetched == []
+
+
+def test_full_run_refetches_everything(tmp_path, wiki_server):
+    run(tmp_path, wiki_server, ["Damo"])
+    fetched, _ = run(tmp_path, wiki_server, ["Damo"])
+    assert fetched == ["Damo_TV_series.html"]
@@ -0,0 +1,79 @@
+import csv
+import json
+
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+from data_scraping.metrics import Histogram, Metrics
+
+PAGES = {
+    "The 1st Shop of Coffee Prince": "Coffee_Prince_2007_TV_series.html",
+    "Damo": "Damo_TV_series.html",
+    "Some Drama Without Infobox": "No_Infobox.html",
+    "Missing Page": "Does_Not_Exist.html",
+}
+
+
+def test_histogram_buckets_are_cumulative_upper_bounds():
+    histogram = Histogram(buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_prometheus_snapshot(tmp_path):
+    metrics = Metrics()
+    metrics.inc("http_requests_total", host="en.wikipedia.org", status=200)
+    metrics.inc("http_cache_requests_total", 3, result="hit")
+    metrics.inc("http_cache_requests_total", result="miss")
+    metrics.observe("stage_duration_seconds", 0.002, stage="parse")
+
+    text = metrics.to_prometheus()
+    assert 'http_requests_total{host="en.wikipedia.org",status="200"} 1' in text
+    assert 'stage_duration_seconds_bucket{stage="parse",le="0.001"} 0' in text
+    assert 'stage_duration_seconds_bucket{stage="parse",le="+Inf"} 1' in text
+    assert 'stage_duration_seconds_count{stage="parse"} 1' in text
+    assert "http_cache_hit_ratio 0.7500" in text
+
+    metrics.write_prometheus(tmp_path / "snapshot.prom")
+    assert (tmp_path / "snapshot.prom").read_text() == text
+
+
+def test_enrichment_writes_metrics(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        for title in PAGES:
+            writer.writerow([title, "2007"])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps([{title: f"{wiki_server}/{page}"} for title, page in PAGES.items()]),
+        encoding="utf-8",
+    )
+
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, tmp_path / "out.csv",
+        requests_per_second=None, client=HttpClient(), chunk_size=2,
+    )
+
+    events = [json.loads(line) for line in (tmp_path / "out.metrics.jsonl").read_text().splitlines()]
+    assert [event["event"] for event in events if event["event"] != "fetch_failed"] == [
+        "run_start", "chunk", "chunk", "run_summary",
+    ]
+    assert sum(event["successes"] for event in events if event["event"] == "chunk") == 2
+    assert any(event["event"] == "fetch_failed" and event["status"] == 404 for event in events)
+
+    counters = events[-1]["counters"]
+    assert counters['wikipedia_pages_total{backend="html",result="parsed"}'] == 2
+    assert counters['wikipedia_pages_total{backend="html",result="no_infobox"}'] == 1
+    assert counters['wikipedia_pages_total{backend="html",result="fetch_failed"}'] == 1
+    # Damo's infobox has no writer
+    assert counters['wikipedia_fields_total{backend="html",field="screenwriter",result="missing"}'] == 1
+    host = wiki_server.split("//")[1]
+    assert counters[f'http_bytes_total{{host="{host}"}}'] > 0
+
+    prom = (tmp_path / "out.metrics.prom").read_text()
+    assert 'stage_duration_seconds_count{parser="html.parser",source="wikipedia",stage="parse"} 3' in prom
+    assert 'stage_duration_seconds_count{stage="write"} 2' in prom
@@ -0,0 +1,87 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from data_scraping import normalize
+from data_scraping.columnar import parse_year_range, to_record
+from data_scraping.helper import preprocess_episodes, preprocess_title
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def as_records(frame):
+    # <NA> -> None, so the rows compare equal to columnar.to_record()
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def test_matches_the_per_item_helpers():
+    titles = pd.Series(["12. Heirs", "1.  Reply 1988 ", "Mr. Queen", "  Signal ", "No.\tNumber"])
+    assert normalize.clean_titles(titles).tolist() == [preprocess_title(t) for t in titles]
+
+    episodes = pd.Series(["20 eps", "16", " 1 eps ", "100eps"])
+    assert normalize.parse_episodes(episodes).tolist() == [preprocess_episodes(e) for e in episodes]
+
+    years = pd.Series(["2003–2004", "2007", "2021–", "2019-", "", None, "1998–2000–2003", "12345"])
+    split = as_records(normalize.split_year_ranges(years))
+    assert [(row["start_year"], row["end_year"]) for row in split] == [parse_year_range(y) for y in years]
+
+
+def test_normalize_frame_matches_to_record():
+    rows = [
+        {
+            "title": "5. Jewel in the Palace",
+            "release_year": "2003–2004",
+            "num_episodes": "54 eps",
+            "rating_type": "imdb",
+            "rating_score": " 8.4 ",
+            "cast": "Lee Yeong-ae, Hong Ri-na, , Ji Jin-hee",
+            "screenwriter": ["Kim Young-hyun"],
+            "director": "",
+        },
+        {"title": "6. Mouse", "release_year": "2021–", "num_episodes": 20, "rating_score": "", "cast": []},
+        {"title": "7. Unknown", "release_year": "", "num_episodes": "n/a", "rating_score": "N/A", "plot": "p"},
+    ]
+
+    frame = normalize.normalize_frame(pd.DataFrame(rows), raw_titles=True)
+
+    expected = [to_record({**row, "title": preprocess_title(row["title"])}) for row in rows]
+    # Episodes parse like preprocess_episodes ("54 eps"), and unparseable ones are left missing
+    expected[0]["num_episodes"] = 54
+    assert list(frame.columns) == list(normalize.NORMALIZED_COLUMNS)
+    assert str(frame["start_year"].dtype) == "Int16"
+    assert str(frame["rating_score"].dtype) == "Float64"
+    assert as_records(frame) == [{name: record[name] for name in frame.columns} for record in expected]
+
+
+def test_normalize_scraped_csv_row_by_row():
+    path = DATA_DIR / "kdrama_list_with_wiki.csv"
+    with open(path, encoding="utf-8") as f:
+        expected = [to_record(row) for row in csv.DictReader(f)]
+
+    frame = normalize.normalize_frame(normalize.read_csv(path))
+
+    assert len(frame) == len(expected) > 0
+    assert as_records(frame) == [{name: record[name] for name in frame.columns} for record in expected]
+
+
+def test_people_table_explodes_and_dedups():
+    frame = pd.DataFrame(
+        {
+            "title": ["Heirs", "Signal"],
+            "cast": ["Lee Min-ho, Park Shin-hye, Lee Min-ho", ["Lee Je-hoon", " Kim Hye-soo "]],
+            "director": ["Kang Shin-hyo", ""],
+        }
+    )
+
+    table = normalize.people_table(frame)
+
+    assert table.to_dict("records") == [
+        {"row": 0, "role": "cast", "position": 0, "name": "Lee Min-ho"},
+        {"row": 0, "role": "cast", "position": 1, "name": "Park Shin-hye"},
+        {"row": 1, "role": "cast", "position": 0, "name": "Lee Je-hoon"},
+        {"row": 1, "role": "cast", "position": 1, "name": "Kim Hye-soo"},
+        {"row": 0, "role": "director", "position": 0, "name": "Kang Shin-hyo"},
+    ]
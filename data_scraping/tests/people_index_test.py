@@ -0,0 +1,79 @@
+from data_scraping.people_index import PeopleIndex, person_key
+
+DRAMAS = [
+    {
+        "title": "Heirs",
+        "release_year": "2013",
+        "cast": "Lee Min-ho, Park Shin-hye, Kim Woo-bin",
+        "screenwriter": "Kim Eun-sook",
+        "director": "Kang Shin-hyo",
+    },
+    {
+        "title": "The King: Eternal Monarch",
+        "release_year": "2020",
+        "cast": ["LEE Minho", "Kim Go-eun", "Woo Do-hwan"],
+        "screenwriter": ["Kim Eun-sook[1]"],
+        "director": ["Baek Sang-hoon", "Jung Ji-hyun"],
+    },
+    {
+        "title": "Goblin",
+        "release_year": "2016–2017",
+        "cast": "Gong Yoo, Kim Go-eun, Kim Go-eun",
+        "screenwriter": "Kim Eun-sook",
+        "director": "Lee Eung-bok",
+    },
+    {"title": "Pinocchio", "release_year": "2014–2015", "cast": "Park Shin-hye, Yi Jong-suk"},
+]
+
+
+def test_person_key_folds_romanization_variants():
+    assert person_key("Lee Min-ho") == person_key("LEE Minho") == person_key("Yi Min Ho") == "lee minho"
+    assert person_key("Ahn Gil-ho[1]") == person_key("An Gil-ho")
+    assert person_key("Jeong Jun-ho") == person_key("Jung Jun-ho")
+    assert person_key(" ") == ""
+
+
+def test_interns_people_and_answers_queries():
+    index = PeopleIndex.from_dramas(DRAMAS)
+
+    lee = index.person_id("Lee Min-ho")
+    assert index.person_id("Yi Min Ho") == lee == 0
+    assert index.name(lee) == "Lee Min-ho"
+    assert index.spellings(lee) == ["Lee Min-ho", "LEE Minho"]
+    assert index.drama_count == 4
+    assert [index.drama(d)["title"] for d in index.dramas_of("Lee Min-ho")] == ["Heirs", "The King: Eternal Monarch"]
+    assert index.dramas_of("Kim Eun-sook", role="cast") == []
+    assert index.dramas_of("Nobody") == []
+    # A name repeated within one drama is credited once
+    assert [index.name(p) for p in index.people_of(2, "cast")] == ["Gong Yoo", "Kim Go-eun"]
+
+    assert index.most_prolific("screenwriter", limit=1) == [("Kim Eun-sook", 3)]
+    assert index.most_prolific(limit=2) == [("Kim Eun-sook", 3), ("Lee Min-ho", 2)]
+    assert index.costars("Park Shin-hye") == [("Lee Min-ho", 1), ("Kim Woo-bin", 1), ("Yi Jong-suk", 1)]
+    assert index.co_occurrences("cast") == []
+    assert index.co_occurrences("cast", min_count=1)[0] == ("Lee Min-ho", "Park Shin-hye", 1)
+
+
+def test_saved_names_keep_their_ids(tmp_path):
+    first = PeopleIndex.from_dramas(DRAMAS[:2])
+    first.save(tmp_path / "people.json")
+
+    # A later run sees the dramas in another order, plus new people
+    second = PeopleIndex.from_dramas(
+        list(reversed(DRAMAS)), people=PeopleIndex.load_people(tmp_path / "people.json")
+    )
+
+    for person_id, name in enumerate(first.people_names()):
+        assert second.person_id(name) == person_id
+    assert second.person_id("Gong Yoo") >= len(first)
+    assert second.dramas_of("Kim Go-eun") == [1, 2]
+
+
+def test_saved_names_do_not_count_as_credits():
+    # "LEE Minho" was the display name last run; this run only credits "Lee Min-ho"
+    index = PeopleIndex.from_dramas(DRAMAS[:1], people=["LEE Minho", "Nobody Credited"])
+
+    assert index.person_id("Lee Min-ho") == 0
+    assert index.name(0) == "Lee Min-ho"
+    assert index.name(1) == "Nobody Credited"
+    assert index.most_prolific(limit=None)[0] == ("Lee Min-ho", 1)
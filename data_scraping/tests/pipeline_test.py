@@ -0,0 +1,102 @@
+import csv
+import threading
+import time
+
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+from data_scraping.pipeline import bounded_map, enrich_stream, iter_chunks
+from data_scraping.title_matcher import TitleMatcher
+
+
+def test_iter_chunks_reads_lazily():
+    consumed = []
+
+    def numbers():
+        for n in range(7):
+            consumed.append(n)
+            yield n
+
+    chunks = iter_chunks(numbers(), 3)
+    assert next(chunks) == [0, 1, 2]
+    assert consumed == [0, 1, 2]
+    assert list(chunks) == [[3, 4, 5], [6]]
+
+
+def test_bounded_map_keeps_order_and_bounds_items_in_flight():
+    pulled = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def items():
+        nonlocal pulled
+        for n in range(50):
+            pulled += 1
+            yield n
+
+    def slow_square(n):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.001 * (n % 5))
+        with lock:
+            in_flight -= 1
+        return n * n
+
+    results = bounded_map(slow_square, items(), max_workers=4, buffer_size=8)
+    assert next(results) == 0
+    # Only one buffer's worth of input is read ahead of the consumer
+    assert pulled <= 8
+    assert list(results) == [n * n for n in range(1, 50)]
+    assert max_in_flight <= 4
+
+
+def test_enrich_stream_yields_dramas_in_order(wiki_server):
+    matcher = TitleMatcher(
+        {
+            "The 1st Shop of Coffee Prince": f"{wiki_server}/Coffee_Prince_2007_TV_series.html",
+            "Missing Page": f"{wiki_server}/Does_Not_Exist.html",
+        }
+    )
+    titles = ["The 1st Shop of Coffee Prince", "Unmapped", "Missing Page"]
+    dramas = ({"title": title} for title in titles)
+
+    enriched = list(enrich_stream(dramas, matcher, {}, max_workers=4, client=HttpClient()))
+
+    assert [drama["title"] for drama in enriched] == titles
+    assert enriched[0]["director"] == "Lee Yoon-jung"
+    assert "source" not in enriched[1]
+    assert "source" not in enriched[2]
+
+
+def test_enrichment_streams_rows_to_output(tmp_path):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        for n in range(25):
+            writer.writerow([f"Drama {n}", "2010"])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text("[]", encoding="utf-8")
+    output_csv = tmp_path / "out.csv"
+
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, requests_per_second=None, client=HttpClient())
+
+    with open(output_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["title"] for row in rows] == [f"Drama {n}" for n in range(25)]
+    assert not (tmp_path / "out.csv.tmp").exists()
+
+
+def test_enrichment_of_empty_input_writes_nothing(tmp_path, capsys):
+    input_csv = tmp_path / "kdrama_list.csv"
+    input_csv.write_text("title,release_year\n", encoding="utf-8")
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text("[]", encoding="utf-8")
+    output_csv = tmp_path / "out.csv"
+
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, client=HttpClient())
+
+    assert "No rows found" in capsys.readouterr().out
+    assert sorted(tmp_path.iterdir()) == sorted([input_csv, wikipedia_list])
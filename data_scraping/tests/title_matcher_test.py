@@ -0,0 +1,127 @@
+import csv
+import json
+
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list
+from data_scraping.http_client import HttpClient
+from data_scraping.pipeline import enrich_stream
+from data_scraping.title_matcher import TitleMatcher, load_title_list, normalize_title, trigrams
+
+CURATED = {
+    "The 1st Shop of Coffee Prince": "https://en.wikipedia.org/wiki/Coffee_Prince_(2007_TV_series)",
+    "Jewel in the Palace": "https://en.wikipedia.org/wiki/Jewel_in_the_Palace",
+}
+ARTICLES = {
+    "Coffee Prince (2012 TV series)": "https://en.wikipedia.org/wiki/Coffee_Prince_(2012_TV_series)",
+    "Iljimae (2008 TV series)": "https://en.wikipedia.org/wiki/Iljimae_(2008_TV_series)",
+    "Queen Seondeok (TV series)": "https://en.wikipedia.org/wiki/Queen_Seondeok_(TV_series)",
+}
+
+
+def test_normalize_title():
+    assert normalize_title("The 1st Shop of Coffee Prince!") == "1st shop of coffee prince"
+    assert normalize_title("Coffee Prince (2007 TV series)") == "coffee prince"
+    assert normalize_title("Café & Co.") == "cafe and co"
+    assert trigrams("damo") == {"  d", " da", "dam", "amo", "mo "}
+
+
+def test_curated_titles_match_exactly():
+    matcher = TitleMatcher(CURATED, ARTICLES)
+    match = matcher.match("The 1st Shop of Coffee Prince", "2007")
+    assert match["url"] == CURATED["The 1st Shop of Coffee Prince"]
+    assert match["score"] == 1.0
+    assert not match["needs_review"]
+
+
+def test_year_breaks_ties_between_articles():
+    matcher = TitleMatcher(CURATED, ARTICLES)
+    assert matcher.match("Coffee Prince", 2007)["url"] == CURATED["The 1st Shop of Coffee Prince"]
+    assert matcher.match("Coffee Prince", "2012")["url"] == ARTICLES["Coffee Prince (2012 TV series)"]
+
+
+def test_variants_match_with_confidence():
+    matcher = TitleMatcher(CURATED, ARTICLES)
+    assert matcher.match("Queen Seondeok")["url"] == ARTICLES["Queen Seondeok (TV series)"]
+
+    jewel = matcher.match("Jewel in Palace", "2003–2004")
+    assert jewel["url"] == CURATED["Jewel in the Palace"]
+    assert 0.6 < jewel["score"] < 1.0
+
+    iljimae = matcher.match("Il Ji Mae", 2008)
+    assert iljimae is None or iljimae["needs_review"]
+    assert matcher.match("Unrelated Drama") is None
+
+
+def test_sequels_and_near_namesakes_are_not_confident_matches():
+    # Pairs found by matching each wikipedia_list.json title against the others
+    matcher = TitleMatcher(
+        {
+            "Reply 1994": "https://en.wikipedia.org/wiki/Reply_1994",
+            "Reply 1997": "https://en.wikipedia.org/wiki/Reply_1997",
+            "The Princess' Man": "https://en.wikipedia.org/wiki/The_Princess%27_Man",
+            "That Winter, the Wind Blows": "https://en.wikipedia.org/wiki/That_Winter,_the_Wind_Blows",
+        }
+    )
+    near_misses = [("Reply 1988", "2015–2016"), ("Princess Hours", "2006"), ("Painter of the Wind", "2008")]
+    for title, year in near_misses:
+        match = matcher.match(title, year)
+        assert match is None or match["needs_review"], match
+
+
+def test_load_title_list(tmp_path):
+    path = tmp_path / "wikipedia_titles.json"
+    path.write_text(json.dumps(["Damo (TV series)", "https://en.wikipedia.org/wiki/Iljimae_(2008_TV_series)"]))
+    assert load_title_list(path) == {
+        "Damo (TV series)": "https://en.wikipedia.org/wiki/Damo_(TV_series)",
+        "Iljimae (2008 TV series)": "https://en.wikipedia.org/wiki/Iljimae_(2008_TV_series)",
+    }
+
+
+def test_enrichment_matches_variants_and_reports_misses(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        writer.writerow(["Jewel in Palace", "2003–2004"])
+        writer.writerow(["Unmapped Drama", "2010"])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    url = f"{wiki_server}/Jewel_in_the_Palace.html"
+    wikipedia_list.write_text(json.dumps([{"Jewel in the Palace": url}]), encoding="utf-8")
+    output_csv = tmp_path / "out.csv"
+
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, requests_per_second=None, client=HttpClient())
+
+    with open(output_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["source"] == url
+    assert rows[0]["screenwriter"] == "Kim Young-hyun"
+    with open(tmp_path / "out.review.csv", encoding="utf-8") as f:
+        review = list(csv.DictReader(f))
+    assert [(row["title"], row["status"]) for row in review] == [("Unmapped Drama", "no match")]
+
+
+def test_low_confidence_matches_are_reported_not_applied(tmp_path, wiki_server):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "release_year"])
+        writer.writerow(["Reply 1988", "2015–2016"])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    url = f"{wiki_server}/Damo_TV_series.html"
+    wikipedia_list.write_text(json.dumps([{"Reply 1994": url}]), encoding="utf-8")
+    output_csv = tmp_path / "out.csv"
+
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, requests_per_second=None, client=HttpClient())
+
+    with open(output_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert (rows[0]["source"], rows[0]["screenwriter"], rows[0]["plot"]) == ("", "", "")
+    with open(tmp_path / "out.review.csv", encoding="utf-8") as f:
+        review = list(csv.DictReader(f))
+    assert [(row["title"], row["matched_title"], row["status"]) for row in review] == [
+        ("Reply 1988", "Reply 1994", "low confidence")
+    ]
+
+    matcher = TitleMatcher.from_wikipedia_list(wikipedia_list)
+    dramas = [{"title": "Reply 1988", "release_year": "2015–2016"}]
+    assert list(enrich_stream(dramas, matcher, {}, client=HttpClient())) == dramas
+    assert "source" not in dramas[0]
@@ -0,0 +1,200 @@
+import csv
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from data_scraping.enrich_with_wikipedia import enrich_kdrama_list, is_fresh, load_manifest
+from data_scraping.http_cache import ResponseCache
+from data_scraping.http_client import HttpClient
+from data_scraping.scrapers.wikipedia_api import (
+    WikipediaApiScraper,
+    parse_wikitext_info,
+    title_from_url,
+)
+from data_scraping.tests.conftest import FIXTURES_DIR
+
+RECORDINGS = json.loads(
+    (FIXTURES_DIR / "wikipedia_api" / "query_recordings.json").read_text(encoding="utf-8")
+)
+
+URLS = [
+    "https://en.wikipedia.org/wiki/Coffee_Prince_(2007_TV_series)",
+    "https://en.wikipedia.org/wiki/Dae_Jang_Geum",
+    "https://en.wikipedia.org/wiki/Damo_(TV_series)",
+    "https://en.wikipedia.org/wiki/Does_Not_Exist",
+]
+
+
+class RecordedApiClient:
+    """Replays recorded action=query responses, trimmed to the titles actually requested."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, refresh=False):
+        params = {key: values[0] for key, values in parse_qs(urlsplit(url).query).items()}
+        self.calls.append(params)
+        titles = set(params["titles"].split("|"))
+        for recording in RECORDINGS:
+            recorded = recording["params"]
+            if (
+                recorded["rvprop"] == params["rvprop"]
+                and recorded.get("rvcontinue") == params.get("rvcontinue")
+                and titles <= set(recorded["titles"].split("|"))
+            ):
+                break
+        else:
+            raise AssertionError(f"no recording for {params}")
+
+        data = json.loads(json.dumps(recording["response"]))
+        query = data["query"]
+        query["redirects"] = [r for r in query.get("redirects", []) if r["from"] in titles]
+        wanted = titles | {r["to"] for r in query["redirects"]}
+        query["pages"] = [page for page in query["pages"] if page["title"] in wanted]
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(data).encode("utf-8")
+        return response
+
+
+def test_title_from_url():
+    assert title_from_url(URLS[0]) == "Coffee Prince (2007 TV series)"
+    assert title_from_url("https://en.wikipedia.org/wiki/Hwang_Jini_%28TV_series%29") == "Hwang Jini (TV series)"
+
+
+def test_batched_info_follows_redirects_and_continuations():
+    client = RecordedApiClient()
+    info_lists = WikipediaApiScraper({}, client=client).get_info_lists(URLS)
+
+    # All four titles go out in one request (plus one continuation)
+    assert len(client.calls) == 2
+    coffee, jewel, damo, missing = info_lists
+    assert coffee == [
+        {
+            "screenwriter": ["Lee Jung-ah", "Jang Hyun-joo"],
+            "director": ["Lee Yoon-jung"],
+            "network": "Munhwa Broadcasting Corporation",
+            "plot": "Choi Han-gyeol (Gong Yoo) is the grandson of chairwoman Bang, whose company "
+            "has a thriving coffee business. Go Eun-chan (Yoon Eun-hye) is a 24-year-old tomboy "
+            "who is often mistaken for a guy. Many of the scenes were filmed on location in Seoul.",
+            "revision_id": 1250000001,
+        }
+    ]
+    assert jewel[0]["screenwriter"] == ["Kim Young-hyun"]
+    assert jewel[0]["director"] == ["Lee Byung-hoon (PD)", "Kim Geun-hong"]
+    assert jewel[0]["network"] == "MBC TV"
+    assert damo[0] == {
+        "director": ["Lee Jae-kyoo", "Jung Hyung-soo"],
+        "network": "MBC TV",
+        "revision_id": 1187000003,
+    }
+    assert missing == []
+
+
+def test_batches_respect_batch_size():
+    client = RecordedApiClient()
+    WikipediaApiScraper({}, client=client, batch_size=2).get_revision_ids(URLS)
+    assert [len(call["titles"].split("|")) for call in client.calls] == [2, 2]
+
+
+def test_no_infobox_gives_none():
+    assert parse_wikitext_info("'''Damo''' is a drama.\n== Plot ==\nText.") is None
+
+
+def test_api_backend_enrichment_and_revision_freshness(tmp_path):
+    input_csv = tmp_path / "kdrama_list.csv"
+    with open(input_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title"])
+        writer.writerows([["Coffee Prince"], ["Jewel in the Palace"], ["Damo"], ["Missing"]])
+    wikipedia_list = tmp_path / "wikipedia_list.json"
+    wikipedia_list.write_text(
+        json.dumps(
+            [{title: url} for title, url in zip(["Coffee Prince", "Jewel in the Palace", "Damo", "Missing"], URLS)]
+        ),
+        encoding="utf-8",
+    )
+    output_csv = tmp_path / "out.csv"
+
+    client = RecordedApiClient()
+    enrich_kdrama_list(input_csv, wikipedia_list, output_csv, client=client, backend="api")
+    assert len(client.calls) == 2
+    manifest = load_manifest(tmp_path / "out.manifest.json")
+    assert manifest["Damo"]["revision"] == 1187000003
+
+    with open(output_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["screenwriter"] == "Lee Jung-ah, Jang Hyun-joo"
+    assert rows[2]["director"] == "Lee Jae-kyoo, Jung Hyung-soo"
+    assert rows[3]["source"] == ""
+
+    # Even with max_age_days=0 only the article whose revision changed (and the missing one)
+    # is fetched again
+    client = RecordedApiClient()
+    enrich_kdrama_list(
+        input_csv, wikipedia_list, output_csv,
+        client=client, backend="api", incremental=True, max_age_days=0,
+    )
+    # (the recorded content response for this batch carries one continuation)
+    assert [call["rvprop"] for call in client.calls] == ["ids", "ids|content", "ids|content"]
+    assert client.calls[1]["titles"] == "Dae Jang Geum|Does Not Exist"
+
+
+class RevisionHandler(BaseHTTPRequestHandler):
+    """A MediaWiki API whose only article gets a new revision on every request."""
+
+    revid = 100
+
+    def do_GET(self):
+        type(self).revid += 1
+        body = json.dumps(
+            {"query": {"pages": [{"title": "Damo (TV series)", "revisions": [{"revid": self.revid}]}]}}
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def revision_api():
+    RevisionHandler.revid = 100
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RevisionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_revision_ids_bypass_fresh_cache_entries(tmp_path, revision_api):
+    client = HttpClient(cache=ResponseCache(tmp_path, ttl=7 * 24 * 60 * 60))
+    scraper = WikipediaApiScraper({}, client=client, api_url=revision_api)
+
+    first = scraper.get_revision_ids([URLS[2]])
+    second = scraper.get_revision_ids([URLS[2]])
+
+    assert first == {URLS[2]: 101}
+    assert second == {URLS[2]: 102}
+
+
+def test_known_revision_decides_freshness():
+    now = datetime.now(timezone.utc)
+    entry = {"source": URLS[2], "fetched_at": now.isoformat(timespec="seconds"), "revision": 101}
+
+    assert is_fresh(entry, URLS[2], max_age_days=30, now=now, revision=101)
+    # Edited since the last fetch: stale, however recent that fetch was
+    assert not is_fresh(entry, URLS[2], max_age_days=30, now=now, revision=102)
+    assert is_fresh(entry, URLS[2], max_age_days=30, now=now)
@@ -0,0 +1,28 @@
+import pytest
+
+from data_scraping.scrapers.wikipedia_scraper import WikipediaScraper, parse_info_list
+from data_scraping.tests.conftest import FIXTURES_DIR
+
+SAVED_PAGES = sorted((FIXTURES_DIR / "wikipedia").glob("*.html"))
+
+
+@pytest.mark.parametrize("page", SAVED_PAGES, ids=lambda path: path.stem)
+def test_lxml_backend_matches_html_parser(page):
+    content = page.read_bytes()
+    assert parse_info_list(content, "lxml") == parse_info_list(content, "html.parser")
+
+
+def test_parser_output_on_saved_page():
+    content = (FIXTURES_DIR / "wikipedia" / "Empress_Ki_TV_series.html").read_bytes()
+    info = parse_info_list(content, "lxml")[0]
+
+    assert info["screenwriter"] == ["Jang Young-chul", "Jung Kyung-soon"]
+    # <br>-separated names, as the API backend splits them
+    assert info["director"] == ["Han Hee", "Lee Sung-joon"]
+    assert info["plot"].startswith("Ki Seung-nyang, a Goryeo woman")
+    assert "horizontal rule" not in info["plot"]
+
+
+def test_unknown_parser_is_rejected():
+    with pytest.raises(ValueError):
+        WikipediaScraper("https://en.wikipedia.org/wiki/Damo_(TV_series)", {}, parser="html5lib")
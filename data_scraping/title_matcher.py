@@ -0,0 +1,184 @@
+"""
+Fuzzy IMDb title -> Wikipedia article matching.
+
+Titles are normalized (case, accents, punctuation, "&", leading articles, Wikipedia's
+"(2007 TV series)" disambiguation), then scored against every known article name sharing at
+least one trigram with them: the Dice coefficient of the two trigram sets, nudged up when the
+article's disambiguation year agrees with the drama's year and down when it does not.
+Exact matches of a curated wikipedia_list.json entry always win with a score of 1.0.
+"""
+import csv
+import json
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from .columnar import parse_year_range
+from .config import TITLE_MATCH_MIN_SCORE, TITLE_MATCH_REVIEW_SCORE
+from .metrics import get_metrics
+from .scrapers.wikipedia_api import title_from_url
+
+WIKIPEDIA_ARTICLE_URL = "https://en.wikipedia.org/wiki/"
+# "(2007 TV series)", "(South Korean TV series)", "(film)", ...
+DISAMBIGUATION_RE = re.compile(r"\s*\(([^()]*)\)\s*$")
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+NON_WORD_RE = re.compile(r"[^\w\s]+")
+LEADING_ARTICLES = ("the ", "a ", "an ")
+# Score adjustment when the article's year agrees (or disagrees) with the drama's
+YEAR_BONUS = 0.15
+
+REVIEW_FIELDS = ["title", "year", "matched_title", "url", "score", "status"]
+
+
+def normalize_title(title: str) -> str:
+    """'The 1st Shop of Coffee Prince!' -> '1st shop of coffee prince'; 'Café & Co.' -> 'cafe and co'"""
+    title = DISAMBIGUATION_RE.sub("", title or "")
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(ch for ch in title if not unicodedata.combining(ch)).casefold()
+    title = NON_WORD_RE.sub(" ", title.replace("&", " and "))
+    title = " ".join(title.split())
+    for article in LEADING_ARTICLES:
+        if title.startswith(article):
+            title = title[len(article):]
+            break
+    return title
+
+
+def title_year(title: str) -> int | None:
+    """Year in a Wikipedia disambiguation suffix: 'Coffee Prince (2007 TV series)' -> 2007."""
+    match = DISAMBIGUATION_RE.search(title or "")
+    if match:
+        year = YEAR_RE.search(match.group(1))
+        if year:
+            return int(year.group(0))
+    return None
+
+
+def trigrams(normalized: str) -> set[str]:
+    """Word trigrams padded like PostgreSQL's pg_trgm: 'damo' -> {'  d', ' da', 'dam', 'amo', 'mo '}."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def load_title_list(path: str | Path) -> dict[str, str]:
+    """Load a cached JSON list of Wikipedia article titles (or URLs) -> {title: url}."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    articles = {}
+    for entry in entries:
+        if entry.startswith(("http://", "https://")):
+            articles[title_from_url(entry)] = entry
+        else:
+            articles[entry] = WIKIPEDIA_ARTICLE_URL + entry.replace(" ", "_")
+    return articles
+
+
+class TitleMatcher:
+    """
+    Trigram index over Wikipedia article names.
+
+    `curated` is the hand-made {IMDb title: url} map (wikipedia_list.json); each of its titles
+    and the article title behind each of its URLs become names of that article. `articles`
+    adds more {article title: url} candidates, e.g. a cached list from load_title_list().
+    """
+
+    def __init__(
+        self,
+        curated: dict[str, str] | None = None,
+        articles: dict[str, str] | None = None,
+        min_score: float = TITLE_MATCH_MIN_SCORE,
+        review_score: float = TITLE_MATCH_REVIEW_SCORE,
+    ):
+        self.min_score = min_score
+        self.review_score = review_score
+        self.curated = dict(curated or {})
+
+        # Candidate names: (display name, url, year from its disambiguation, trigram count)
+        self._names: list[tuple[str, str, int | None, int]] = []
+        self._postings: dict[str, list[int]] = {}
+        for title, url in {**(articles or {}), **self.curated}.items():
+            self.add(title, url)
+            self.add(title_from_url(url), url)
+
+    @classmethod
+    def from_wikipedia_list(
+        cls,
+        wikipedia_list_path: str | Path,
+        title_list_path: str | Path | None = None,
+        **kwargs,
+    ) -> "TitleMatcher":
+        """Matcher over wikipedia_list.json ([{title: url}, ...]) and an optional cached title list."""
+        with open(wikipedia_list_path, encoding="utf-8") as f:
+            curated = dict(next(iter(entry.items())) for entry in json.load(f))
+        articles = load_title_list(title_list_path) if title_list_path else None
+        return cls(curated, articles, **kwargs)
+
+    def add(self, name: str, url: str) -> None:
+        grams = trigrams(normalize_title(name))
+        if not grams:
+            return
+        name_id = len(self._names)
+        self._names.append((name, url, title_year(name), len(grams)))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(name_id)
+
+    def candidates(self, title: str, year: int | None = None, limit: int = 5) -> list[dict]:
+        """The best `limit` articles for `title`, best first, each as a match dict."""
+        grams = trigrams(normalize_title(title))
+        if not grams:
+            return []
+
+        # Count shared trigrams with every name that has at least one in common
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        best: dict[str, dict] = {}
+        for name_id, count in shared.items():
+            name, url, name_year, gram_count = self._names[name_id]
+            score = 2 * count / (len(grams) + gram_count)
+            if year is not None and name_year is not None:
+                score += YEAR_BONUS if name_year == year else -YEAR_BONUS
+            score = max(0.0, min(score, 1.0))
+            if url not in best or score > best[url]["score"]:
+                best[url] = {"title": title, "matched_title": name, "url": url, "score": round(score, 3)}
+
+        # Ties are broken by name so the result does not depend on insertion order
+        return sorted(best.values(), key=lambda m: (-m["score"], m["matched_title"]))[:limit]
+
+    def match(self, title: str, year=None) -> dict | None:
+        """
+        Best match for `title` (and release year, an int or a '2003–2004' string), or None
+        below `min_score`. The match dict has title, matched_title, url, score and
+        `needs_review` (score below `review_score`: report it, don't use it).
+        """
+        metrics = get_metrics()
+        title = (title or "").strip()
+        if title in self.curated:
+            metrics.inc("title_matches_total", result="curated")
+            url = self.curated[title]
+            return {"title": title, "matched_title": title, "url": url, "score": 1.0, "needs_review": False}
+
+        if isinstance(year, str):
+            year = parse_year_range(year)[0]
+        with metrics.time("match"):
+            candidates = self.candidates(title, year, limit=1)
+        if not candidates or candidates[0]["score"] < self.min_score:
+            metrics.inc("title_matches_total", result="none")
+            return None
+        match = candidates[0]
+        match["needs_review"] = match["score"] < self.review_score
+        metrics.inc("title_matches_total", result="review" if match["needs_review"] else "fuzzy")
+        return match
+
+
+def write_review_report(path: str | Path, rows: list[dict]) -> None:
+    """CSV of low-confidence and missing matches (REVIEW_FIELDS) for a human to check."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REVIEW_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)